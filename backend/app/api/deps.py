@@ -1,26 +1,98 @@
 # backend/app/api/deps.py
-from fastapi import Depends, HTTPException, status
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
 from app.core.config import settings
 from app.core.security import decode_access_token
-from app.db.database import get_db
-from app.services import auth_service
+from app.db.database import get_session, AnySession
+from app.services import auth_service, response_cache
 from app.schemas.token import TokenData
 from app.schemas.user import UserInDB
 from app.core.exceptions import UserNotFoundException # Import custom exception
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/{settings.API_V1_STR}/auth/token")
 
-async def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> dict: # Changed return type to dict for simplicity in this scaffold
+# Requests authenticated from signed token claims alone (AUTH_TRUST_TOKEN_CLAIMS)
+principal_stats = {"trusted_claims": 0}
+
+async def call_service(db: AnySession, fn: Callable, response_model: Any = None, **kwargs):
     """
-    Dependency to get the current authenticated user.
-    Raises HTTPException if token is invalid or user not found.
+    Runs a (sync) service function against whichever session get_session provided,
+    without blocking the event loop. The session is passed as the service's `db`
+    keyword argument; all other arguments must be keywords too.
+    - Session: the call runs on Starlette's threadpool, like a plain `def` route.
+    - AsyncSession: the call runs via run_sync on the asyncpg connection, with no
+      thread involved.
+    Pass the route's response_model whenever the result is an ORM object: it is
+    validated inside the call, so lazy loads (and refreshes of expired attributes)
+    run there instead of as blocking SQL on the event loop, or outside the
+    greenlet that owns the asyncpg connection.
+    """
+    def call(sync_db):
+        result = fn(db=sync_db, **kwargs)
+        if response_model is None:
+            return result
+        return TypeAdapter(response_model).validate_python(result, from_attributes=True)
+
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(call)
+    return await run_in_threadpool(call, db)
+
+async def release_connection(db: AnySession):
+    """
+    Ends the session's transaction and returns its connection to the pool before
+    slow non-database work (e.g. bcrypt), so waiting requests don't pin pooled
+    connections. Loaded objects stay readable; the next query checks out afresh.
+    """
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/"x" matches "x"."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+async def cached_json_response(
+    request: Request, db: AnySession, user_id: int, key: Tuple[Hashable, ...], compute: Callable[[], Awaitable[Any]]
+) -> Response:
+    """
+    Serves a per-user read from response_cache, keyed by the user's data version,
+    `key` (endpoint and parameters), computing and caching it on a miss. The body
+    carries a strong ETag (a hash of its bytes, so it agrees across workers) and a
+    matching If-None-Match gets a 304; a cached hit costs one primary-key lookup.
+    """
+    version = await call_service(db, response_cache.get_data_version, user_id=user_id)
+    cache_key = (user_id, version, *key)
+    entry = response_cache.response_cache.get(cache_key)
+    if entry is None:
+        body = json.dumps(jsonable_encoder(await compute()), separators=(",", ":")).encode()
+        entry = (f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        response_cache.response_cache.set(cache_key, entry)
+    etag, body = entry
+
+    # no-cache: clients may store the response but must revalidate it every time
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def authenticate_token(db: AnySession, token: str) -> dict:
+    """
+    Resolves a bearer token to the principal dict routes receive as current_user.
+    Shared by get_current_user and the WebSocket handshake.
+    Raises HTTPException(401) if the token is invalid or the user no longer exists.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,9 +107,31 @@ async def get_current_user(
         token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = auth_service.get_user_by_username(db, username=token_data.username)
-    if user is None:
-        raise credentials_exception
-    # Return a dictionary representation of the user for simplicity in this scaffold
-    # In a real app, you might return a UserInDB object or a custom User object
-    return {"id": user.id, "username": user.username, "email": user.email}
+    token_user_id = payload.get("uid")
+
+    # Signed claims are as trustworthy as the token itself; no DB round trip needed
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and token_user_id is not None and payload.get("email"):
+        principal_stats["trusted_claims"] += 1
+        return {"id": token_user_id, "username": token_data.username, "email": payload["email"]}
+
+    principal = auth_service.principal_cache.get(token_data.username)
+    if principal is None or (token_user_id is not None and principal["id"] != token_user_id):
+        user = await call_service(db, auth_service.get_user_by_username, username=token_data.username)
+        if user is None:
+            raise credentials_exception
+        # Return a dictionary representation of the user for simplicity in this scaffold
+        # In a real app, you might return a UserInDB object or a custom User object
+        principal = {"id": user.id, "username": user.username, "email": user.email}
+        auth_service.principal_cache.set(token_data.username, principal)
+    # Copy so a route mutating current_user can't corrupt the cached entry
+    return dict(principal)
+
+async def get_current_user(
+    db: AnySession = Depends(get_session),
+    token: str = Depends(oauth2_scheme)
+) -> dict: # Changed return type to dict for simplicity in this scaffold
+    """
+    Dependency to get the current authenticated user.
+    Raises HTTPException if token is invalid or user not found.
+    """
+    return await authenticate_token(db, token)
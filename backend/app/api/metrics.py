@@ -0,0 +1,86 @@
+# backend/app/api/metrics.py
+import logging
+import time
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.database import engine, async_engine
+from app.db.pool_metrics import pool_status
+from app.db.query_metrics import RequestQueries, current_queries, route_query_stats
+from app.api.v1.internal import require_internal_token
+from app.api.v1.splits_ws import manager, user_manager
+
+logger = logging.getLogger(__name__)
+
+
+async def instrument_request(request: Request, call_next):
+    """
+    HTTP middleware: times the request and collects the SQL it issued (via the
+    engine hooks in query_metrics), recording both per route template and
+    warning when one statement repeats often enough to look like an N+1.
+    """
+    queries = RequestQueries()
+    token = current_queries.set(queries)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        current_queries.reset(token)
+        # Route template, not the raw path, to keep label cardinality bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        method = request.method
+
+        repeated = queries.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD)
+        for statement, count in repeated:
+            logger.warning("Likely N+1 in %s %s: statement ran %s times: %s", method, route, count, statement)
+        if repeated:
+            metrics.n_plus_one_requests.inc(method, route)
+
+        metrics.http_request_duration.observe(elapsed, method, route, str(status_code))
+        metrics.http_request_db_time.observe(queries.seconds, method, route)
+        metrics.http_request_queries.observe(queries.count, method, route)
+        route_query_stats.record(f"{method} {route}", queries, len(repeated))
+
+
+def _pool_gauges():
+    pools = {"sync": pool_status(engine.pool), "async": pool_status(async_engine.pool)}
+    for name, key, help_text, kind in (
+        ("db_pool_size", "size", "Configured pool size.", "gauge"),
+        ("db_pool_checked_out", "checked_out", "Connections currently checked out.", "gauge"),
+        ("db_pool_overflow", "overflow", "Overflow connections currently open.", "gauge"),
+        ("db_pool_checkouts_total", "checkouts", "Connection checkouts.", "counter"),
+        ("db_pool_timeouts_total", "timeouts", "Checkouts that timed out waiting for a connection.", "counter"),
+        ("db_pool_wait_seconds_total", "total_wait_seconds", "Time spent waiting for a connection.", "counter"),
+    ):
+        samples = {(engine_name,): status[key] for engine_name, status in pools.items() if key in status}
+        yield metrics.gauge_lines(name, help_text, samples, ("engine",), metric_type=kind)
+
+def _websocket_gauges():
+    gauges = manager.gauges()
+    yield metrics.gauge_lines("ws_open_sockets", "Open group WebSockets.", {(): gauges["open_sockets"]})
+    yield metrics.gauge_lines("ws_connected_users", "Distinct users with an open group WebSocket.", {(): gauges["users_connected"]})
+    yield metrics.gauge_lines("ws_open_groups", "Groups with at least one open WebSocket.", {(): len(gauges["groups"])})
+    yield metrics.gauge_lines(
+        "ws_messages_total", "Group WebSocket messages by outcome.",
+        {(outcome,): gauges[outcome] for outcome in ("sent", "dropped", "evicted")}, ("outcome",),
+        metric_type="counter"
+    )
+    yield metrics.gauge_lines(
+        "ws_user_open_sockets", "Open per-user notification WebSockets.",
+        {(): user_manager.gauges()["open_sockets"]}
+    )
+
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+def get_metrics():
+    """This worker's metrics in the Prometheus text exposition format."""
+    body = metrics.render([*_pool_gauges(), *_websocket_gauges()])
+    return Response(content=body, media_type=metrics.CONTENT_TYPE)
@@ -1,7 +1,7 @@
 # backend/app/api/router.py
 from fastapi import APIRouter
 
-from app.api.v1 import auth, expenses, budgets, analytics,groups,users,splits_ws # Import analytics
+from app.api.v1 import auth, expenses, budgets, analytics,groups,users,splits_ws,internal,settlements # Import analytics
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -9,6 +9,8 @@ api_router.include_router(expenses.router, prefix="/expenses", tags=["expenses"]
 api_router.include_router(budgets.router, prefix="/budgets", tags=["budgets"])
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"]) # Include analytics router
 api_router.include_router(groups.router, prefix="/splits/groups", tags=["splits_groups"]) # Include groups router
+api_router.include_router(settlements.router, prefix="/settlements", tags=["settlements"])
 api_router.include_router(users.router, prefix="/users", tags=["users"]) # Include users router
+api_router.include_router(internal.router, prefix="/internal", tags=["internal"]) # Pool/runtime metrics
 
 api_router.include_router(splits_ws.router) # Mount the router
\ No newline at end of file
@@ -1,33 +1,44 @@
 # backend/app/api/v1/analytics.py
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request
 from typing import List, Dict, Any
 from datetime import datetime
 
-from app.db.database import get_db
+from app.db.database import get_session, AnySession
 from app.services import expense_service
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, call_service, cached_json_response
 
 router = APIRouter()
 
 @router.get("/monthly_spending", response_model=List[Dict[str, Any]])
-def get_monthly_spending(
+async def get_monthly_spending(
+    request: Request,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Get total spending for each month for the authenticated user.
+    Cached until their next expense write; supports If-None-Match.
     """
-    return expense_service.get_monthly_spending_summary(db=db, user_id=current_user["id"])
+    return await cached_json_response(
+        request, db, current_user["id"], ("monthly_spending",),
+        lambda: call_service(db, expense_service.get_monthly_spending_summary, user_id=current_user["id"])
+    )
 
 @router.get("/spending_by_category", response_model=List[Dict[str, Any]])
-def get_category_spending(
+async def get_category_spending(
+    request: Request,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     month: int | None = Query(None, ge=1, le=12, description="Filter by specific month (1-12)"),
     year: int | None = Query(None, ge=2000, description="Filter by specific year")
 ):
     """
     Get total spending by category for the authenticated user, optionally filtered by month and year.
+    Cached until their next expense write; supports If-None-Match.
     """
-    return expense_service.get_spending_by_category(db=db, user_id=current_user["id"], month=month, year=year)
+    return await cached_json_response(
+        request, db, current_user["id"], ("spending_by_category", month, year),
+        lambda: call_service(
+            db, expense_service.get_spending_by_category, user_id=current_user["id"], month=month, year=year
+        )
+    )
@@ -1,43 +1,57 @@
 # backend/app/api/v1/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_session, AnySession
 from app.schemas.user import UserCreate, UserResponse
 from app.schemas.token import Token
 from app.services import auth_service
-from app.core.security import verify_password, create_access_token
+from app.api.deps import call_service, release_connection
+from app.core.security import hash_password_async, verify_and_update_password_async, create_access_token
 from fastapi.security import OAuth2PasswordRequestForm
 from app.core.exceptions import UserAlreadyExistsException, UserNotFoundException # Import custom exceptions
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AnySession = Depends(get_session)):
     """
     Register a new user.
     """
     try:
-        return auth_service.create_user(db=db, user=user)
+        # Reject duplicates before spending a bcrypt hash on them
+        if await call_service(db, auth_service.user_exists, username=user.username, email=user.email):
+            raise UserAlreadyExistsException()
+        await release_connection(db)
+        hashed_password = await hash_password_async(user.password)
+        return await call_service(
+            db, auth_service.create_user, user=user, hashed_password=hashed_password, response_model=UserResponse
+        )
     except UserAlreadyExistsException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AnySession = Depends(get_session)):
     """
     Login to get an access token.
     """
-    user = auth_service.get_user_by_username(db, username=form_data.username)
+    user = await call_service(db, auth_service.get_user_by_username, username=form_data.username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    if not verify_password(form_data.password, user.hashed_password):
+    # Hashing can queue behind a login burst; don't hold a pooled connection meanwhile
+    await release_connection(db)
+    verified, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(data={"sub": user.username})
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS/scheme: upgrade it transparently
+        await call_service(db, auth_service.update_password_hash, user_id=user.id, hashed_password=new_hash)
+    # uid/email let get_current_user skip the users lookup (cache or AUTH_TRUST_TOKEN_CLAIMS)
+    access_token = create_access_token(data={"sub": user.username, "uid": user.id, "email": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,30 +1,36 @@
 # backend/app/api/v1/budgets.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.schemas.budget import BudgetCreate, BudgetResponse
-from app.services import budget_service
-from app.api.deps import get_current_user # Dependency to get authenticated user
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from app.db.database import get_session, AnySession
+from typing import List
+from app.schemas.budget import BudgetCreate, BudgetResponse, BudgetMonthSummary
+from app.services import budget_service, budget_alert_service
+from app.api.v1.splits_ws import notify_user
+from app.api.deps import get_current_user, call_service, cached_json_response # Dependency to get authenticated user
 from datetime import datetime
 from app.core.exceptions import BudgetNotFoundException # Import custom exception
 
 router = APIRouter()
 
 @router.post("/", response_model=BudgetResponse, status_code=status.HTTP_201_CREATED)
-def set_or_update_budget(
+async def set_or_update_budget(
     budget: BudgetCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Set or update a monthly budget for the authenticated user.
+    A budget set below the month's spend so far pushes the thresholds it crosses.
     """
-    return budget_service.create_or_update_budget(db=db, budget=budget, user_id=current_user["id"])
+    db_budget = await call_service(
+        db, budget_service.create_or_update_budget, budget=budget, user_id=current_user["id"], response_model=BudgetResponse
+    )
+    await notify_user(current_user["id"], budget_alert_service.pop_pending(db))
+    return db_budget
 
 @router.get("/", response_model=BudgetResponse | dict)
-def get_budget(
+async def get_budget(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     month: int = Query(datetime.now().month, description="Month for the budget (1-12)"),
     year: int = Query(datetime.now().year, description="Year for the budget")
 ):
@@ -32,20 +38,49 @@ def get_budget(
     Retrieve the budget for a specific month/year for the authenticated user.
     """
     try:
-        budget = budget_service.get_user_budget(db=db, user_id=current_user["id"], month=month, year=year)
+        budget = await call_service(
+            db, budget_service.get_user_budget, user_id=current_user["id"], month=month, year=year, response_model=BudgetResponse
+        )
         return budget
     except BudgetNotFoundException as e:
         # Return a dictionary indicating no budget is set, consistent with remaining budget structure
         return {"budget_set": False, "total_budget": 0.0, "month": month, "year": year}
 
 @router.get("/remaining", response_model=dict)
-def get_remaining_budget_endpoint(
+async def get_remaining_budget_endpoint(
+    request: Request,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     month: int = Query(datetime.now().month, description="Month for remaining budget (1-12)"),
     year: int = Query(datetime.now().year, description="Year for remaining budget")
 ):
     """
     Calculate and retrieve the remaining budget for a specific month/year for the authenticated user.
+    Cached until their next expense or budget write; supports If-None-Match.
     """
-    return budget_service.get_remaining_budget(db=db, user_id=current_user["id"], month=month, year=year)
+    return await cached_json_response(
+        request, db, current_user["id"], ("budgets_remaining", month, year),
+        lambda: call_service(db, budget_service.get_remaining_budget, user_id=current_user["id"], month=month, year=year)
+    )
+
+@router.get("/range", response_model=List[BudgetMonthSummary])
+async def get_budget_range_endpoint(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session),
+    start: str = Query(..., alias="from", pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="First month, YYYY-MM"),
+    end: str = Query(..., alias="to", pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Last month (inclusive), YYYY-MM")
+):
+    """
+    Budget, spent and remaining for every month in a range, from a single query
+    instead of one /remaining call per month. Cached like /remaining.
+    """
+    start_year, start_month = map(int, start.split("-"))
+    end_year, end_month = map(int, end.split("-"))
+    return await cached_json_response(
+        request, db, current_user["id"], ("budgets_range", start, end),
+        lambda: call_service(
+            db, budget_service.get_budget_range, user_id=current_user["id"],
+            start_year=start_year, start_month=start_month, end_year=end_year, end_month=end_month
+        )
+    )
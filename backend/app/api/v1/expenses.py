@@ -1,94 +1,159 @@
 # backend/app/api/v1/expenses.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from anyio import from_thread
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
-from app.db.database import get_db
-from app.schemas.expense import ExpenseBase, ExpenseUpdate, ExpenseResponse
-from app.services import expense_service
+from app.db.database import get_db, get_session, AnySession
+from app.schemas.expense import ExpenseBase, ExpenseUpdate, ExpenseResponse, ExpensePage, ExpenseFileFormat, ExpenseImportResponse
+from app.services import expense_service, budget_alert_service
+from app.api.v1.splits_ws import notify_user
 from app.db.models import ExpenseCategory
-from app.api.deps import get_current_user # Dependency to get authenticated user
+from app.api.deps import get_current_user, call_service # Dependency to get authenticated user
 from app.core.exceptions import ExpenseNotFoundException # Import custom exception
 
 router = APIRouter()
 
 @router.post("/", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
-def create_expense(
+async def create_expense(
     expense: ExpenseBase,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Create a new expense for the authenticated user.
+    Budget thresholds it crosses are pushed to the user's /ws/users/me sockets.
+    """
+    db_expense = await call_service(
+        db, expense_service.create_user_expense, expense=expense, user_id=current_user["id"], response_model=ExpenseResponse
+    )
+    await notify_user(current_user["id"], budget_alert_service.pop_pending(db))
+    return db_expense
+
+@router.post("/import", response_model=ExpenseImportResponse)
+def import_expenses(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one expense object per line)"),
+    file_format: ExpenseFileFormat | None = Query(None, alias="format", description="csv or ndjson; inferred from the file name if omitted"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-import expenses for the authenticated user.
+    Each row is validated like POST /expenses/; invalid rows are reported and skipped.
+    Always runs on the threadpool with a sync session: parsing and validation are
+    CPU-bound and the upload is read with blocking file IO.
     """
-    return expense_service.create_user_expense(db=db, expense=expense, user_id=current_user["id"])
+    if file_format is None:
+        filename = (file.filename or "").lower()
+        file_format = ExpenseFileFormat.NDJSON if filename.endswith((".ndjson", ".jsonl")) else ExpenseFileFormat.CSV
+    # UploadFile spools large uploads to disk, so the file is parsed as a stream
+    result = expense_service.import_user_expenses(
+        db=db, user_id=current_user["id"], file=file.file, file_format=file_format
+    )
+    alerts = budget_alert_service.pop_pending(db)
+    if alerts:
+        from_thread.run(notify_user, current_user["id"], alerts)
+    return result
 
-@router.get("/", response_model=List[ExpenseResponse])
-def read_expenses(
+@router.get("/", response_model=ExpensePage)
+async def read_expenses(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    db: AnySession = Depends(get_session),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=500),
     start_date: datetime | None = Query(None, description="Filter expenses from this date (YYYY-MM-DD)"),
     end_date: datetime | None = Query(None, description="Filter expenses up to this date (YYYY-MM-DD)"),
     category: ExpenseCategory | None = Query(None, description="Filter expenses by category") # NEW: Added group_id query parameter
 ):
     """
-    Retrieve expenses for the authenticated user with optional filters.
+    Retrieve a page of expenses (newest first) for the authenticated user with optional filters.
     """
-    expenses = expense_service.get_user_expenses(
-        db=db,
+    expenses = await call_service(
+        db,
+        expense_service.get_user_expenses,
         user_id=current_user["id"],
-        skip=skip,
+        cursor=cursor,
         limit=limit,
         start_date=start_date,
         end_date=end_date,
         category=category,
+        response_model=ExpensePage,
     )
     return expenses
 
+@router.get("/export")
+def export_expenses(
+    current_user: dict = Depends(get_current_user),
+    file_format: ExpenseFileFormat = Query(ExpenseFileFormat.CSV, alias="format", description="csv or ndjson"),
+    start_date: datetime | None = Query(None, description="Filter expenses from this date (YYYY-MM-DD)"),
+    end_date: datetime | None = Query(None, description="Filter expenses up to this date (YYYY-MM-DD)"),
+    category: ExpenseCategory | None = Query(None, description="Filter expenses by category")
+):
+    """
+    Stream the authenticated user's full expense history as CSV or NDJSON.
+    """
+    media_type = "text/csv" if file_format == ExpenseFileFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        expense_service.stream_user_expenses(
+            user_id=current_user["id"],
+            file_format=file_format,
+            start_date=start_date,
+            end_date=end_date,
+            category=category,
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="expenses.{file_format.value}"'},
+    )
+
 @router.get("/{expense_id}", response_model=ExpenseResponse)
-def read_expense(
+async def read_expense(
     expense_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Retrieve a specific expense by ID for the authenticated user.
     """
     try:
-        expense = expense_service.get_user_expense(db=db, expense_id=expense_id, user_id=current_user["id"])
+        expense = await call_service(
+            db, expense_service.get_user_expense, expense_id=expense_id, user_id=current_user["id"], response_model=ExpenseResponse
+        )
         return expense
     except ExpenseNotFoundException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.put("/{expense_id}", response_model=ExpenseResponse)
-def update_expense(
+async def update_expense(
     expense_id: int,
     expense: ExpenseUpdate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Update an existing expense for the authenticated user.
     """
     try:
-        db_expense = expense_service.update_user_expense(db=db, expense_id=expense_id, user_id=current_user["id"], expense_update=expense)
+        db_expense = await call_service(
+            db, expense_service.update_user_expense, expense_id=expense_id, user_id=current_user["id"],
+            expense_update=expense, response_model=ExpenseResponse
+        )
+        await notify_user(current_user["id"], budget_alert_service.pop_pending(db))
         return db_expense
     except ExpenseNotFoundException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.delete("/{expense_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_expense(
+async def delete_expense(
     expense_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Delete an expense for the authenticated user.
     """
     try:
-        expense_service.delete_user_expense(db=db, expense_id=expense_id, user_id=current_user["id"])
+        await call_service(db, expense_service.delete_user_expense, expense_id=expense_id, user_id=current_user["id"])
         return
     except ExpenseNotFoundException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
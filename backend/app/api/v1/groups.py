@@ -1,47 +1,47 @@
 # # backend/app/api/v1/groups.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.encoders import jsonable_encoder
 from typing import List
-from app.db.database import get_db
-from app.schemas.group import GroupResponse ,GroupCreate, AddGroupMember, GroupExpenseListResponse,GroupDetailResponse ,LeaveGroupResponse ,GroupExpenseResponse, GroupExpenseCreate #  GroupBalancesResponse # Import GroupBalancesResponse
-from app.services import group_service
-from app.api.deps import get_current_user # Dependency to get authenticated user
+from app.db.database import get_session, AnySession
+from app.schemas.group import GroupResponse ,GroupCreate, AddGroupMember, AddGroupMembersBatch, AddGroupMembersBatchResponse, GroupExpenseListResponse, GroupExpenseFeedPage, GroupSummaryResponse, GroupDetailResponse ,LeaveGroupResponse ,GroupExpenseResponse, GroupExpenseCreate, GroupBalancesResponse # Import GroupBalancesResponse
+from app.schemas.settlement import SettlePlanResponse, SettlementResponse
+from app.services import group_service, balance_service, settlement_service
+from app.api.deps import get_current_user, call_service # Dependency to get authenticated user
 from app.core.exceptions import GroupNotFoundException # Import custom exception
 from app.api.v1.splits_ws import manager
+from app.api.v1.settlements import broadcast_settlements
 
 router = APIRouter()
 
 @router.post("/", response_model=GroupResponse, status_code=status.HTTP_201_CREATED)
-def create_group(
+async def create_group(
     group: GroupCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Create a new split group for the authenticated user.
     The creator will automatically be added as a member.
     """
-    return group_service.create_group(db=db, group_in=group, user_id=current_user["id"])
+    return await call_service(db, group_service.create_group, group_in=group, user_id=current_user["id"], response_model=GroupResponse)
 
 @router.post("/{group_id}/expenses", response_model=GroupExpenseResponse, status_code=status.HTTP_201_CREATED)
 async def create_group_expense(
     group_id: int,
     expense: GroupExpenseCreate,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Create a new expense in a group.
     The logged-in user is set as the one who paid.
     """
-    # This service call is synchronous. FastAPI runs it in a separate threadpool
-    # without blocking the event loop.
-    expense_obj = group_service.create_group_expense(
-        db, group_id, expense, current_user["id"]
+    # call_service keeps the synchronous service off the event loop
+    expense_obj = await call_service(
+        db, group_service.create_group_expense, group_id=group_id, expense_in=expense, user_id=current_user["id"]
     )
 
-    # WebSocket broadcast here
+    # WebSocket broadcast here: only queues the message, delivery doesn't hold up the response
     # Use jsonable_encoder to ensure the data is serializable before broadcasting
     expense_data = jsonable_encoder(expense_obj)
     await manager.broadcast(group_id, {
@@ -72,69 +72,110 @@ async def create_group_expense(
     # return expense_obj
 
 
-@router.get("/{group_id}/expenses", response_model=List[GroupExpenseListResponse])
-def list_group_expenses(
+@router.get("/{group_id}/expenses", response_model=GroupExpenseFeedPage)
+async def list_group_expenses(
     group_id: int,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AnySession = Depends(get_session),
+    current_user: dict = Depends(get_current_user),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    include_shares: bool = Query(True, description="Set to false to omit each expense's shares")
 ):
     """
-    returns all the group expeses till date
+    Returns a page of the group's expenses, newest first.
     """
-
-    return group_service.get_list_group_expenses( group_id=group_id ,db=db, user_id=current_user["id"])
+    try:
+        return await call_service(
+            db, group_service.get_list_group_expenses, group_id=group_id, user_id=current_user["id"],
+            cursor=cursor, limit=limit, include_shares=include_shares, response_model=GroupExpenseFeedPage
+        )
+    except GroupNotFoundException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.get("/", response_model=List[GroupResponse])
-def read_groups(
+async def read_groups(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Retrieve all groups the authenticated user is a member of.
     """
-    groups = group_service.get_user_groups(db=db, user_id=current_user["id"])
+    groups = await call_service(db, group_service.get_user_groups, user_id=current_user["id"], response_model=List[GroupResponse])
     return groups
 
+@router.get("/summary", response_model=List[GroupSummaryResponse])
+async def read_group_summaries(
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Retrieve the authenticated user's groups with member counts, the user's net
+    balance and last activity, without loading member lists.
+    """
+    return await call_service(
+        db, group_service.get_user_group_summaries, user_id=current_user["id"],
+        response_model=List[GroupSummaryResponse]
+    )
+
 @router.post("/addMember",response_model=GroupResponse)
-def add_member(
+async def add_member(
     member: AddGroupMember,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Add group member to existing group
     """
-    return group_service.add_group_member(db=db,addMember=member, user_id=current_user["id"])
+    return await call_service(db, group_service.add_group_member, addMember=member, user_id=current_user["id"], response_model=GroupResponse)
+
+@router.post("/{group_id}/members:batch", response_model=AddGroupMembersBatchResponse)
+async def add_members_batch(
+    group_id: int,
+    batch: AddGroupMembersBatch,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Add many members to an existing group by email.
+    Reports for each email whether it was added, already a member or not found.
+    """
+    try:
+        return await call_service(
+            db, group_service.add_group_members, group_id=group_id, emails=batch.emails,
+            user_id=current_user["id"], response_model=AddGroupMembersBatchResponse
+        )
+    except GroupNotFoundException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 @router.get("/getGroupDetail/{groupId}",response_model=GroupDetailResponse)
-def get_group_detail(
+async def get_group_detail(
     groupId:int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Get Specific group details with group members names
     """
 
-    return group_service.get_group_detail(db=db,id=groupId, user_id=current_user["id"])
+    return await call_service(db, group_service.get_group_detail, id=groupId, user_id=current_user["id"])
 
 @router.delete("/leaveGroup/{groupId}",response_model=LeaveGroupResponse)
-def leave_group(
+async def leave_group(
     groupId:int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Get Specific group details with group members names
     """
 
-    return group_service.leave_group(db=db,group_id=groupId, user_id=current_user["id"])
+    return await call_service(db, group_service.leave_group, group_id=groupId, user_id=current_user["id"])
 
 # @router.get("/{group_id}", response_model=GroupResponse)
 # def read_group(
 #     group_id: int,
 #     current_user: dict = Depends(get_current_user),
-#     db: Session = Depends(get_db)
+#     db: AnySession = Depends(get_session)
 # ):
 #     """
 #     Retrieve a specific group by ID, ensuring the authenticated user is a member.
@@ -145,17 +186,46 @@ def leave_group(
 #     except GroupNotFoundException as e:
 #         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-# @router.get("/{group_id}/balances", response_model=GroupBalancesResponse) # NEW: Balances endpoint
-# def get_group_balances_endpoint(
-#     group_id: int,
-#     current_user: dict = Depends(get_current_user),
-#     db: Session = Depends(get_db)
-# ):
-#     """
-#     Calculate and retrieve balances for a specific group.
-#     """
-#     try:
-#         balances_data = group_service.get_group_balances(db=db, group_id=group_id, current_user_id=current_user["id"])
-#         return balances_data
-#     except GroupNotFoundException as e:
-#         raise HTTPException(status_code=e.status_code, detail=e.detail)
+@router.get("/{group_id}/balances", response_model=GroupBalancesResponse)
+async def get_group_balances_endpoint(
+    group_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Retrieve net balances for a specific group from the running balance ledger.
+    """
+    try:
+        return await call_service(db, balance_service.get_group_balances, group_id=group_id, current_user_id=current_user["id"])
+    except GroupNotFoundException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.get("/{group_id}/settle-plan", response_model=SettlePlanResponse)
+async def get_group_settle_plan(
+    group_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Suggest a near-minimal list of transfers that settles every balance in the group.
+    """
+    try:
+        return await call_service(db, settlement_service.get_settle_plan, group_id=group_id, current_user_id=current_user["id"])
+    except GroupNotFoundException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+@router.post("/{group_id}/settle-plan/apply", response_model=List[SettlementResponse], status_code=status.HTTP_201_CREATED)
+async def apply_group_settle_plan(
+    group_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Compute the group's settle-up plan and record every transfer in it with one bulk write.
+    """
+    try:
+        recorded = await call_service(db, settlement_service.apply_settle_plan, group_id=group_id, current_user_id=current_user["id"])
+    except GroupNotFoundException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    await broadcast_settlements(group_id, recorded)
+    return recorded
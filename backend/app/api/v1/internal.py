@@ -0,0 +1,85 @@
+# backend/app/api/v1/internal.py
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.core.config import settings
+from app.core.security import password_hashing_pool
+from app.db.database import engine, async_engine
+from app.db.pool_metrics import pool_status
+from app.db.query_metrics import route_query_stats
+from app.services import auth_service, response_cache
+from app.services import group as group_1
+from app.api.v1.splits_ws import manager, user_manager
+from app.api.deps import principal_stats
+
+def require_internal_token(x_internal_token: str | None = Header(None)):
+    """
+    Guards /internal/* and /metrics with INTERNAL_METRICS_TOKEN. Fails closed:
+    without a configured token the endpoints don't exist (404).
+    """
+    if not settings.INTERNAL_METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(x_internal_token, settings.INTERNAL_METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid internal token")
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/db/pool")
+def get_pool_stats():
+    """
+    Connection pool occupancy and cumulative checkout wait times for this worker,
+    for both the sync (psycopg2) and async (asyncpg) engines.
+    """
+    return {
+        "active_path": "async" if settings.DB_ASYNC else "sync",
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.pool),
+    }
+
+@router.get("/auth/principal_cache")
+def get_principal_cache_stats():
+    """
+    Principal cache effectiveness for this worker. Every cache hit or trusted-claims
+    request is one `SELECT ... FROM users` that get_current_user did not issue.
+    """
+    cache_stats = auth_service.principal_cache.stats()
+    authenticated = cache_stats["hits"] + cache_stats["misses"] + principal_stats["trusted_claims"]
+    saved = cache_stats["hits"] + principal_stats["trusted_claims"]
+    return {
+        **cache_stats,
+        "trusted_claims": principal_stats["trusted_claims"],
+        "db_queries_saved": saved,
+        "db_queries_saved_per_request": saved / authenticated if authenticated else 0.0,
+    }
+
+@router.get("/auth/password_hashing")
+def get_password_hashing_stats():
+    """Size of this worker's bcrypt pool and how many hashes it ran or turned away with a 503."""
+    return password_hashing_pool.stats()
+
+@router.get("/ws")
+def get_websocket_gauges():
+    """
+    Open group sockets in this worker (total, per group, distinct users) with
+    delivery counters, and the membership cache used by the handshake, plus
+    the per-user notification sockets.
+    """
+    return {
+        **manager.gauges(),
+        "membership_cache": group_1.membership_cache.stats(),
+        "user_channels": user_manager.gauges(),
+    }
+
+@router.get("/response_cache")
+def get_response_cache_stats():
+    """Hit rate of this worker's analytics/budget response cache; every hit is a skipped aggregation."""
+    return response_cache.response_cache.stats()
+
+@router.get("/db/queries")
+def get_query_stats():
+    """
+    SQL issued per route in this worker: query count and DB time (total and per
+    request), the slowest statement seen, and how many requests looked like N+1s.
+    """
+    return route_query_stats.snapshot()
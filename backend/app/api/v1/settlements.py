@@ -0,0 +1,79 @@
+# backend/app/api/v1/settlements.py
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.encoders import jsonable_encoder
+from typing import List
+from app.db.database import get_session, AnySession
+from app.schemas.settlement import SettlementCreate, SettlementResponse, SettlementBatchCreate, SettlementTransfer, SettlementPage
+from app.services import settlement_service
+from app.api.deps import get_current_user, call_service # Dependency to get authenticated user
+from app.core.exceptions import GroupNotFoundException, InvalidSettlementException
+from app.api.v1.splits_ws import manager
+
+router = APIRouter()
+
+async def broadcast_settlements(group_id: int, settlements: List[SettlementResponse]):
+    """Sends one coalesced event per write, however many settlements it recorded."""
+    if settlements:
+        await manager.broadcast(group_id, {
+            "event": "SETTLEMENTS_RECORDED",
+            "settlements": jsonable_encoder(settlements)
+        })
+
+@router.post("/", response_model=SettlementResponse, status_code=status.HTTP_201_CREATED)
+async def create_settlement(
+    settlement: SettlementCreate,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Record a payment from one group member to another.
+    """
+    try:
+        recorded = await call_service(
+            db, settlement_service.record_settlements, group_id=settlement.group_id,
+            transfers=[SettlementTransfer(**settlement.model_dump(exclude={"group_id"}))],
+            current_user_id=current_user["id"]
+        )
+    except (GroupNotFoundException, InvalidSettlementException) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    await broadcast_settlements(settlement.group_id, recorded)
+    return recorded[0]
+
+@router.post("/batch", response_model=List[SettlementResponse], status_code=status.HTTP_201_CREATED)
+async def create_settlements_batch(
+    batch: SettlementBatchCreate,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Record many settlements in one group atomically (e.g. a whole settle-up plan).
+    Either all of them are recorded or none are.
+    """
+    try:
+        recorded = await call_service(
+            db, settlement_service.record_settlements, group_id=batch.group_id,
+            transfers=batch.settlements, current_user_id=current_user["id"]
+        )
+    except (GroupNotFoundException, InvalidSettlementException) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    await broadcast_settlements(batch.group_id, recorded)
+    return recorded
+
+@router.get("/", response_model=SettlementPage)
+async def list_settlements(
+    group_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: AnySession = Depends(get_session),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    Retrieve a page of a group's settlement history, newest first.
+    """
+    try:
+        return await call_service(
+            db, settlement_service.get_group_settlements, group_id=group_id,
+            current_user_id=current_user["id"], cursor=cursor, limit=limit
+        )
+    except GroupNotFoundException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
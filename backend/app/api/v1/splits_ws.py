@@ -1,55 +1,387 @@
 # backend/app/api/v1/splits_ws.py
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import functools
 import json
+import logging
+
+from app.core.config import settings
+from app.core.broadcast import Broadcaster, broadcaster as default_broadcaster
+from app.api.deps import authenticate_token, call_service
+from app.db.database import open_session
+from app.services import group as group_1
+from app.services import group_events
+from app.services.group_events import event_buffer, event_seq
+
+logger = logging.getLogger(__name__)
+
+
+class _Connection:
+    """
+    One client socket with its own bounded outbound queue and writer task, so a
+    slow or stalled client only ever delays itself. Live events are held until
+    start() has queued the handshake backlog (replayed or resync events) ahead of them.
+    """
+    def __init__(self, manager: "ConnectionManager", websocket: WebSocket, group_id: int, user_id: Optional[int]):
+        self.manager = manager
+        self.websocket = websocket
+        self.group_id = group_id
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=settings.WS_SEND_QUEUE_SIZE)
+        self.held: Optional[List[str]] = []
+        self.backlog: List[str] = []
+        self._started = asyncio.Event()
+        self.writer = asyncio.create_task(self._drain())
+
+    def start(self, backlog: List[str], after_seq: Optional[int]):
+        """
+        Sends `backlog` first (it bypasses the queue bound, so a long replay isn't
+        mistaken for a slow consumer), then the live events that arrived meanwhile
+        and aren't already covered by it (seq > after_seq).
+        """
+        held, self.held = self.held, None
+        self.backlog = backlog
+        for text in held:
+            seq = event_seq(text)
+            if after_seq is None or seq is None or seq > after_seq:
+                self.offer(text)
+        self._started.set()
+
+    def offer(self, text: str):
+        """Queues an already-serialized message without waiting; applies the slow-consumer policy when full."""
+        if self.held is not None:
+            self.held.append(text)
+            return
+        try:
+            self.queue.put_nowait(text)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if settings.WS_SLOW_CONSUMER_POLICY == "drop":
+            self.queue.get_nowait() # Oldest message goes, newest stays
+            self.queue.put_nowait(text)
+            self.manager.stats["dropped"] += 1
+        else:
+            self.manager.evict(self, "send queue full")
+
+    async def _send(self, text: str):
+        await asyncio.wait_for(self.websocket.send_text(text), settings.WS_SEND_TIMEOUT_SECONDS)
+        self.manager.stats["sent"] += 1
+
+    async def _drain(self):
+        try:
+            await self._started.wait()
+            backlog, self.backlog = self.backlog, []
+            for text in backlog:
+                await self._send(text)
+            while True:
+                await self._send(await self.queue.get())
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.manager.evict(self, "send timed out")
+        except Exception: # Peer went away mid-send; the receive loop will notice too
+            self.manager.evict(self, "send failed")
+
+    async def close(self, code: int):
+        self.writer.cancel()
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), settings.WS_SEND_TIMEOUT_SECONDS)
+        except Exception:
+            pass # Already closed, or the peer is too stalled to take a close frame
+
+
+PING_TEXT = json.dumps({"event": "PING"})
+CONNECTED_TEXT = json.dumps({"event": "CONNECTED"})
+
 
 class ConnectionManager:
-    """Manages active WebSocket connections for group-specific channels."""
-    def __init__(self):
-        # Store active connections: {group_id: [websockets]}
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+    """
+    Manages active WebSocket connections for group-specific channels.
+    Messages go out through the broadcaster, so every worker holding sockets for
+    the group delivers them; this worker subscribes only while it has sockets there.
+    The same manager serves per-user channels (user_manager), keyed by user id
+    instead of group id and without the sequenced event log.
+    """
+    def __init__(self, broadcaster: Optional[Broadcaster] = None, channel_prefix: str = "group", sequenced: bool = True):
+        self.broadcaster = broadcaster or default_broadcaster
+        self.channel_prefix = channel_prefix
+        self.sequenced = sequenced
+        # Store active connections: {group_id: {websocket: connection}}
+        self.active_connections: Dict[int, Dict[WebSocket, _Connection]] = {}
+        self.user_connections: Dict[int, int] = {}
+        self.subscribed: Set[int] = set()
+        self._subscription_lock = asyncio.Lock()
+        self.stats = {"sent": 0, "dropped": 0, "evicted": 0}
+
+    def channel(self, group_id: int) -> str:
+        return f"{self.channel_prefix}_{group_id}"
+
+    async def _sync_subscription(self, group_id: int):
+        """Subscribes to a group's channel while it has local sockets and unsubscribes after."""
+        async with self._subscription_lock:
+            wanted = group_id in self.active_connections
+            try:
+                if wanted and group_id not in self.subscribed:
+                    await self.broadcaster.subscribe(self.channel(group_id), functools.partial(self.deliver, group_id))
+                    self.subscribed.add(group_id)
+                elif not wanted and group_id in self.subscribed:
+                    self.subscribed.discard(group_id)
+                    await self.broadcaster.unsubscribe(self.channel(group_id))
+                    if self.sequenced and settings.GROUP_EVENT_LOG_BACKEND == "table":
+                        # Unsubscribed, the buffer would silently fall behind; the table still has the events
+                        event_buffer.forget(group_id)
+            except Exception:
+                # Retried on the group's next connect; until then only local broadcasts arrive
+                logger.exception("Could not update the broadcast subscription for group %s", group_id)
 
-    async def connect(self, websocket: WebSocket, group_id: int):
-        """Accepts a new WebSocket connection and adds it to the group's list."""
-        await websocket.accept()
-        if group_id not in self.active_connections:
-            self.active_connections[group_id] = []
-        self.active_connections[group_id].append(websocket)
-        print(f"New connection in group {group_id}. Total: {len(self.active_connections[group_id])}")
+    def refusal(self, group_id: int, user_id: Optional[int]) -> Optional[str]:
+        """Returns why a new socket would exceed this worker's connection caps, or None."""
+        if len(self.active_connections.get(group_id, {})) >= settings.WS_MAX_CONNECTIONS_PER_GROUP:
+            return "group connection limit reached"
+        if user_id is not None and self.user_connections.get(user_id, 0) >= settings.WS_MAX_CONNECTIONS_PER_USER:
+            return "user connection limit reached"
+        return None
 
+    async def connect(
+        self, websocket: WebSocket, group_id: int, user_id: Optional[int] = None, since: Optional[int] = None
+    ) -> bool:
+        """
+        Accepts a new WebSocket connection and adds it to the group's channel.
+        The first message is a CONNECTED event with the group's latest sequence
+        number or, when the client passes `since`, the events it missed (or a
+        RESYNC_REQUIRED event if they are no longer available).
+        Returns False, without accepting, when the connection caps are reached.
+        """
+        reason = self.refusal(group_id, user_id)
+        if reason:
+            logger.info("Refused WebSocket for user %s in group %s: %s", user_id, group_id, reason)
+            return False
+        # Count the socket before the accept handshake yields, so concurrent connects can't overshoot
+        if user_id is not None:
+            self.user_connections[user_id] = self.user_connections.get(user_id, 0) + 1
+        try:
+            await websocket.accept()
+        except Exception:
+            self._release_user(user_id)
+            raise
+        connection = _Connection(self, websocket, group_id, user_id)
+        self.active_connections.setdefault(group_id, {})[websocket] = connection
+        logger.debug("WebSocket opened in group %s (%s open)", group_id, len(self.active_connections[group_id]))
+        # Subscribed before the backlog is read, so nothing published meanwhile is missed
+        await self._sync_subscription(group_id)
+        if not self.sequenced:
+            connection.start([CONNECTED_TEXT], None)
+            return True
+        try:
+            backlog = await self._handshake_backlog(group_id, since)
+        except Exception:
+            logger.exception("Could not read the event log for group %s", group_id)
+            backlog = [json.dumps({"event": "RESYNC_REQUIRED", "seq": None})]
+        seqs = [seq for seq in map(event_seq, backlog) if seq is not None]
+        connection.start(backlog, max(seqs) if seqs else since)
+        return True
+
+    async def _latest_seq(self, group_id: int) -> int:
+        latest = event_buffer.latest(group_id)
+        if latest is None and settings.GROUP_EVENT_LOG_BACKEND == "table":
+            async with open_session() as db:
+                latest = await call_service(db, group_events.get_latest_seq, group_id=group_id)
+        return latest or 0
+
+    async def _handshake_backlog(self, group_id: int, since: Optional[int]) -> List[str]:
+        """Events after `since` from the ring buffer (or the table), else a CONNECTED/RESYNC_REQUIRED event."""
+        if since is not None:
+            replay = event_buffer.since(group_id, since)
+            if replay is None:
+                if settings.GROUP_EVENT_LOG_BACKEND == "table":
+                    async with open_session() as db:
+                        replay = await call_service(db, group_events.get_events_since, group_id=group_id, since=since)
+                elif since == (event_buffer.latest(group_id) or 0):
+                    replay = [] # Nothing has happened since
+            if replay is not None:
+                return replay
+        event = "CONNECTED" if since is None else "RESYNC_REQUIRED"
+        return [json.dumps({"event": event, "seq": await self._latest_seq(group_id)})]
+
+    def _release_user(self, user_id: Optional[int]):
+        if user_id is None:
+            return
+        remaining = self.user_connections.get(user_id, 0) - 1
+        if remaining > 0:
+            self.user_connections[user_id] = remaining
+        else:
+            self.user_connections.pop(user_id, None)
 
     def disconnect(self, websocket: WebSocket, group_id: int):
-        """Removes a WebSocket connection from the group's list."""
-        if group_id in self.active_connections:
-            self.active_connections[group_id].remove(websocket)
-            # If the group has no more connections, remove the group key
-            if not self.active_connections[group_id]:
-                del self.active_connections[group_id]
-            print(f"Connection closed in group {group_id}.")
+        """Removes a WebSocket connection from the group's channel and stops its writer. Idempotent."""
+        connections = self.active_connections.get(group_id)
+        if not connections or websocket not in connections:
+            return
+        connection = connections.pop(websocket)
+        connection.writer.cancel()
+        self._release_user(connection.user_id)
+        # If the group has no more connections, remove the group key
+        if not connections:
+            del self.active_connections[group_id]
+            asyncio.create_task(self._sync_subscription(group_id))
+        logger.debug("WebSocket closed in group %s", group_id)
+
+    def evict(self, connection: _Connection, reason: str):
+        """Drops a slow or broken consumer and closes its socket in the background."""
+        if connection.websocket not in self.active_connections.get(connection.group_id, {}):
+            return
+        self.disconnect(connection.websocket, connection.group_id)
+        self.stats["evicted"] += 1
+        logger.info("Evicted WebSocket in group %s: %s", connection.group_id, reason)
+        asyncio.create_task(connection.close(status.WS_1013_TRY_AGAIN_LATER))
 
+    def ping(self, websocket: WebSocket, group_id: int):
+        """Queues a heartbeat on one socket; a slow consumer is handled like any other message."""
+        connection = self.active_connections.get(group_id, {}).get(websocket)
+        if connection:
+            connection.offer(PING_TEXT)
+
+    def gauges(self) -> Dict[str, Any]:
+        """Open sockets in this worker, in total, per group and per user, plus delivery counters."""
+        return {
+            "open_sockets": sum(len(connections) for connections in self.active_connections.values()),
+            "groups": {group_id: len(connections) for group_id, connections in self.active_connections.items()},
+            "users_connected": len(self.user_connections),
+            "subscribed_channels": len(self.subscribed),
+            **self.stats,
+        }
+
+    def deliver(self, group_id: int, text: str):
+        """Buffers a serialized event and queues it on every socket this worker holds for the group."""
+        seq = event_seq(text) if self.sequenced else None
+        if seq is not None:
+            event_buffer.append(group_id, seq, text)
+        for connection in list(self.active_connections.get(group_id, {}).values()):
+            connection.offer(text)
 
     async def broadcast(self, group_id: int, message: dict):
-        """Sends a JSON message to all clients connected to a specific group."""
-        if group_id in self.active_connections:
-            connections = self.active_connections[group_id]
-            # The message is sent as a JSON string
-            for connection in connections:
-                await connection.send_json(message)
-
-# Singleton instance of the manager
+        """
+        Numbers the event with the group's next sequence number, serializes it once
+        and publishes it to the group's channel. Returns once it is published;
+        delivery happens on each socket's writer task.
+        """
+        try:
+            if not self.sequenced:
+                text = json.dumps(message)
+            elif settings.GROUP_EVENT_LOG_BACKEND == "table":
+                async with open_session() as db:
+                    seq, text = await call_service(db, group_events.record_event, group_id=group_id, message=message)
+            else:
+                seq = event_buffer.next_seq(group_id)
+                text = json.dumps({**message, "seq": seq})
+                event_buffer.append(group_id, seq, text)
+        except Exception:
+            logger.exception("Could not record an event for group %s; sending it unsequenced", group_id)
+            text = json.dumps(message)
+        try:
+            await self.broadcaster.publish(self.channel(group_id), text)
+        except Exception:
+            # The write that triggered this already committed; reach local sockets at least
+            logger.exception("Broadcast for group %s failed; delivering locally only", group_id)
+            self.deliver(group_id, text)
+
+# Singleton instances: group channels, and per-user channels (budget alerts)
 manager = ConnectionManager()
+user_manager = ConnectionManager(channel_prefix="user", sequenced=False)
+
+async def notify_user(user_id: int, events: List[dict]):
+    """Pushes events (e.g. budget_alert_service.pop_pending) to every socket the user has open on /ws/users/me."""
+    for event in events:
+        await user_manager.broadcast(user_id, event)
 
 # WebSocket router
 router = APIRouter()
 
+async def _authorize(websocket: WebSocket, group_id: Optional[int] = None) -> Optional[int]:
+    """
+    Authenticates the handshake with the same JWT as get_current_user, passed as
+    ?token= (browsers can't set headers on a WebSocket) or an Authorization header,
+    and, for a group channel, checks group membership. Returns the user id, or None to refuse.
+    """
+    token = websocket.query_params.get("token")
+    if not token:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    if not token:
+        return None
+    # A short-lived session: the socket must not hold a pooled connection while open
+    async with open_session() as db:
+        try:
+            principal = await authenticate_token(db, token)
+        except HTTPException:
+            return None
+        if group_id is None:
+            return principal["id"]
+        is_member = await call_service(
+            db, group_1.is_group_member_cached, group_id=group_id, user_id=principal["id"]
+        )
+    return principal["id"] if is_member else None
+
+async def _receive_until_idle(websocket: WebSocket, group_id: int, channel_manager: ConnectionManager = manager):
+    """
+    Reads client messages until the socket closes. Any message counts as activity;
+    after WS_PING_INTERVAL_SECONDS of silence a PING is sent, and a client silent
+    for WS_IDLE_TIMEOUT_SECONDS is treated as a dead peer and closed.
+    """
+    loop = asyncio.get_running_loop()
+    last_seen = loop.time()
+    while True:
+        try:
+            # The endpoint listens for messages but doesn't need to act on them.
+            # The main purpose is broadcasting from HTTP endpoints.
+            await asyncio.wait_for(websocket.receive_text(), settings.WS_PING_INTERVAL_SECONDS)
+            last_seen = loop.time()
+        except asyncio.TimeoutError:
+            if loop.time() - last_seen >= settings.WS_IDLE_TIMEOUT_SECONDS:
+                logger.info("Closing idle WebSocket on %s", channel_manager.channel(group_id))
+                await websocket.close(code=status.WS_1001_GOING_AWAY)
+                return
+            channel_manager.ping(websocket, group_id)
+
 @router.websocket("/ws/groups/{group_id}")
 async def websocket_endpoint(websocket: WebSocket, group_id: int):
     """WebSocket endpoint that handles client connections for a specific group."""
-    await manager.connect(websocket, group_id)
+    user_id = await _authorize(websocket, group_id)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    since = websocket.query_params.get("since")
+    since = int(since) if since and since.isdigit() else None
+    if not await manager.connect(websocket, group_id, user_id, since=since):
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
     try:
-        while True:
-            # The endpoint listens for messages but doesn't need to act on them.
-            # This keeps the connection alive. The main purpose is broadcasting from HTTP endpoints.
-            await websocket.receive_text()
+        await _receive_until_idle(websocket, group_id)
     except WebSocketDisconnect:
+        pass
+    except RuntimeError:
+        pass # The socket was closed from our side (evicted) while waiting to receive
+    finally:
         manager.disconnect(websocket, group_id)
+
+@router.websocket("/ws/users/me")
+async def user_websocket_endpoint(websocket: WebSocket):
+    """The authenticated user's own channel; carries BUDGET_THRESHOLD alerts."""
+    user_id = await _authorize(websocket)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if not await user_manager.connect(websocket, user_id, user_id):
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    try:
+        await _receive_until_idle(websocket, user_id, user_manager)
+    except WebSocketDisconnect:
+        pass
+    except RuntimeError:
+        pass # The socket was closed from our side (evicted) while waiting to receive
+    finally:
+        user_manager.disconnect(websocket, user_id)
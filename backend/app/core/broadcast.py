@@ -0,0 +1,130 @@
+# backend/app/core/broadcast.py
+"""
+Pub/sub used to fan group events out across worker processes.
+
+Every worker publishes to a channel per group and subscribes only to the
+channels of groups it currently holds sockets for; subscribers get the
+already-serialized message text. BROADCAST_BACKEND picks the implementation:
+"memory" (single process, the default) or "postgres" (LISTEN/NOTIFY on the
+database we already run, so events reach sockets held by other workers and
+replicas).
+"""
+import asyncio
+import logging
+from typing import Callable, Dict
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Subscriber = Callable[[str], None]
+
+# NOTIFY payloads are limited to 8000 bytes by Postgres
+PG_NOTIFY_MAX_BYTES = 7999
+
+
+class Broadcaster:
+    """Interface: subscribe/unsubscribe are idempotent, publish never waits for delivery."""
+    async def subscribe(self, channel: str, callback: Subscriber):
+        raise NotImplementedError
+
+    async def unsubscribe(self, channel: str):
+        raise NotImplementedError
+
+    async def publish(self, channel: str, text: str):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class MemoryBroadcaster(Broadcaster):
+    """Delivers straight to this process's subscribers."""
+    def __init__(self):
+        self.subscribers: Dict[str, Subscriber] = {}
+
+    async def subscribe(self, channel: str, callback: Subscriber):
+        self.subscribers[channel] = callback
+
+    async def unsubscribe(self, channel: str):
+        self.subscribers.pop(channel, None)
+
+    async def publish(self, channel: str, text: str):
+        callback = self.subscribers.get(channel)
+        if callback:
+            callback(text)
+
+
+class PostgresBroadcaster(Broadcaster):
+    """
+    LISTEN/NOTIFY over one dedicated asyncpg connection per worker. Postgres echoes
+    a NOTIFY to every listener including the sender, so local sockets are reached
+    the same way as remote ones. The connection is opened on first use and
+    reopened (re-listening every channel) if it drops.
+    LISTEN needs a session, so point BROADCAST_DATABASE_URL past PgBouncer's
+    transaction pooling when DB_PGBOUNCER is on.
+    """
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.subscribers: Dict[str, Subscriber] = {}
+        self._conn = None
+        self._lock = asyncio.Lock() # asyncpg runs one command per connection at a time
+
+    def _on_notify(self, connection, pid, channel, payload):
+        callback = self.subscribers.get(channel)
+        if callback:
+            callback(payload)
+
+    async def _connection(self):
+        if self._conn is None or self._conn.is_closed():
+            import asyncpg
+            self._conn = await asyncpg.connect(self.dsn)
+            for channel in self.subscribers:
+                await self._conn.add_listener(channel, self._on_notify)
+            logger.info("Broadcast connection opened, listening on %s channel(s)", len(self.subscribers))
+        return self._conn
+
+    async def subscribe(self, channel: str, callback: Subscriber):
+        async with self._lock:
+            known = channel in self.subscribers
+            self.subscribers[channel] = callback
+            if not known:
+                await (await self._connection()).add_listener(channel, self._on_notify)
+
+    async def unsubscribe(self, channel: str):
+        async with self._lock:
+            if self.subscribers.pop(channel, None) and self._conn is not None and not self._conn.is_closed():
+                await self._conn.remove_listener(channel, self._on_notify)
+
+    async def publish(self, channel: str, text: str):
+        if len(text.encode()) > PG_NOTIFY_MAX_BYTES:
+            # Too big for NOTIFY: reach this worker's sockets at least
+            logger.warning("Broadcast on %s exceeds the NOTIFY payload limit; delivered locally only", channel)
+            callback = self.subscribers.get(channel)
+            if callback:
+                callback(text)
+            return
+        async with self._lock:
+            await (await self._connection()).execute("SELECT pg_notify($1, $2)", channel, text)
+
+    async def close(self):
+        async with self._lock:
+            if self._conn is not None:
+                await self._conn.close()
+                self._conn = None
+
+
+def postgres_dsn() -> str:
+    """asyncpg DSN for LISTEN/NOTIFY, from BROADCAST_DATABASE_URL or DATABASE_URL."""
+    url = make_url(settings.BROADCAST_DATABASE_URL or settings.DATABASE_URL).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+def create_broadcaster() -> Broadcaster:
+    if settings.BROADCAST_BACKEND == "postgres":
+        return PostgresBroadcaster(postgres_dsn())
+    return MemoryBroadcaster()
+
+# Per-process instance shared by the WebSocket manager
+broadcaster = create_broadcaster()
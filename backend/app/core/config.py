@@ -1,5 +1,7 @@
 # backend/app/core/config.py
 import os
+from typing import List
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -7,11 +9,112 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
 
     DATABASE_URL: str
+    # Serve API routes from an asyncpg AsyncSession instead of the sync
+    # psycopg2 session + threadpool. ASYNC_DATABASE_URL defaults to DATABASE_URL
+    # with the postgresql+asyncpg driver.
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool (per engine, per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0 # Seconds to wait for a free connection before erroring
+    DB_POOL_RECYCLE: int = 1800 # Seconds after which a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True # Detects connections killed by a Postgres restart
+    DB_STATEMENT_TIMEOUT_MS: int = 0 # Per-statement server-side timeout; 0 disables
+    # Running behind PgBouncer in transaction mode: let PgBouncer do the pooling,
+    # avoid server-side prepared statements and session-level SETs
+    DB_PGBOUNCER: bool = False
+    # Per-request SQL instrumentation (engine event hooks): statements slower than
+    # SQL_SLOW_QUERY_MS are logged, and a statement issued SQL_N_PLUS_ONE_THRESHOLD
+    # or more times in one request is flagged as a likely N+1 pattern
+    SQL_INSTRUMENTATION: bool = True
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # /internal/* and /metrics require a matching X-Internal-Token header; they
+    # answer 404 while no token is configured
+    INTERNAL_METRICS_TOKEN: str | None = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7 # Optional: for refresh tokens
 
+    # Authenticated-principal cache used by get_current_user (per worker process).
+    # PRINCIPAL_CACHE_SIZE=0 disables it. With AUTH_TRUST_TOKEN_CLAIMS the user id
+    # and email signed into the JWT are trusted for the token's lifetime and no
+    # lookup happens at all.
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # Password hashing runs on its own small executor so a login burst can't starve
+    # the threadpool used by other routes. Requests beyond workers + queue limit get 503.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+
+    # Bulk expense import: rows validated and inserted per transaction, and the
+    # cap on per-row errors echoed back so huge bad files don't blow up the response
+    IMPORT_CHUNK_SIZE: int = 5000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    # Bulk expense export: rows fetched per round trip from the server-side cursor
+    EXPORT_BATCH_SIZE: int = 2000
+
+    # Group WebSocket fan-out: each socket gets a bounded outbound queue drained by
+    # its own writer task. A socket whose queue is full, or whose send takes longer
+    # than WS_SEND_TIMEOUT_SECONDS, is a slow consumer: "evict" closes it (the
+    # client reconnects and refetches), "drop" discards its oldest queued message.
+    WS_SEND_QUEUE_SIZE: int = 64
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0
+    WS_SLOW_CONSUMER_POLICY: str = "evict"
+    # Handshake and liveness: the server sends {"event": "PING"} after
+    # WS_PING_INTERVAL_SECONDS of client silence and closes sockets silent for
+    # WS_IDLE_TIMEOUT_SECONDS. Connection caps are per worker process.
+    WS_PING_INTERVAL_SECONDS: float = 20.0
+    WS_IDLE_TIMEOUT_SECONDS: float = 60.0
+    WS_MAX_CONNECTIONS_PER_USER: int = 20
+    WS_MAX_CONNECTIONS_PER_GROUP: int = 1000
+    # Positive group-membership lookups cached for the WebSocket handshake
+    MEMBERSHIP_CACHE_SIZE: int = 10000
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 60
+    # Cross-worker delivery of group events: "memory" (single process) or
+    # "postgres" (LISTEN/NOTIFY). BROADCAST_DATABASE_URL defaults to DATABASE_URL.
+    BROADCAST_BACKEND: str = "memory"
+    BROADCAST_DATABASE_URL: str | None = None
+    # Group events carry a per-group sequence number; clients reconnect with
+    # ?since=<seq> to replay what they missed from a ring buffer of the last
+    # GROUP_EVENT_BUFFER_SIZE events. "memory" numbers events per process (single
+    # worker); "table" numbers and keeps them in Postgres (needed with several
+    # workers), retaining GROUP_EVENT_TABLE_RETENTION events per group. Startup
+    # refuses BROADCAST_BACKEND=postgres with the "memory" log.
+    GROUP_EVENT_LOG_BACKEND: str = "memory"
+    GROUP_EVENT_BUFFER_SIZE: int = 256
+    GROUP_EVENT_TABLE_RETENTION: int = 1000
+
+    # Analytics and budget read responses cached per worker, keyed by the user's
+    # data version (bumped with every expense/budget write), so entries never go
+    # stale; the TTL only bounds how long unused entries hold memory.
+    # RESPONSE_CACHE_SIZE=0 disables it (ETags and 304s still apply).
+    RESPONSE_CACHE_SIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: int = 600
+
+    # Budget alerts: pushed over the user's WebSocket (/ws/users/me) when an expense
+    # write takes the month's running spend past one of these percentages of the
+    # month's budget; each threshold fires at most once per month
+    BUDGET_ALERT_THRESHOLDS: List[int] = [50, 80, 100]
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @model_validator(mode="after")
+    def check_group_event_numbering(self) -> "Settings":
+        # Each worker would number its events on its own, so two workers can hand
+        # different events the same seq and ?since= replays silently lose one
+        if self.BROADCAST_BACKEND == "postgres" and self.GROUP_EVENT_LOG_BACKEND == "memory":
+            raise ValueError(
+                'BROADCAST_BACKEND="postgres" needs GROUP_EVENT_LOG_BACKEND="table": '
+                'the "memory" event log numbers group events per worker process'
+            )
+        return self
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,16 @@
+# backend/app/core/dates.py
+from datetime import datetime, timezone
+from typing import Tuple
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    """
+    Returns the half-open [month_start, next_month_start) range for a month, in UTC.
+    Filtering on `date >= start AND date < end` lets the planner use an index on the
+    date column, which `extract('month', date) == month` cannot.
+    """
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    if month == 12:
+        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        end = datetime(year, month + 1, 1, tzinfo=timezone.utc)
+    return start, end
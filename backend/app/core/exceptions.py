@@ -29,3 +29,27 @@ class BudgetNotFoundException(CustomException):
 class GroupNotFoundException(CustomException): # NEW: Added GroupNotFoundException
     def __init__(self):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found or you do not have access to it")
+
+class InvalidCursorException(CustomException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+class PasswordHashingBusyException(CustomException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many login attempts in progress, please retry shortly")
+
+class InvalidSettlementException(CustomException):
+    def __init__(self, detail: str = "Invalid settlement"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+class LedgerImbalanceException(CustomException):
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Group balances are inconsistent and cannot be settled")
+
+class InvalidMonthRangeException(CustomException):
+    def __init__(self, detail: str = "Invalid month range"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+class InvalidSplitException(CustomException):
+    def __init__(self, detail: str = "Shares must add up to the expense amount"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -0,0 +1,115 @@
+# backend/app/core/metrics.py
+"""
+Minimal Prometheus instruments rendered in the text exposition format, so
+/metrics needs no client library. Values are per worker process; Prometheus
+sums them across workers when each is scraped (or aggregated) separately.
+"""
+import bisect
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def gauge_lines(name: str, help_text: str, samples: Dict[LabelValues, float], label_names: Sequence[str] = (),
+                metric_type: str = "gauge") -> List[str]:
+    """Exposition lines for values read at scrape time (pool occupancy, open sockets...)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for values, value in samples.items():
+        lines.append(f"{name}{_labels(label_names, values)} {_number(value)}")
+    return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            samples = dict(self._values)
+        return gauge_lines(self.name, self.help_text, samples, self.label_names, metric_type="counter")
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = tuple(label_names)
+        # Per label set: non-cumulative bucket counts (+Inf last), sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            counts, total = self._series.setdefault(label_values, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bucket_labels = self.label_names + ("le",)
+        with self._lock:
+            series = {values: (list(counts), total[0]) for values, (counts, total) in self._series.items()}
+        for values, (counts, total) in series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(bucket_labels, values + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, values)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, values)} {cumulative}")
+        return lines
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    LATENCY_BUCKETS, ("method", "route", "status")
+)
+http_request_db_time = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request.",
+    LATENCY_BUCKETS, ("method", "route")
+)
+http_request_queries = Histogram(
+    "http_request_queries", "SQL statements issued per HTTP request.",
+    QUERY_COUNT_BUCKETS, ("method", "route")
+)
+n_plus_one_requests = Counter(
+    "sql_n_plus_one_requests_total", "Requests that repeated one statement SQL_N_PLUS_ONE_THRESHOLD+ times.",
+    ("method", "route")
+)
+
+REQUEST_METRICS = (http_request_duration, http_request_db_time, http_request_queries, n_plus_one_requests)
+
+def render(extra: Iterable[List[str]] = ()) -> str:
+    """The request metrics plus any scrape-time gauge blocks, as one exposition document."""
+    lines: List[str] = []
+    for metric in REQUEST_METRICS:
+        lines.extend(metric.render())
+    for block in extra:
+        lines.extend(block)
+    return "\n".join(lines) + "\n"
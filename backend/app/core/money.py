@@ -0,0 +1,59 @@
+# backend/app/core/money.py
+"""
+Money handling. Amounts are stored as BIGINT minor units (cents, see
+app.db.types.MinorUnits) and carried through Python as Decimal quantized to
+cents, so sums, balances and split checks are exact instead of float-approximate.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Annotated, Any, List
+
+from pydantic import AfterValidator, PlainSerializer
+
+CENT = Decimal("0.01")
+
+def quantize(value: Any) -> Decimal:
+    """Rounds an amount in major units to whole cents, half away from zero."""
+    if isinstance(value, float):
+        value = repr(value) # Shortest round-tripping form, so 0.1 stays 0.1
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+def to_minor_units(value: Any) -> int:
+    """Converts an amount in major units to integer cents."""
+    return int(quantize(value) * 100)
+
+def from_minor_units(cents: Any) -> Decimal:
+    """Converts integer cents (or an integral Decimal, e.g. a SUM) to major units."""
+    return Decimal(cents).scaleb(-2)
+
+def reconcile_shares(total: Decimal, shares: List[Decimal]) -> List[Decimal]:
+    """
+    Makes split shares add up to the total exactly. Shares rounded to cents one by
+    one can each be off by under a cent, so a gap of up to one cent per share is
+    spread a cent at a time over the first shares. Raises ValueError for a larger gap.
+    """
+    share_cents = [to_minor_units(share) for share in shares]
+    gap = to_minor_units(total) - sum(share_cents)
+    if abs(gap) > len(share_cents):
+        raise ValueError(f"Shares add up to {from_minor_units(sum(share_cents))}, not {quantize(total)}.")
+    step = 1 if gap > 0 else -1
+    for i in range(abs(gap)):
+        share_cents[i] += step
+    return [from_minor_units(cents) for cents in share_cents]
+
+def require_positive(value: Decimal) -> Decimal:
+    """Rejects amounts that are zero or negative once rounded to cents."""
+    if value <= 0:
+        raise ValueError("Amount must be at least 0.01")
+    return value
+
+# Pydantic field for amounts: accepts numbers or numeric strings, rounds them to
+# cents and writes them to JSON as plain numbers, as the API always has.
+Money = Annotated[
+    Decimal,
+    AfterValidator(quantize),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
+
+# Money that must be at least one cent. The check runs after rounding (a Field(gt=0)
+# constraint would run before it and let 0.001 through as 0.00).
+PositiveMoney = Annotated[Money, AfterValidator(require_positive)]
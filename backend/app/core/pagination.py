@@ -0,0 +1,25 @@
+# backend/app/core/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Tuple
+
+from app.core.exceptions import InvalidCursorException
+
+def encode_cursor(sort_value: datetime, item_id: int) -> str:
+    """
+    Encodes the (timestamp, id) position of the last row on a page as an opaque,
+    URL-safe cursor for keyset pagination.
+    """
+    raw = json.dumps([sort_value.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodes a cursor produced by encode_cursor back into (timestamp, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(item_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise InvalidCursorException()
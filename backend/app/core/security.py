@@ -1,12 +1,58 @@
 # backend/app/core/security.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Callable, Tuple
+from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.exceptions import PasswordHashingBusyException
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min_rounds makes needs_update() flag hashes made with a lower cost than configured
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+class PasswordHashingPool:
+    """
+    Dedicated, size-limited executor for bcrypt work.
+    At most `workers` hashes run at once and at most `queue_limit` more wait;
+    anything beyond that is rejected immediately instead of queueing unboundedly.
+    """
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def run(self, fn: Callable, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHashingBusyException()
+        future = self._executor.submit(fn, *args)
+        # Free the slot when the hash actually finishes, even if the request was cancelled
+        future.add_done_callback(lambda _: self._slots.release())
+        result = await asyncio.wrap_future(future)
+        self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+password_hashing_pool = PasswordHashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed one."""
@@ -16,6 +62,18 @@ def get_password_hash(password: str) -> str:
     """Hashes a password."""
     return pwd_context.hash(password)
 
+async def hash_password_async(password: str) -> str:
+    """Hashes a password on the password hashing pool."""
+    return await password_hashing_pool.run(pwd_context.hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password on the password hashing pool.
+    Returns (verified, new_hash); new_hash is set when the stored hash is outdated
+    (e.g. BCRYPT_ROUNDS was raised) and should replace it.
+    """
+    return await password_hashing_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Creates a JWT access token."""
     to_encode = data.copy()
@@ -30,16 +30,19 @@ def get_item_by_id(db: Session, model: Type[ModelType], item_id: int) -> Optiona
     """
     return db.query(model).filter(model.id == item_id).first()
 
-def get_items(db: Session, model: Type[ModelType], skip: int = 0, limit: int = 100) -> List[ModelType]:
+def get_items(db: Session, model: Type[ModelType], after_id: Optional[int] = None, limit: int = 100) -> List[ModelType]:
     """
-    Retrieves a list of records.
+    Retrieves a page of records ordered by primary key (keyset pagination).
     :param db: SQLAlchemy session.
     :param model: The SQLAlchemy ORM model class.
-    :param skip: Number of records to skip.
+    :param after_id: Return only records with an ID greater than this (the last ID of the previous page).
     :param limit: Maximum number of records to return.
     :return: A list of ORM objects.
     """
-    return db.query(model).offset(skip).limit(limit).all()
+    query = db.query(model)
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+    return query.order_by(model.id).limit(limit).all()
 
 def update_item(db: Session, db_obj: ModelType, obj_in: Dict[str, Any]) -> ModelType:
     """
@@ -1,14 +1,84 @@
 #backend/app/db/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from contextlib import asynccontextmanager
+from typing import Union, Dict, Any
+from uuid import uuid4
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url, Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
+from app.db.pool_metrics import TimedQueuePool, TimedAsyncQueuePool
+from app.db.query_metrics import instrument_engine
+
+def _engine_options(async_driver: bool) -> Dict[str, Any]:
+    """Builds create_engine/create_async_engine kwargs from the DB_* settings."""
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer owns the pool; startup options such as statement_timeout are
+        # rejected by it, so the timeout is applied per transaction instead.
+        options: Dict[str, Any] = {"poolclass": NullPool}
+        if async_driver:
+            # Server-side prepared statements don't survive transaction pooling
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    options = {
+        "poolclass": TimedAsyncQueuePool if async_driver else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if timeout_ms > 0:
+        if async_driver:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+def _set_statement_timeout_per_transaction(sync_engine: Engine):
+    """Issues SET LOCAL statement_timeout at the start of every transaction (PgBouncer mode)."""
+    @event.listens_for(sync_engine, "begin")
+    def set_statement_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
 
 # Create the SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(async_driver=False))
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async (asyncpg) engine, used by the API when settings.DB_ASYNC is enabled.
+# Engines connect lazily, so building it costs nothing when the sync path is active.
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or make_url(settings.DATABASE_URL).set(
+    drivername="postgresql+asyncpg"
+).render_as_string(hide_password=False)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(async_driver=True))
+
+if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+    _set_statement_timeout_per_transaction(engine)
+    _set_statement_timeout_per_transaction(async_engine.sync_engine)
+
+if settings.SQL_INSTRUMENTATION:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+
+# expire_on_commit=False: response models read attributes after the service commits,
+# and an expired attribute can't lazy-load outside the greenlet that owns the connection
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+
+# Either session type, depending on which path get_session hands out
+AnySession = Union[Session, AsyncSession]
+
 # Create a Base class for declarative models
 Base = declarative_base()
 
@@ -18,4 +88,29 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Dependency to get an asyncpg-backed database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@asynccontextmanager
+async def open_session():
+    """
+    Short-lived session of the configured kind, for code outside a request's
+    dependency scope (e.g. a WebSocket handshake, which must not pin a pooled
+    connection for the socket's lifetime).
+    """
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+# Session dependency used by the API routes; flip DB_ASYNC to benchmark the two paths
+get_session = get_async_db if settings.DB_ASYNC else get_db
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Table, Text, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Enum, Table, Text, Boolean, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.types import MinorUnits
 import enum
 
 class ExpenseCategory(str, enum.Enum):
@@ -22,7 +23,9 @@ group_members_association_table = Table(
     Base.metadata,
     Column("group_id", Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
-    Column("joined_at", DateTime(timezone=True), server_default=func.now())
+    Column("joined_at", DateTime(timezone=True), server_default=func.now()),
+    # The primary key serves lookups by group; this serves "which groups is this user in"
+    Index("ix_group_members_user_group", "user_id", "group_id")
 )
 
 class User(Base):
@@ -60,7 +63,7 @@ class Expense(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String(255), index=True)
-    amount = Column(Float, nullable=False)
+    amount = Column(MinorUnits, nullable=False)
     date = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     category = Column(
         Enum(ExpenseCategory, values_callable=lambda x: [e.value for e in x]),
@@ -71,17 +74,42 @@ class Expense(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Covering indexes for the per-user date-range and category queries (see init.sql)
+    __table_args__ = (
+        Index("ix_expenses_owner_date_id", "owner_id", "date", "id", postgresql_include=["amount"]),
+        Index("ix_expenses_owner_category_date", "owner_id", "category", "date", "id", postgresql_include=["amount"]),
+    )
+
     # Relationships
     owner = relationship("User", back_populates="expenses")
 
 
+class ExpenseMonthlyRollup(Base):
+    """
+    Running per-user totals of expenses bucketed by (year, month, category).
+    Maintained by expense_service on every expense write so analytics never
+    have to re-aggregate the full expenses history.
+    """
+    __tablename__ = "expense_monthly_rollups"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category = Column(
+        Enum(ExpenseCategory, values_callable=lambda x: [e.value for e in x]),
+        primary_key=True
+    )
+    total_spent = Column(MinorUnits, nullable=False, default=0)
+    expense_count = Column(Integer, nullable=False, default=0)
+
+
 class Budget(Base):
     __tablename__ = "budgets"
 
     id = Column(Integer, primary_key=True, index=True)
     month = Column(Integer, nullable=False)
     year = Column(Integer, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(MinorUnits, nullable=False)
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -92,6 +120,31 @@ class Budget(Base):
     owner = relationship("User", back_populates="budgets")
 
 
+class UserMonthlySpending(Base):
+    """
+    Running total of a user's expenses per month, maintained with every expense
+    write, and the highest budget alert threshold (percent) already sent that month.
+    """
+    __tablename__ = "user_monthly_spending"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    total_spent = Column(MinorUnits, nullable=False, default=0)
+    alerted_percent = Column(Integer, nullable=False, default=0)
+
+
+class UserDataVersion(Base):
+    """
+    Counter bumped in the same transaction as every write to a user's expenses or
+    budgets; cached analytics/budget responses are keyed by it (see response_cache).
+    """
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
 class Group(Base):
     __tablename__ = "groups"
 
@@ -118,13 +171,16 @@ class GroupExpense(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String(255), index=True)
-    amount = Column(Float, nullable=False)
+    amount = Column(MinorUnits, nullable=False)
     date = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     group_id = Column(Integer, ForeignKey("groups.id", ondelete="SET NULL"), nullable=True) # Matches SQL ON DELETE SET NULL
     paid_by_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Serves the paginated per-group expense feed (see init.sql)
+    __table_args__ = (Index("ix_group_expenses_group_created_at", "group_id", "created_at", "id"),)
+
     # Relationships
     group = relationship("Group", back_populates="expenses")
     payer = relationship("User", back_populates="paid_expenses", foreign_keys="[GroupExpense.paid_by_user_id]")
@@ -137,7 +193,7 @@ class GroupExpenseShare(Base):
     id = Column(Integer, primary_key=True, index=True)
     expense_id = Column(Integer, ForeignKey("group_expenses.id", ondelete="CASCADE"), nullable=False) # Matches SQL FK
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    share_amount = Column(Float, nullable=False)
+    share_amount = Column(MinorUnits, nullable=False)
     is_paid = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -149,6 +205,38 @@ class GroupExpenseShare(Base):
     user_owing = relationship("User", back_populates="expense_shares_owed")
 
 
+class GroupMemberBalance(Base):
+    """
+    Running net balance of each user within a group: positive means the group owes
+    them, negative means they owe the group. Adjusted by balance_service in the same
+    transaction as every group expense and settlement write.
+    """
+    __tablename__ = "group_member_balances"
+
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    net_balance = Column(MinorUnits, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class GroupEventCounter(Base):
+    """Last event sequence number handed out per group (table-backed group event log)."""
+    __tablename__ = "group_event_counters"
+
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    last_seq = Column(BigInteger, nullable=False, default=0)
+
+
+class GroupEvent(Base):
+    """Recent serialized WebSocket events per group, replayed to reconnecting clients."""
+    __tablename__ = "group_events"
+
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    seq = Column(BigInteger, primary_key=True)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Settlement(Base):
     __tablename__ = "settlements"
 
@@ -156,9 +244,12 @@ class Settlement(Base):
     payer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False) # Matches SQL column name
     receiver_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False) # Matches SQL column name
     group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(MinorUnits, nullable=False)
     settled_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Serves the per-group settlement history, newest first (see init.sql)
+    __table_args__ = (Index("ix_settlements_group_settled_at", "group_id", "settled_at", "id"),)
+
     # Relationships (Updated to match SQL column names)
     payer = relationship("User", back_populates="settlements_made", foreign_keys="[Settlement.payer_id]")
     receiver = relationship("User", back_populates="settlements_received", foreign_keys="[Settlement.receiver_id]")
@@ -0,0 +1,96 @@
+# backend/app/db/query_metrics.py
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueries:
+    """Statements one request issued: count, total time, the slowest, and repeats by SQL text."""
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest: Tuple[float, Optional[str]] = (0.0, None)
+        self.statements: "Counter[str]" = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+        if seconds > self.slowest[0]:
+            self.slowest = (seconds, statement)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run at least `threshold` times, e.g. a lazy load inside a loop."""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+# Set by the request middleware. Sync services run on the threadpool and async ones
+# under run_sync, both inside a copy of the request's context, so the hooks see it.
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+class RouteQueryStats:
+    """Thread-safe running totals per route template, for /internal/db/queries."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, queries: RequestQueries, n_plus_one: int):
+        with self._lock:
+            stats = self._routes.setdefault(route, {
+                "requests": 0, "queries": 0, "db_seconds": 0.0, "max_queries": 0,
+                "n_plus_one_requests": 0, "slowest_seconds": 0.0, "slowest_statement": None,
+            })
+            stats["requests"] += 1
+            stats["queries"] += queries.count
+            stats["db_seconds"] += queries.seconds
+            stats["max_queries"] = max(stats["max_queries"], queries.count)
+            if n_plus_one:
+                stats["n_plus_one_requests"] += 1
+            if queries.slowest[0] > stats["slowest_seconds"]:
+                stats["slowest_seconds"], stats["slowest_statement"] = queries.slowest
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                route: {
+                    **stats,
+                    "queries_per_request": stats["queries"] / stats["requests"],
+                    "db_seconds_per_request": stats["db_seconds"] / stats["requests"],
+                }
+                for route, stats in self._routes.items()
+            }
+
+route_query_stats = RouteQueryStats()
+
+
+def instrument_engine(sync_engine: Engine):
+    """Times every statement on the engine, attributing it to the current request and logging slow ones."""
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_started"].pop()
+        queries = current_queries.get()
+        if queries is not None:
+            queries.record(statement, seconds)
+        if seconds * 1000 >= settings.SQL_SLOW_QUERY_MS:
+            logger.warning("Slow query (%.1f ms): %s", seconds * 1000, statement)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def drop_timer(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
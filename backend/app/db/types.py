@@ -0,0 +1,21 @@
+# backend/app/db/types.py
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+from app.core.money import to_minor_units, from_minor_units
+
+
+class MinorUnits(TypeDecorator):
+    """
+    Money column stored as BIGINT cents. Python values are Decimal amounts in major
+    units, so bound parameters and results convert at the edge while SUM(), ledger
+    arithmetic and comparisons run on integers inside the database.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_minor_units(value)
+
+    def process_result_value(self, value, dialect):
+        # SUM() over BIGINT comes back as an integral NUMERIC, which converts the same way
+        return None if value is None else from_minor_units(value)
@@ -6,7 +6,9 @@ from dotenv import load_dotenv
 import os
 
 from app.api.router import api_router
+from app.api.metrics import instrument_request, router as metrics_router
 from app.core.config import settings
+from app.core.broadcast import broadcaster
 from app.db.database import Base, engine, get_db
 from app.db.models import User, Expense, Budget, ExpenseCategory # Import models to ensure they are registered with SQLAlchemy
 
@@ -44,7 +46,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request latency and SQL counts for /metrics and /internal/db/queries
+app.middleware("http")(instrument_request)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(metrics_router) # Prometheus scrape endpoint
+
+@app.on_event("shutdown")
+async def close_broadcaster():
+    await broadcaster.close()
 
 @app.get("/")
 def read_root():
@@ -1,17 +1,18 @@
 # backend/app/schemas/budget.py
 from pydantic import BaseModel, Field
 from datetime import datetime
+from app.core.money import Money, PositiveMoney
 
 class BudgetBase(BaseModel):
     month: int = Field(..., ge=1, le=12)
     year: int = Field(..., ge=2000)
-    amount: float = Field(..., gt=0)
+    amount: PositiveMoney
 
 class BudgetCreate(BudgetBase):
     pass
 
 class BudgetUpdate(BudgetBase):
-    amount: float | None = None
+    amount: Money | None = None
 
 class BudgetResponse(BudgetBase):
     id: int
@@ -20,4 +21,12 @@ class BudgetResponse(BudgetBase):
     updated_at: datetime | None = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BudgetMonthSummary(BaseModel):
+    year: int
+    month: int
+    budget_set: bool
+    remaining_amount: Money
+    total_budget: Money
+    total_spent: Money
@@ -3,10 +3,16 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 from app.db.models import ExpenseCategory
+from app.core.money import Money, PositiveMoney
+import enum
+
+class ExpenseFileFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
 
 class ExpenseBase(BaseModel):
     description: str = Field(..., max_length=255)
-    amount: float = Field(..., gt=0)
+    amount: PositiveMoney
     date: datetime = Field(default_factory=datetime.now)
     category: ExpenseCategory = ExpenseCategory.OTHER
 
@@ -14,7 +20,7 @@ class ExpenseBase(BaseModel):
 
 class ExpenseUpdate(ExpenseBase):
     description: Optional[str] = None
-    amount: Optional[float] = None
+    amount: Optional[Money] = None
     date: Optional[datetime] = None
     category: Optional[ExpenseCategory] = None
 
@@ -26,4 +32,21 @@ class ExpenseResponse(ExpenseBase):
     updated_at: datetime | None = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ExpensePage(BaseModel):
+    items: List[ExpenseResponse]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page
+
+
+class ExpenseImportError(BaseModel):
+    row: int # 1-based data row (CSV header excluded) or NDJSON line number
+    error: str
+
+
+class ExpenseImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ExpenseImportError] = []
+    errors_truncated: bool = False # True when more errors occurred than are listed
\ No newline at end of file
@@ -1,7 +1,8 @@
 # backend/app/schemas/group.py
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
+from app.core.money import Money
 
 # Assuming UserResponse or a similar slimmed-down user schema for members
 class GroupMemberResponse(BaseModel):
@@ -23,6 +24,18 @@ class AddGroupMember(BaseModel):
     id: int
     email: EmailStr
 
+class AddGroupMembersBatch(BaseModel):
+    emails: List[EmailStr] = Field(..., min_length=1, max_length=1000)
+
+class MemberAddResult(BaseModel):
+    email: str
+    user_id: Optional[int] = None
+    status: Literal["added", "already_member", "not_found"]
+
+class AddGroupMembersBatchResponse(BaseModel):
+    group_id: int
+    results: List[MemberAddResult]
+
 class GroupId(BaseModel):
     id: int
 
@@ -47,9 +60,18 @@ class GroupResponse(GroupBase):
     class Config:
         from_attributes = True
 
+class GroupSummaryResponse(GroupBase):
+    id: int
+    created_by_user_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    member_count: int
+    net_balance: Money # The caller's balance in this group; > 0: the group owes you
+    last_activity_at: datetime # Latest of group creation, expense and settlement times
+
 class ShareResponse(BaseModel):
     user_id: int
-    share_amount: float
+    share_amount: Money
     is_paid: bool
 
     class Config:
@@ -59,7 +81,7 @@ class ShareResponse(BaseModel):
 class GroupExpenseListResponse(BaseModel):
     id: int
     description: str
-    amount: float
+    amount: Money
     group_id: int
     paid_by_user_id: int
     created_at: datetime
@@ -69,13 +91,18 @@ class GroupExpenseListResponse(BaseModel):
         from_attributes = True
 
 
+class GroupExpenseFeedPage(BaseModel):
+    items: List[GroupExpenseListResponse]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch older expenses
+
+
 class Share(BaseModel):
     user_id: int
-    share_amount: float
+    share_amount: Money
 
 class GroupExpenseCreate(BaseModel):
     description: str
-    amount: float
+    amount: Money
     selectedMembers: List[int]
     splitMethod: str
     shares: List[Share]
@@ -83,7 +110,7 @@ class GroupExpenseCreate(BaseModel):
 class GroupExpenseResponse(BaseModel):
     id: int
     description: str
-    amount: float
+    amount: Money
     group_id: int
     paid_by_user_id: int
     created_at: datetime
@@ -93,15 +120,15 @@ class GroupExpenseResponse(BaseModel):
         from_attributes = True
 
 
-# # NEW: Schema for individual balance within a group
-# class UserBalance(BaseModel):
-#     user_id: int
-#     username: str
-#     net_balance: float
+# Schema for individual balance within a group
+class UserBalance(BaseModel):
+    user_id: int
+    username: str
+    net_balance: Money # > 0: the group owes this user, < 0: this user owes the group
 
-# # NEW: Schema for the overall balances response
-# class GroupBalancesResponse(BaseModel):
-#     group_id: int
-#     total_owed_by_you: float
-#     total_owed_to_you: float
-#     individual_balances: List[UserBalance]
\ No newline at end of file
+# Schema for the overall balances response
+class GroupBalancesResponse(BaseModel):
+    group_id: int
+    total_owed_by_you: Money
+    total_owed_to_you: Money
+    individual_balances: List[UserBalance]
\ No newline at end of file
@@ -1,12 +1,14 @@
 # backend/app/schemas/settlement.py
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
+from app.core.money import Money, PositiveMoney
 
 class SettlementBase(BaseModel):
     from_user_id: int
     to_user_id: int
     group_id: int
-    amount: float = Field(..., gt=0)
+    amount: PositiveMoney
 
 class SettlementCreate(SettlementBase):
     pass
@@ -17,3 +19,20 @@ class SettlementResponse(SettlementBase):
 
     class Config:
         from_attributes = True
+
+class SettlementTransfer(BaseModel):
+    from_user_id: int # Pays
+    to_user_id: int # Receives
+    amount: PositiveMoney
+
+class SettlePlanResponse(BaseModel):
+    group_id: int
+    transfers: List[SettlementTransfer]
+
+class SettlementBatchCreate(BaseModel):
+    group_id: int
+    settlements: List[SettlementTransfer] = Field(..., min_length=1, max_length=1000)
+
+class SettlementPage(BaseModel):
+    items: List[SettlementResponse]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page
@@ -0,0 +1,115 @@
+# backend/app/scripts/bench_compare.py
+"""
+Compare a benchmark run against a stored baseline and flag regressions.
+
+bench_services and load_test write results as JSON: one entry per case with
+p50/p99 latency (ms) and queries per call/request. A case regresses when its
+p50 or p99 grows by more than --latency-tolerance (relative) and --min-delta-ms
+(absolute, to ignore noise on sub-millisecond cases), or when it issues more
+than --query-slack extra queries. Baselines live in benchmarks/baselines/ and
+are re-recorded with --save-baseline on the benchmark scripts after an
+intended change.
+
+Usage:
+    python -m app.scripts.bench_compare benchmarks/baselines/services.json results.json
+    python -m app.scripts.bench_compare benchmarks/baselines/load.json load.json --latency-tolerance 0.3
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+BASELINE_DIR = os.path.join("benchmarks", "baselines")
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def summarize(samples_seconds: Sequence[float], queries: Optional[float]) -> Dict[str, Any]:
+    """One result entry: latency percentiles in ms plus average queries per call/request (None if unknown)."""
+    return {
+        "samples": len(samples_seconds),
+        "p50_ms": round(statistics.median(samples_seconds) * 1000, 3),
+        "p99_ms": round(percentile(samples_seconds, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples_seconds) * 1000, 3),
+        "queries": round(queries, 2) if queries is not None else None,
+    }
+
+def write_results(path: str, kind: str, results: Dict[str, Dict[str, Any]], params: Dict[str, Any]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    document = {
+        "kind": kind,
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {"python": platform.python_version(), "machine": platform.machine()},
+        "params": params,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def print_results(results: Dict[str, Dict[str, Any]], queries_label: str):
+    width = max((len(name) for name in results), default=10)
+    print(f"{'case':<{width}}  {'p50 ms':>9}  {'p99 ms':>9}  {queries_label:>9}")
+    for name, result in results.items():
+        queries = f"{result['queries']:9.2f}" if result["queries"] is not None else f"{'-':>9}"
+        print(f"{name:<{width}}  {result['p50_ms']:9.2f}  {result['p99_ms']:9.2f}  {queries}")
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], latency_tolerance: float,
+            min_delta_ms: float, query_slack: float) -> List[str]:
+    """Human-readable regressions of `current` against `baseline`; empty when there are none."""
+    regressions = []
+    for name, base in baseline["results"].items():
+        result = current["results"].get(name)
+        if result is None:
+            regressions.append(f"{name}: missing from the current run")
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            delta = result[metric] - base[metric]
+            if delta > min_delta_ms and delta > base[metric] * latency_tolerance:
+                regressions.append(
+                    f"{name}: {metric} {base[metric]:.2f} -> {result[metric]:.2f} "
+                    f"(+{delta / base[metric] * 100 if base[metric] else float('inf'):.0f}%)"
+                )
+        if None not in (result["queries"], base["queries"]) and result["queries"] - base["queries"] > query_slack:
+            regressions.append(f"{name}: queries {base['queries']:g} -> {result['queries']:g}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Flag p50/p99 and queries-per-request regressions against a baseline.")
+    parser.add_argument("baseline", help="Stored baseline JSON (e.g. benchmarks/baselines/services.json)")
+    parser.add_argument("current", help="Results JSON from the run to check")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2, help="Allowed relative p50/p99 growth")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore latency growth below this many ms")
+    parser.add_argument("--query-slack", type=float, default=0.5, help="Allowed growth in queries per call/request")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    if baseline.get("kind") != current.get("kind"):
+        print(f"Cannot compare a {current.get('kind')} run against a {baseline.get('kind')} baseline.")
+        return 2
+
+    regressions = compare(baseline, current, args.latency_tolerance, args.min_delta_ms, args.query_slack)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    new_cases = sorted(set(current["results"]) - set(baseline["results"]))
+    if new_cases:
+        print(f"Not in the baseline (not checked): {', '.join(new_cases)}")
+    print(f"{len(regressions)} regression(s) against {args.baseline} ({baseline.get('recorded_at')}).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
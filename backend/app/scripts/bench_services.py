@@ -0,0 +1,197 @@
+# backend/app/scripts/bench_services.py
+"""
+Micro-benchmarks for the expense, budget, group, balance and settlement services,
+and for the authentication every authenticated request pays for.
+
+Runs each service function --iterations times against data from seed_data
+(the heaviest seeded user and the largest seeded group), each call in a fresh
+session so nothing is served from the identity map, and reports p50/p99
+latency and SQL statements per call. Everything runs inside one transaction
+that is rolled back at the end (service commits become savepoints), so the
+write benchmarks leave the database as it was.
+
+The auth.authenticate_token cases resolve a bearer token the way
+get_current_user does, in each principal mode: a users lookup per request
+(principal cache cleared before every call), a principal cache hit, and
+AUTH_TRUST_TOKEN_CLAIMS.
+
+Usage:
+    python -m app.scripts.bench_services [--iterations 200] [--only group_service] [--output results.json]
+    python -m app.scripts.bench_services --save-baseline
+    python -m app.scripts.bench_compare benchmarks/baselines/services.json results.json
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.api.deps import authenticate_token
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.database import engine
+from app.db.models import ExpenseCategory
+from app.schemas.budget import BudgetCreate
+from app.schemas.expense import ExpenseBase
+from app.schemas.group import GroupExpenseCreate, Share
+from app.scripts.bench_compare import BASELINE_DIR, print_results, summarize, write_results
+from app.scripts.seed_data import fixtures
+from app.services import (
+    auth_service, balance_service, budget_service, expense_service, group_service, settlement_service
+)
+
+# Transaction control emitted by the savepoint sessions, not by the services
+_NOT_COUNTED = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def _authenticate(loop: asyncio.AbstractEventLoop, token: str, trust_claims: bool, cached: bool):
+    """One authenticate_token call in the given principal mode, on a long-lived loop."""
+    def call(s: Session):
+        settings.AUTH_TRUST_TOKEN_CLAIMS = trust_claims
+        if not cached:
+            auth_service.principal_cache.clear()
+        return loop.run_until_complete(authenticate_token(s, token))
+    return call
+
+def _group_balances(members: int, seed: int = 42) -> Dict[int, int]:
+    """Net balances in cents for a group of `members` that sum to zero, as the ledger holds them."""
+    rng = random.Random(seed)
+    cents = [rng.randint(-500_000, 500_000) for _ in range(members - 1)]
+    return {user_id: amount for user_id, amount in enumerate([*cents, -sum(cents)], start=1)}
+
+def _cases(db: Session, f: Dict[str, Any], loop: asyncio.AbstractEventLoop) -> Dict[str, Callable[[Session], Any]]:
+    now = datetime.now()
+    balances_1000 = _group_balances(1000)
+    user_id, group_id, member_id = f["heavy_user_id"], f["group_id"], f["group_member_id"]
+    expense_id = db.execute(
+        text("SELECT id FROM expenses WHERE owner_id = :uid ORDER BY date DESC LIMIT 1"), {"uid": user_id}
+    ).scalar()
+    user = db.execute(text("SELECT username, email FROM users WHERE id = :uid"), {"uid": user_id}).one()
+    # Same claims as the token /auth/token issues
+    token = create_access_token(data={"sub": user.username, "uid": user_id, "email": user.email})
+    other_member_id = db.execute(
+        text("SELECT user_id FROM group_members WHERE group_id = :gid AND user_id <> :uid LIMIT 1"),
+        {"gid": group_id, "uid": member_id}
+    ).scalar()
+    new_expense = ExpenseBase(description="bench", amount=Decimal("12.34"), category=ExpenseCategory.FOOD)
+    # The 36 months ending with the current one
+    range_start = (now.year - 3, now.month + 1) if now.month < 12 else (now.year - 2, 1)
+    new_budget = BudgetCreate(month=now.month, year=now.year, amount=Decimal("1500.00"))
+    new_group_expense = GroupExpenseCreate(
+        description="bench", amount=Decimal("30.01"), selectedMembers=[member_id, other_member_id],
+        splitMethod="equal",
+        shares=[Share(user_id=member_id, share_amount=Decimal("15.01")),
+                Share(user_id=other_member_id, share_amount=Decimal("15.00"))]
+    )
+
+    return {
+        "auth.authenticate_token[db lookup]": _authenticate(loop, token, trust_claims=False, cached=False),
+        "auth.authenticate_token[principal cache]": _authenticate(loop, token, trust_claims=False, cached=True),
+        "auth.authenticate_token[trusted claims]": _authenticate(loop, token, trust_claims=True, cached=False),
+        "expense_service.get_user_expenses": lambda s: expense_service.get_user_expenses(s, user_id),
+        "expense_service.get_user_expenses[category]": lambda s: expense_service.get_user_expenses(
+            s, user_id, category=ExpenseCategory.FOOD
+        ),
+        "expense_service.get_user_expense": lambda s: expense_service.get_user_expense(s, expense_id, user_id),
+        "expense_service.get_monthly_spending_summary": lambda s: expense_service.get_monthly_spending_summary(s, user_id),
+        "expense_service.get_spending_by_category": lambda s: expense_service.get_spending_by_category(
+            s, user_id, month=now.month, year=now.year
+        ),
+        "expense_service.create_user_expense": lambda s: expense_service.create_user_expense(s, new_expense, user_id),
+        "budget_service.get_remaining_budget": lambda s: budget_service.get_remaining_budget(
+            s, user_id, now.month, now.year
+        ),
+        "budget_service.get_budget_range[36 months]": lambda s: budget_service.get_budget_range(
+            s, user_id, *range_start, now.year, now.month
+        ),
+        "budget_service.create_or_update_budget": lambda s: budget_service.create_or_update_budget(
+            s, new_budget, user_id
+        ),
+        "group_service.get_user_groups": lambda s: group_service.get_user_groups(s, member_id),
+        "group_service.get_user_group_summaries": lambda s: group_service.get_user_group_summaries(s, member_id),
+        "group_service.get_list_group_expenses": lambda s: group_service.get_list_group_expenses(
+            s, group_id, member_id
+        ),
+        "group_service.get_group_detail": lambda s: group_service.get_group_detail(s, group_id, member_id),
+        "group_service.create_group_expense": lambda s: group_service.create_group_expense(
+            s, group_id, new_group_expense, member_id
+        ),
+        "balance_service.get_group_balances": lambda s: balance_service.get_group_balances(s, group_id, member_id),
+        "settlement_service.get_settle_plan": lambda s: settlement_service.get_settle_plan(s, group_id, member_id),
+        "settlement_service.plan_transfers[1000 members]": lambda s: settlement_service.plan_transfers(balances_1000),
+        "settlement_service.get_group_settlements": lambda s: settlement_service.get_group_settlements(
+            s, group_id, member_id
+        ),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark service functions against seeded data.")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--prefix", default="bench", help="Prefix the data was seeded with")
+    parser.add_argument("--only", default=None, help="Run only cases whose name contains this")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write results to {BASELINE_DIR}/services.json")
+    args = parser.parse_args(argv)
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    loop = asyncio.new_event_loop()
+    trust_claims = settings.AUTH_TRUST_TOKEN_CLAIMS
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(_NOT_COUNTED):
+            statements.append(statement)
+
+    try:
+        with Session(bind=connection) as db:
+            f = fixtures(db, args.prefix)
+            cases = _cases(db, f, loop)
+        print(f"Fixtures: {f}")
+
+        event.listen(connection, "before_cursor_execute", count)
+        results = {}
+        for name, call in cases.items():
+            if args.only and args.only not in name:
+                continue
+            samples = []
+            queries = 0
+            for i in range(args.warmup + args.iterations):
+                statements.clear()
+                with Session(bind=connection, join_transaction_mode="create_savepoint") as db:
+                    started = time.perf_counter()
+                    call(db)
+                    elapsed = time.perf_counter() - started
+                if i >= args.warmup:
+                    samples.append(elapsed)
+                    queries += len(statements)
+            results[name] = summarize(samples, queries / args.iterations)
+        event.remove(connection, "before_cursor_execute", count)
+    finally:
+        settings.AUTH_TRUST_TOKEN_CLAIMS = trust_claims
+        loop.close()
+        transaction.rollback()
+        connection.close()
+
+    print_results(results, "queries")
+    params = {"iterations": args.iterations, "warmup": args.warmup, "fixtures": f}
+    if args.output:
+        write_results(args.output, "services", results, params)
+    if args.save_baseline:
+        path = os.path.join(BASELINE_DIR, "services.json")
+        write_results(path, "services", results, params)
+        print(f"Baseline saved to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
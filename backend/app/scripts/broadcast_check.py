@@ -0,0 +1,94 @@
+# backend/app/scripts/broadcast_check.py
+"""
+Cross-process check for the Postgres LISTEN/NOTIFY broadcaster.
+
+Starts N worker processes that each subscribe to one channel, waits until all
+are listening, then has every worker publish one event. Passes when every
+worker received the events of all workers, its own included, i.e. an event
+published on one process reaches sockets held by any other.
+
+Usage:
+    python -m app.scripts.broadcast_check [--workers 4] [--timeout 10]
+
+tests/test_broadcast_multiprocess.py runs the same check under pytest.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from typing import Dict, List
+
+from app.core.broadcast import PostgresBroadcaster, postgres_dsn
+
+
+def _worker(index: int, workers: int, channel: str, barrier, results, timeout: float):
+    async def run():
+        broadcaster = PostgresBroadcaster(postgres_dsn())
+        received = []
+        everyone = asyncio.Event()
+
+        def on_message(text: str):
+            received.append(json.loads(text)["from"])
+            if len(received) == workers:
+                everyone.set()
+
+        try:
+            await broadcaster.subscribe(channel, on_message)
+            await asyncio.to_thread(barrier.wait, timeout)
+            await broadcaster.publish(channel, json.dumps({"from": index}))
+            try:
+                await asyncio.wait_for(everyone.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            await broadcaster.close()
+        return sorted(received)
+
+    results.put((index, asyncio.run(run())))
+
+
+def run_check(workers: int, timeout: float) -> Dict[int, List[int]]:
+    """Runs the check and returns, per worker index, the sorted indexes of the workers whose events it received."""
+    channel = f"broadcast_check_{os.getpid()}"
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(i, workers, channel, barrier, results, timeout))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        received = dict(results.get(timeout=timeout * 3) for _ in processes)
+    finally:
+        for process in processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+    return received
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check that group events are delivered across worker processes.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for deliveries")
+    args = parser.parse_args(argv)
+
+    expected = list(range(args.workers))
+    failures = 0
+    for index, received in sorted(run_check(args.workers, args.timeout).items()):
+        if received == expected:
+            print(f"ok   worker {index} received events from all {args.workers} workers")
+        else:
+            failures += 1
+            print(f"FAIL worker {index} received {received}, expected {expected}")
+
+    print(f"{failures} worker(s) missed events.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
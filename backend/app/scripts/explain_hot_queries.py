@@ -0,0 +1,173 @@
+# backend/app/scripts/explain_hot_queries.py
+"""
+Plan regression check for the hot expense/budget/analytics queries.
+
+Seeds a large synthetic dataset inside a transaction, ANALYZEs it, runs the real
+service functions while capturing the SQL they emit, EXPLAINs every captured
+statement and fails if any of them plans a sequential scan on a large table.
+The transaction is rolled back at the end, so the database is left untouched.
+
+Usage:
+    python -m app.scripts.explain_hot_queries [--rows 1000000] [--users 1000]
+
+tests/test_hot_query_plans.py runs the same check under pytest.
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db.database import engine
+from app.db.models import ExpenseCategory
+from app.services import expense_service, budget_service, rollup_service
+
+# Tables large enough in production that a Seq Scan on them is a regression
+WATCHED_TABLES = {"expenses", "budgets", "expense_monthly_rollups", "user_monthly_spending"}
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+
+SEED_USERS_SQL = """
+INSERT INTO users (username, email, hashed_password)
+SELECT 'explain_seed_' || g, 'explain_seed_' || g || '@example.invalid', 'x'
+FROM generate_series(1, :users) AS g
+RETURNING id
+"""
+
+SEED_EXPENSES_SQL = """
+INSERT INTO expenses (description, amount, date, category, owner_id)
+SELECT
+    'seed expense ' || g,
+    100 + floor(random() * 50000)::bigint, -- cents
+    now() - (random() * interval '1095 days'),
+    (enum_range(NULL::expensecategory))[1 + floor(random() * 10)::int],
+    :first_user + floor(random() * :users)::int
+FROM generate_series(1, :rows) AS g
+"""
+
+SEED_BUDGETS_SQL = """
+INSERT INTO budgets (month, year, amount, owner_id)
+SELECT m, y, 100000, u
+FROM generate_series(:first_user, :first_user + :users - 1) AS u,
+     generate_series(1, 12) AS m,
+     generate_series(:year - 2, :year) AS y
+"""
+
+
+def _scans(plan: dict, node_types: Tuple[str, ...]) -> List[str]:
+    """Returns the watched relations that a JSON plan node tree reads with one of `node_types`."""
+    found = []
+    if plan.get("Node Type") in node_types and plan.get("Relation Name") in WATCHED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_scans(child, node_types))
+    return found
+
+
+def explain_hot_queries(connection: Connection, rows: int, users: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Seeds `rows` expenses over `users` users on `connection` (the caller owns and
+    rolls back the transaction), runs every hot service call and EXPLAINs the
+    SELECTs it issued. Returns, per call, one entry per statement with the
+    watched relations it seq-scans and the ones it reads through an index.
+    """
+    now = datetime.now()
+    user_ids = connection.execute(text(SEED_USERS_SQL), {"users": users}).scalars().all()
+    first_user = min(user_ids)
+    seed_params = {"first_user": first_user, "users": users, "rows": rows, "year": now.year}
+    connection.execute(text(SEED_EXPENSES_SQL), seed_params)
+    connection.execute(text(SEED_BUDGETS_SQL), seed_params)
+
+    db = Session(bind=connection)
+    rollup_service.rebuild(db, commit=False)
+    connection.execute(text("ANALYZE users, expenses, budgets, expense_monthly_rollups, user_monthly_spending"))
+
+    user_id = first_user
+    expense_id = connection.execute(
+        text("SELECT id FROM expenses WHERE owner_id = :uid LIMIT 1"), {"uid": user_id}
+    ).scalar()
+    month_start = datetime(now.year, now.month, 1)
+    # The 36 months ending with the current one
+    range_start = (now.year - 3, now.month + 1) if now.month < 12 else (now.year - 2, 1)
+
+    hot_calls = {
+        "get_user_expenses": lambda: expense_service.get_user_expenses(db, user_id),
+        "get_user_expenses[date range]": lambda: expense_service.get_user_expenses(
+            db, user_id, start_date=month_start, end_date=now
+        ),
+        "get_user_expenses[category]": lambda: expense_service.get_user_expenses(
+            db, user_id, category=ExpenseCategory.FOOD
+        ),
+        "get_user_expense": lambda: expense_service.get_user_expense(db, expense_id, user_id),
+        "get_monthly_spending_summary": lambda: expense_service.get_monthly_spending_summary(db, user_id),
+        "get_spending_by_category": lambda: expense_service.get_spending_by_category(
+            db, user_id, month=now.month, year=now.year
+        ),
+        "get_user_budget": lambda: budget_service.get_user_budget(db, user_id, now.month, now.year),
+        "get_current_month_spending": lambda: budget_service.get_current_month_spending(
+            db, user_id, now.month, now.year
+        ),
+        "get_budget_range[36 months]": lambda: budget_service.get_budget_range(
+            db, user_id, *range_start, now.year, now.month
+        ),
+    }
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    plans = {}
+    for name, call in hot_calls.items():
+        captured.clear()
+        event.listen(connection, "before_cursor_execute", capture)
+        try:
+            call()
+        finally:
+            event.remove(connection, "before_cursor_execute", capture)
+
+        plans[name] = []
+        for statement, parameters in captured:
+            plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()[0]["Plan"]
+            plans[name].append({
+                "statement": " ".join(statement.split()),
+                "seq_scans": _scans(plan, ("Seq Scan",)),
+                "index_scans": _scans(plan, INDEX_SCANS),
+            })
+    return plans
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fail if a hot service query plans a sequential scan.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Number of expenses to seed")
+    parser.add_argument("--users", type=int, default=1000, help="Number of users to spread them over")
+    args = parser.parse_args(argv)
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        plans = explain_hot_queries(connection, args.rows, args.users)
+    finally:
+        transaction.rollback()
+        connection.close()
+
+    failures = 0
+    for name, statements in plans.items():
+        for statement in statements:
+            if statement["seq_scans"]:
+                failures += 1
+                print(f"FAIL {name}: Seq Scan on {', '.join(sorted(set(statement['seq_scans'])))}")
+                print(f"     {statement['statement']}")
+            else:
+                print(f"ok   {name}")
+
+    print(f"{failures} hot quer{'y' if failures == 1 else 'ies'} fell back to a sequential scan.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# backend/app/scripts/group_balances.py
+"""
+Verify or rebuild the group_member_balances ledger from group history
+(group expenses, their shares and settlements).
+
+Usage (from the backend directory or inside the backend container):
+    python -m app.scripts.group_balances verify [--group-id ID]
+    python -m app.scripts.group_balances rebuild [--group-id ID]
+
+`verify` exits with status 1 when drift is found, so it can run from cron/CI.
+"""
+import argparse
+import sys
+
+from app.db.database import SessionLocal
+from app.services import balance_service
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild or verify the group balance ledger.")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--group-id", type=int, default=None, help="Limit to a single group")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            rows = balance_service.rebuild(db, group_id=args.group_id)
+            print(f"Rebuilt balances: {rows} rows written.")
+            return 0
+
+        drift = balance_service.find_drift(db, group_id=args.group_id)
+        for d in drift:
+            print(
+                f"group={d['group_id']} user={d['user_id']}: "
+                f"stored {d['stored_balance']:.2f} != expected {d['expected_balance']:.2f}"
+            )
+        print(f"{len(drift)} drifted balance(s).")
+        return 1 if drift else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
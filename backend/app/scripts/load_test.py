@@ -0,0 +1,280 @@
+# backend/app/scripts/load_test.py
+"""
+HTTP load scenarios against a running API seeded with seed_data.
+
+dashboard (the default): each virtual user is one seeded account on its own keep-alive connection:
+it logs in, then repeatedly loads the dashboard (monthly and category
+spending, remaining budget, group summaries) and the first page of its
+expenses, posting a group expense every --post-every iterations. Reports
+p50/p99 latency per request and, from the server's /internal/db/queries
+counters (read before and after the run), SQL statements per request. Run the
+API with a single worker so those counters cover every request.
+
+login-storm: every virtual user hits /auth/token --iterations times at once,
+released together, while one already logged-in user keeps loading
+/budgets/remaining. Reports login p50/p99, the share of logins turned away with
+503 by the password hashing pool (its size is read from
+/internal/auth/password_hashing), and the bystander's latency, which shows
+whether the storm starves other routes.
+
+Usage:
+    python -m app.scripts.load_test [--base-url http://localhost:8000/api/v1] [--users 50] [--iterations 20]
+    python -m app.scripts.load_test --save-baseline
+    python -m app.scripts.load_test --scenario login-storm --users 200 --iterations 5
+    python -m app.scripts.bench_compare benchmarks/baselines/load.json load.json
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from app.scripts.bench_compare import BASELINE_DIR, print_results, summarize, write_results
+
+
+class _Client:
+    """One keep-alive connection; reconnects after a network error."""
+    def __init__(self, base_url: str, timeout: float, headers: Optional[Dict[str, str]] = None):
+        parts = urlsplit(base_url)
+        self.netloc = parts.netloc
+        self.https = parts.scheme == "https"
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.conn = None
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        if self.conn is None:
+            connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            self.conn = connection_class(self.netloc, timeout=self.timeout)
+        try:
+            self.conn.request(method, self.prefix + path, body=body, headers={**self.headers, **(headers or {})})
+            response = self.conn.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            self.conn = None
+            return 0, b""
+
+
+class _Recorder:
+    """Latency samples and error counts per step, shared by the virtual users."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Counter] = {}
+
+    def record(self, step: str, elapsed: float, status: int):
+        with self._lock:
+            self.samples.setdefault(step, []).append(elapsed)
+            self.statuses.setdefault(step, Counter())[status] += 1
+            if not 200 <= status < 300:
+                self.errors[step] = self.errors.get(step, 0) + 1
+
+    def timed(self, client: _Client, step: str, method: str, path: str, **kwargs) -> Tuple[int, bytes]:
+        started = time.perf_counter()
+        status, body = client.request(method, path, **kwargs)
+        self.record(step, time.perf_counter() - started, status)
+        return status, body
+
+
+# step -> the server's "<METHOD> <route template>" key in /internal/db/queries (relative to the API prefix)
+STEP_ROUTES = {
+    "login": "POST /auth/token",
+    "dashboard.monthly_spending": "GET /analytics/monthly_spending",
+    "dashboard.spending_by_category": "GET /analytics/spending_by_category",
+    "dashboard.budgets_remaining": "GET /budgets/remaining",
+    "dashboard.groups_summary": "GET /splits/groups/summary",
+    "expenses.list": "GET /expenses/",
+    "groups.post_expense": "POST /splits/groups/{group_id}/expenses",
+    "storm.login": "POST /auth/token",
+    "storm.bystander": "GET /budgets/remaining",
+}
+
+
+def _login(args, client: _Client, username: str, recorder: _Recorder, step: str, busy_retries: int = 0) -> bool:
+    """
+    Logs in and records one sample. With busy_retries, a 503 from the password
+    hashing pool is retried after a short backoff, as a client would, and the
+    sample covers every attempt.
+    """
+    form = urlencode({"username": username, "password": args.password}).encode()
+    started = time.perf_counter()
+    for attempt in range(busy_retries + 1):
+        status, body = client.request(
+            "POST", "/auth/token", body=form, headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        if status != 503 or attempt == busy_retries:
+            break
+        time.sleep(0.5 * (attempt + 1))
+    recorder.record(step, time.perf_counter() - started, status)
+    if status == 200:
+        client.headers["Authorization"] = f"Bearer {json.loads(body)['access_token']}"
+    return status == 200
+
+def _virtual_user(args, username: str, recorder: _Recorder):
+    client = _Client(args.base_url, args.timeout)
+    # The dashboard scenario measures reads, so its opening logins ride out 503s
+    if not _login(args, client, username, recorder, "login", busy_retries=10):
+        return
+
+    now = datetime.now()
+    month_query = urlencode({"month": now.month, "year": now.year})
+    group_id, member_ids = None, []
+    for i in range(args.iterations):
+        recorder.timed(client, "dashboard.monthly_spending", "GET", "/analytics/monthly_spending")
+        recorder.timed(client, "dashboard.spending_by_category", "GET", f"/analytics/spending_by_category?{month_query}")
+        recorder.timed(client, "dashboard.budgets_remaining", "GET", f"/budgets/remaining?{month_query}")
+        status, body = recorder.timed(client, "dashboard.groups_summary", "GET", "/splits/groups/summary")
+        recorder.timed(client, "expenses.list", "GET", "/expenses/?limit=50")
+
+        if group_id is None and status == 200:
+            groups = [g for g in json.loads(body) if g["member_count"] >= 2]
+            if groups:
+                group_id = groups[0]["id"]
+                status, body = client.request("GET", f"/splits/groups/getGroupDetail/{group_id}")
+                member_ids = [u["id"] for u in json.loads(body)["users"]][:2] if status == 200 else []
+        if member_ids and args.post_every and i % args.post_every == 0:
+            expense = {
+                "description": "load test", "amount": 20.01, "selectedMembers": member_ids, "splitMethod": "equal",
+                "shares": [{"user_id": member_ids[0], "share_amount": 10.01},
+                           {"user_id": member_ids[1], "share_amount": 10.00}],
+            }
+            recorder.timed(
+                client, "groups.post_expense", "POST", f"/splits/groups/{group_id}/expenses",
+                body=json.dumps(expense).encode(), headers={"Content-Type": "application/json"}
+            )
+
+
+def _storm_user(args, username: str, recorder: _Recorder, start: threading.Barrier):
+    client = _Client(args.base_url, args.timeout)
+    start.wait()
+    for _ in range(args.iterations):
+        _login(args, client, username, recorder, "storm.login")
+
+def _bystander(args, recorder: _Recorder, start: threading.Barrier, storm_over: threading.Event):
+    client = _Client(args.base_url, args.timeout)
+    now = datetime.now()
+    month_query = urlencode({"month": now.month, "year": now.year})
+    # Logged in before the storm, so only its reads are measured
+    logged_in = _login(args, client, f"{args.prefix}_{args.users}", _Recorder(), "login")
+    start.wait()
+    while logged_in and not storm_over.is_set():
+        recorder.timed(client, "storm.bystander", "GET", f"/budgets/remaining?{month_query}")
+
+def _run_login_storm(args, recorder: _Recorder):
+    start = threading.Barrier(args.users + 1)
+    storm_over = threading.Event()
+    with ThreadPoolExecutor(max_workers=args.users + 1) as pool:
+        bystander = pool.submit(_bystander, args, recorder, start, storm_over)
+        futures = [pool.submit(_storm_user, args, f"{args.prefix}_{n}", recorder, start) for n in range(args.users)]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            storm_over.set()
+        bystander.result()
+
+def _run_dashboard(args, recorder: _Recorder):
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        futures = [pool.submit(_virtual_user, args, f"{args.prefix}_{n}", recorder) for n in range(args.users)]
+        for future in futures:
+            future.result() # Surface a crashed virtual user instead of under-reporting
+
+SCENARIOS = {"dashboard": _run_dashboard, "login-storm": _run_login_storm}
+
+
+def _internal(args, path: str) -> Optional[Dict[str, Any]]:
+    headers = {"X-Internal-Token": args.internal_token} if args.internal_token else {}
+    status, body = _Client(args.base_url, args.timeout, headers).request("GET", path)
+    return json.loads(body) if status == 200 else None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run an HTTP load scenario against seeded data.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="dashboard")
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users (seeded accounts)")
+    parser.add_argument("--iterations", type=int, default=20, help="Dashboard loads (or logins) per virtual user")
+    parser.add_argument("--post-every", type=int, default=5, help="Post a group expense every N iterations; 0 never")
+    parser.add_argument("--prefix", default="bench", help="Prefix the data was seeded with")
+    parser.add_argument("--password", default="benchmark")
+    parser.add_argument("--internal-token", default=os.getenv("INTERNAL_METRICS_TOKEN"))
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help=f"Write results to {BASELINE_DIR}/load.json (login-storm: login_storm.json)"
+    )
+    args = parser.parse_args(argv)
+
+    before = _internal(args, "/internal/db/queries")
+    pool_before = _internal(args, "/internal/auth/password_hashing")
+    recorder = _Recorder()
+    started = time.perf_counter()
+    SCENARIOS[args.scenario](args, recorder)
+    wall = time.perf_counter() - started
+    after = _internal(args, "/internal/db/queries")
+    pool_after = _internal(args, "/internal/auth/password_hashing")
+    if before is None or after is None:
+        print("Could not read /internal/db/queries (token or SQL_INSTRUMENTATION?); queries per request not reported.")
+
+    api_prefix = urlsplit(args.base_url).path.rstrip("/")
+    results = {}
+    for step, samples in recorder.samples.items():
+        queries = None
+        if before is not None and after is not None:
+            route = STEP_ROUTES[step].replace(" ", f" {api_prefix}", 1)
+            requests = after.get(route, {}).get("requests", 0) - before.get(route, {}).get("requests", 0)
+            if requests:
+                queries = (after[route]["queries"] - before.get(route, {}).get("queries", 0)) / requests
+        results[step] = {
+            **summarize(samples, queries),
+            "errors": recorder.errors.get(step, 0),
+            "rate_503": round(recorder.statuses[step][503] / len(samples), 4),
+        }
+
+    print_results(results, "queries")
+    total = sum(len(samples) for samples in recorder.samples.values())
+    errors = sum(recorder.errors.values())
+    print(f"{total} requests in {wall:.1f}s ({total / wall:.0f} req/s), {errors} error(s).")
+
+    params = {"scenario": args.scenario, "users": args.users, "iterations": args.iterations}
+    if args.scenario == "dashboard":
+        params["post_every"] = args.post_every
+        kind, baseline_name = "load", "load.json"
+    else:
+        # Pool size, and the hashes it ran or rejected during this run
+        params["password_hashing"] = pool_after and pool_before and {
+            **pool_after, "completed": pool_after["completed"] - pool_before["completed"],
+            "rejected": pool_after["rejected"] - pool_before["rejected"],
+        }
+        kind, baseline_name = "login_storm", "login_storm.json"
+        for step, result in results.items():
+            print(f"{step}: {result['rate_503'] * 100:.1f}% answered 503")
+        print(f"Password hashing pool: {params['password_hashing'] or 'unknown (internal token?)'}")
+    if args.output:
+        write_results(args.output, kind, results, params)
+    if args.save_baseline:
+        path = os.path.join(BASELINE_DIR, baseline_name)
+        write_results(path, kind, results, params)
+        print(f"Baseline saved to {path}")
+    # Shedding logins with 503 is the pool working as intended, not a failure
+    unexpected = sum(
+        count for step, statuses in recorder.statuses.items() for status, count in statuses.items()
+        if not 200 <= status < 300 and not (step == "storm.login" and status == 503)
+    )
+    return 1 if unexpected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# backend/app/scripts/money_minor_units.py
+"""
+Move money columns from NUMERIC(…, 2) to BIGINT minor units (cents), and
+benchmark the two representations.
+
+Usage (from the backend directory or inside the backend container):
+    python -m app.scripts.money_minor_units status
+    python -m app.scripts.money_minor_units migrate
+    python -m app.scripts.money_minor_units benchmark [--rows 1000000] [--groups 1000]
+
+`migrate` converts every column still stored as NUMERIC in one transaction
+(already-converted columns are skipped), so it is safe to re-run. `benchmark`
+works on temporary tables inside a rolled-back transaction and leaves the
+database untouched.
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.db.database import engine
+
+# (table, column) pairs mapped to app.db.types.MinorUnits
+MONEY_COLUMNS = [
+    ("expenses", "amount"),
+    ("expense_monthly_rollups", "total_spent"),
+    ("budgets", "amount"),
+    ("group_expenses", "amount"),
+    ("group_expense_shares", "share_amount"),
+    ("settlements", "amount"),
+    ("group_member_balances", "net_balance"),
+]
+
+COLUMN_TYPE_SQL = """
+SELECT data_type FROM information_schema.columns
+WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column
+"""
+
+# One table per representation, holding the same generated rows
+BENCH_SEED_SQL = """
+CREATE TEMP TABLE bench_{kind} ON COMMIT DROP AS
+SELECT g % :groups AS group_id, g % 97 AS user_id, {value} AS amount
+FROM (SELECT g, round((random() * 500)::numeric, 2) + 0.01 AS major FROM generate_series(1, :rows) AS g) AS seed
+"""
+
+BENCH_QUERIES = {
+    "SUM": "SELECT sum(amount) FROM bench_{kind}",
+    "balance recompute": """
+        SELECT group_id, user_id, sum(delta) FROM (
+            SELECT group_id, user_id, amount AS delta FROM bench_{kind}
+            UNION ALL
+            SELECT group_id, (user_id + 1) % 97, -amount FROM bench_{kind}
+        ) AS movements
+        GROUP BY group_id, user_id
+    """,
+}
+
+
+def _column_types(connection) -> dict:
+    return {
+        (table, column): connection.execute(text(COLUMN_TYPE_SQL), {"table": table, "column": column}).scalar()
+        for table, column in MONEY_COLUMNS
+    }
+
+
+def _benchmark(connection, rows: int, groups: int, repeat: int = 5):
+    params = {"rows": rows, "groups": groups}
+    connection.execute(text("SELECT setseed(0.42)"))
+    connection.execute(text(BENCH_SEED_SQL.format(kind="numeric", value="major")), params)
+    connection.execute(text("SELECT setseed(0.42)"))
+    connection.execute(text(BENCH_SEED_SQL.format(kind="bigint", value="(major * 100)::bigint")), params)
+    connection.execute(text("ANALYZE bench_numeric, bench_bigint"))
+
+    for name, query in BENCH_QUERIES.items():
+        timings = {}
+        for kind in ("numeric", "bigint"):
+            statement = text(query.format(kind=kind))
+            connection.execute(statement).all() # Warm the cache
+            started = time.perf_counter()
+            for _ in range(repeat):
+                connection.execute(statement).all()
+            timings[kind] = (time.perf_counter() - started) / repeat
+        print(
+            f"{name:<18} numeric {timings['numeric'] * 1000:8.1f} ms   "
+            f"bigint {timings['bigint'] * 1000:8.1f} ms   "
+            f"({rows / timings['bigint'] / 1e6:.1f}M vs {rows / timings['numeric'] / 1e6:.1f}M rows/s)"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate money columns to BIGINT cents, or benchmark them.")
+    parser.add_argument("command", choices=["status", "migrate", "benchmark"])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows to generate for the benchmark")
+    parser.add_argument("--groups", type=int, default=1000, help="Groups to spread benchmark rows over")
+    args = parser.parse_args(argv)
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        if args.command == "benchmark":
+            _benchmark(connection, args.rows, args.groups)
+            transaction.rollback()
+            return 0
+
+        types = _column_types(connection)
+        if args.command == "status":
+            for (table, column), data_type in types.items():
+                print(f"{table}.{column}: {data_type}")
+            pending = sum(1 for data_type in types.values() if data_type == "numeric")
+            print(f"{pending} column(s) still NUMERIC.")
+            transaction.rollback()
+            return 1 if pending else 0
+
+        migrated = 0
+        for (table, column), data_type in types.items():
+            if data_type != "numeric":
+                continue
+            connection.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT USING round({column} * 100)::bigint"
+            ))
+            print(f"migrated {table}.{column}")
+            migrated += 1
+        transaction.commit()
+        print(f"{migrated} column(s) converted to cents.")
+        return 0
+    except Exception:
+        transaction.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# backend/app/scripts/seed_data.py
+"""
+Synthetic data generator for the benchmarks and load tests.
+
+Creates users with multi-year expense histories, monthly budgets and groups of
+widely varying size, with realistic skew: activity per user is Pareto
+distributed (a few heavy users hold most of the expenses), categories and
+amounts are weighted per category, and a few groups are large. Rows are
+streamed in with COPY, then the spending rollup and group balance ledger are
+rebuilt and the tables ANALYZEd. The generator is seeded, so the same
+arguments produce the same data.
+
+Every user is named <prefix>_<n> and shares --password; `--reset` deletes a
+previous run first (its groups, expenses and budgets cascade with the users).
+Point it at a local benchmark database: the rollup and ledger rebuilds cover
+every user.
+
+Usage:
+    python -m app.scripts.seed_data [--users 2000] [--expenses 1000000] [--years 3] [--groups 300] [--seed 42]
+    python -m app.scripts.seed_data --reset --users 200 --expenses 50000
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.db.database import engine
+from app.db.models import ExpenseCategory
+from app.services import balance_service, rollup_service
+
+COPY_CHUNK_ROWS = 50_000
+
+# (relative frequency, median amount in cents) per category
+CATEGORY_PROFILE = {
+    ExpenseCategory.FOOD: (30, 1_800),
+    ExpenseCategory.TRANSPORTATION: (14, 900),
+    ExpenseCategory.SHOPPING: (12, 4_500),
+    ExpenseCategory.ENTERTAINMENT: (10, 2_500),
+    ExpenseCategory.UTILITIES: (8, 7_000),
+    ExpenseCategory.OTHER: (8, 2_000),
+    ExpenseCategory.HEALTH: (6, 5_000),
+    ExpenseCategory.TRAVEL: (5, 25_000),
+    ExpenseCategory.EDUCATION: (4, 8_000),
+    ExpenseCategory.RENT: (3, 120_000),
+}
+GROUP_EXPENSE_MEDIAN_CENTS = 4_000
+
+
+def _amount(rng: random.Random, median_cents: int) -> int:
+    return max(1, int(median_cents * rng.lognormvariate(0, 0.6)))
+
+def _pareto_split(rng: random.Random, total: int, parts: int, alpha: float) -> List[int]:
+    """Splits `total` over `parts` with Pareto-distributed weights; every part gets at least 1."""
+    weights = [rng.paretovariate(alpha) for _ in range(parts)]
+    scale = total / sum(weights)
+    return [max(1, round(w * scale)) for w in weights]
+
+def _copy(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """Streams rows into `table` with COPY ... FROM STDIN, one buffer of COPY_CHUNK_ROWS at a time."""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for row in rows:
+        writer.writerow(row) # None becomes an unquoted empty field, i.e. NULL
+        count += 1
+        if count % COPY_CHUNK_ROWS == 0:
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+    return count
+
+def _reserve_ids(cursor, table: str, count: int) -> int:
+    """Advances the table's id sequence by `count` and returns the first reserved id."""
+    cursor.execute(
+        "SELECT setval(pg_get_serial_sequence(%s, 'id'), nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+        (table, table, count)
+    )
+    return cursor.fetchone()[0] - count + 1
+
+def _user_pattern(prefix: str) -> str:
+    return prefix.replace("_", r"\_") + r"\_%"
+
+
+def fixtures(db: Session, prefix: str = "bench") -> Dict[str, Any]:
+    """
+    Ids the benchmarks run against: the seeded user with the most expenses, a
+    median one, and the largest seeded group with one of its members.
+    """
+    users = db.execute(text("""
+        SELECT u.id, u.username, count(e.id) AS expenses
+        FROM users u LEFT JOIN expenses e ON e.owner_id = u.id
+        WHERE u.username LIKE :pattern
+        GROUP BY u.id ORDER BY expenses DESC, u.id
+    """), {"pattern": _user_pattern(prefix)}).all()
+    if not users:
+        raise SystemExit(f"No seeded data for prefix {prefix!r}; run `python -m app.scripts.seed_data` first.")
+    group = db.execute(text("""
+        SELECT g.id, g.created_by_user_id, count(*) AS members
+        FROM groups g JOIN group_members gm ON gm.group_id = g.id
+        WHERE g.name LIKE :pattern
+        GROUP BY g.id ORDER BY members DESC, g.id LIMIT 1
+    """), {"pattern": prefix.replace("_", r"\_") + " group %"}).one()
+    return {
+        "heavy_user_id": users[0].id,
+        "typical_user_id": users[len(users) // 2].id,
+        "group_id": group.id,
+        "group_member_id": group.created_by_user_id,
+        "group_size": group.members,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Seed a local database with skewed synthetic data via COPY.")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--expenses", type=int, default=1_000_000, help="Personal expenses across all users")
+    parser.add_argument("--years", type=int, default=3, help="Length of the expense history")
+    parser.add_argument("--budget-ratio", type=float, default=0.6, help="Fraction of users with monthly budgets")
+    parser.add_argument("--groups", type=int, default=300)
+    parser.add_argument("--max-group-size", type=int, default=200, help="Size of the largest group")
+    parser.add_argument("--group-expenses", type=int, default=100_000)
+    parser.add_argument("--prefix", default="bench", help="Username prefix of the seeded users")
+    parser.add_argument("--password", default="benchmark", help="Password shared by the seeded users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Delete users from a previous run with this prefix first")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    span_seconds = int(timedelta(days=365 * args.years).total_seconds())
+    history_start = now - timedelta(seconds=span_seconds)
+
+    def when() -> datetime:
+        # Skewed towards recent months, as real usage grows over time
+        return history_start + timedelta(seconds=int(span_seconds * rng.random() ** 0.7))
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        pattern = _user_pattern(args.prefix)
+        if args.reset:
+            cursor.execute("DELETE FROM users WHERE username LIKE %s", (pattern,))
+            print(f"Deleted {cursor.rowcount} previously seeded user(s).")
+        else:
+            cursor.execute("SELECT count(*) FROM users WHERE username LIKE %s", (pattern,))
+            if cursor.fetchone()[0]:
+                print(f"Users prefixed {args.prefix!r} already exist; pass --reset to replace them.")
+                return 1
+
+        # Users: one bcrypt hash shared by all, so seeding isn't dominated by hashing
+        hashed_password = get_password_hash(args.password)
+        first_user = _reserve_ids(cursor, "users", args.users)
+        user_ids = list(range(first_user, first_user + args.users))
+        _copy(cursor, "users", ("id", "username", "email", "hashed_password"), (
+            (user_id, f"{args.prefix}_{n}", f"{args.prefix}_{n}@example.invalid", hashed_password)
+            for n, user_id in enumerate(user_ids)
+        ))
+
+        # Expenses: Pareto activity per user, weighted categories, lognormal amounts
+        categories = list(CATEGORY_PROFILE)
+        category_weights = [CATEGORY_PROFILE[c][0] for c in categories]
+        per_user = _pareto_split(rng, args.expenses, args.users, alpha=1.2)
+        spent: Dict[int, int] = {}
+
+        def expense_rows():
+            for user_id, count in zip(user_ids, per_user):
+                for category in rng.choices(categories, category_weights, k=count):
+                    amount = _amount(rng, CATEGORY_PROFILE[category][1])
+                    spent[user_id] = spent.get(user_id, 0) + amount
+                    yield (f"{category.value} expense", amount, when().isoformat(), category.value, user_id)
+
+        expenses = _copy(cursor, "expenses", ("description", "amount", "date", "category", "owner_id"), expense_rows())
+
+        # Budgets: every month of the history, around each user's average monthly spend
+        months = []
+        year, month = history_start.year, history_start.month
+        while (year, month) <= (now.year, now.month):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        def budget_rows():
+            for user_id in user_ids:
+                if rng.random() >= args.budget_ratio:
+                    continue
+                monthly = spent.get(user_id, 0) / len(months)
+                for year, month in months:
+                    yield (month, year, max(1000, int(monthly * rng.uniform(0.8, 1.3))), user_id)
+
+        budgets = _copy(cursor, "budgets", ("month", "year", "amount", "owner_id"), budget_rows())
+
+        # Groups: one of --max-group-size, the rest mostly small with a long tail
+        group_sizes = [min(args.users, args.max_group_size)] + [
+            min(args.users, args.max_group_size, 2 + int(rng.paretovariate(1.3)))
+            for _ in range(args.groups - 1)
+        ]
+        group_members = [rng.sample(user_ids, size) for size in group_sizes]
+        first_group = _reserve_ids(cursor, "groups", args.groups)
+        group_ids = list(range(first_group, first_group + args.groups))
+        _copy(cursor, "groups", ("id", "name", "description", "created_by_user_id", "created_at"), (
+            (group_id, f"{args.prefix} group {n}", None, members[0], history_start.isoformat())
+            for n, (group_id, members) in enumerate(zip(group_ids, group_members))
+        ))
+        memberships = _copy(cursor, "group_members", ("group_id", "user_id"), (
+            (group_id, user_id) for group_id, members in zip(group_ids, group_members) for user_id in members
+        ))
+
+        # Group expenses: busier in bigger groups, split evenly between 2-6 members
+        shares: List[Sequence[Any]] = []
+        expense_groups = rng.choices(range(args.groups), group_sizes, k=args.group_expenses)
+        first_group_expense = _reserve_ids(cursor, "group_expenses", args.group_expenses)
+
+        def group_expense_rows():
+            for expense_id, index in enumerate(expense_groups, start=first_group_expense):
+                members = group_members[index]
+                payer = rng.choice(members)
+                participants = rng.sample(members, min(len(members), rng.randint(2, 6)))
+                amount = _amount(rng, GROUP_EXPENSE_MEDIAN_CENTS)
+                base, remainder = divmod(amount, len(participants))
+                for n, user_id in enumerate(participants):
+                    shares.append((expense_id, user_id, base + (1 if n < remainder else 0), False))
+                created_at = when().isoformat()
+                yield (expense_id, "Shared expense", amount, created_at, group_ids[index], payer, created_at)
+
+        group_expenses = _copy(
+            cursor, "group_expenses",
+            ("id", "description", "amount", "date", "group_id", "paid_by_user_id", "created_at"),
+            group_expense_rows()
+        )
+        share_count = _copy(cursor, "group_expense_shares", ("expense_id", "user_id", "share_amount", "is_paid"), shares)
+        raw.commit()
+    finally:
+        raw.close()
+
+    with Session(engine) as db:
+        rollup_rows = rollup_service.rebuild(db)
+        balance_rows = balance_service.rebuild(db)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+    print(
+        f"Seeded {args.users} users, {expenses} expenses over {args.years} year(s), {budgets} budgets, "
+        f"{args.groups} groups ({memberships} memberships, largest {group_sizes[0]}), "
+        f"{group_expenses} group expenses with {share_count} shares."
+    )
+    print(f"Rebuilt {rollup_rows} rollup rows and {balance_rows} balance rows.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
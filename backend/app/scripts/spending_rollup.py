@@ -0,0 +1,45 @@
+# backend/app/scripts/spending_rollup.py
+"""
+Rebuild or verify the expense_monthly_rollups table against expenses.
+
+Usage (from the backend directory or inside the backend container):
+    python -m app.scripts.spending_rollup verify [--user-id ID]
+    python -m app.scripts.spending_rollup rebuild [--user-id ID]
+
+`verify` exits with status 1 when drift is found, so it can run from cron/CI.
+"""
+import argparse
+import sys
+
+from app.db.database import SessionLocal
+from app.services import rollup_service
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild or verify the monthly spending rollup.")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--user-id", type=int, default=None, help="Limit to a single user")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            rows = rollup_service.rebuild(db, owner_id=args.user_id)
+            print(f"Rebuilt rollup: {rows} rows written.")
+            return 0
+
+        drift = rollup_service.find_drift(db, owner_id=args.user_id)
+        for d in drift:
+            print(
+                f"user={d['owner_id']} {d['year']}-{d['month']:02d} {d['category']}: "
+                f"stored {d['stored_total']:.2f} ({d['stored_count']}) "
+                f"!= expected {d['expected_total']:.2f} ({d['expected_count']})"
+            )
+        print(f"{len(drift)} drifted bucket(s).")
+        return 1 if drift else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
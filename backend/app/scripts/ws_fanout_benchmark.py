@@ -0,0 +1,112 @@
+# backend/app/scripts/ws_fanout_benchmark.py
+"""
+Broadcast latency benchmark for the group WebSocket fan-out.
+
+Registers N in-process sockets in one group on the real ConnectionManager, a
+fraction of which are slow readers (each send stalls for --slow-delay seconds),
+then broadcasts messages and reports how long broadcast() blocks the caller and
+how long it takes for every fast socket to receive each message. --sequential
+runs the same sockets through a one-by-one awaited send loop for comparison.
+
+Usage:
+    python -m app.scripts.ws_fanout_benchmark [--sockets 5000] [--slow-ratio 0.01] [--messages 20]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from app.api.v1.splits_ws import ConnectionManager
+from app.core.broadcast import MemoryBroadcaster
+from app.core.config import settings
+
+GROUP_ID = 1
+
+
+class _BenchSocket:
+    """Just enough of a WebSocket for the manager: accept, send_text, close."""
+    def __init__(self, slow: bool, slow_delay: float, on_receive):
+        self.slow = slow
+        self.slow_delay = slow_delay
+        self.on_receive = on_receive
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.slow_delay if self.slow else 0)
+        if not self.slow and '"NEW_EXPENSE"' in text: # Not the CONNECTED greeting
+            self.on_receive()
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _run(args) -> int:
+    # All benchmark sockets share one group; lift this worker's per-group cap for the run
+    settings.WS_MAX_CONNECTIONS_PER_GROUP = max(settings.WS_MAX_CONNECTIONS_PER_GROUP, args.sockets)
+    manager = ConnectionManager(MemoryBroadcaster())
+    slow_count = int(args.sockets * args.slow_ratio)
+    fast_count = args.sockets - slow_count
+    state = {"received": 0, "done": asyncio.Event()}
+
+    def on_receive():
+        state["received"] += 1
+        if state["received"] == fast_count:
+            state["done"].set()
+
+    sockets = [
+        _BenchSocket(i < slow_count, args.slow_delay, on_receive) for i in range(args.sockets)
+    ]
+    for socket in sockets:
+        await manager.connect(socket, GROUP_ID)
+
+    call_times, delivery_times = [], []
+    for i in range(args.messages):
+        state["received"], state["done"] = 0, asyncio.Event()
+        message = {"event": "NEW_EXPENSE", "expense": {"id": i, "description": "bench", "amount": 12.5}}
+        started = time.perf_counter()
+        if args.sequential:
+            for socket in sockets:
+                await socket.send_text(json.dumps(message)) # Serialized per socket, as before
+        else:
+            await manager.broadcast(GROUP_ID, message)
+        call_times.append(time.perf_counter() - started)
+        await state["done"].wait()
+        delivery_times.append(time.perf_counter() - started)
+
+    mode = "sequential send loop" if args.sequential else "queued fan-out"
+    print(f"{mode}: {args.sockets} sockets, {slow_count} slow ({args.slow_delay}s per send), {args.messages} messages")
+    for name, samples in (("caller blocked", call_times), ("all fast sockets received", delivery_times)):
+        print(
+            f"  {name:<26} p50 {statistics.median(samples) * 1000:9.2f} ms   "
+            f"p99 {_percentile(samples, 0.99) * 1000:9.2f} ms"
+        )
+    if not args.sequential:
+        print(f"  manager stats: {manager.stats}")
+
+    for socket in sockets:
+        manager.disconnect(socket, GROUP_ID)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark group WebSocket broadcast latency.")
+    parser.add_argument("--sockets", type=int, default=5000)
+    parser.add_argument("--slow-ratio", type=float, default=0.01, help="Fraction of sockets that read slowly")
+    parser.add_argument("--slow-delay", type=float, default=0.2, help="Seconds each send to a slow socket stalls")
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--sequential", action="store_true", help="Measure an awaited one-by-one send loop instead")
+    args = parser.parse_args(argv)
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,17 @@
 from sqlalchemy.orm import Session
 from app.db.models import User
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
 from app.core.exceptions import UserAlreadyExistsException, UserNotFoundException
 from app.db import crud # Import crud
+from app.core.config import settings
+from app.core.cache import TTLCache
+
+# username (JWT subject) -> {"id", "username", "email"}; see get_current_user
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+def invalidate_principal(username: str):
+    """Drops a cached principal; call after any write to that user's row."""
+    principal_cache.pop(username)
 
 def get_user_by_username(db: Session, username: str):
     """Retrieves a user by username."""
@@ -14,16 +22,32 @@ def get_user_by_email(db: Session, email: str):
     """Retrieves a user by email."""
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user: UserCreate):
-    """Creates a new user in the database."""
+def user_exists(db: Session, username: str, email: str) -> bool:
+    """Checks whether the username or email is already taken."""
+    return bool(get_user_by_username(db, username=username) or get_user_by_email(db, email=email))
+
+def create_user(db: Session, user: UserCreate, hashed_password: str):
+    """
+    Creates a new user in the database.
+    The password is hashed by the caller, on the password hashing pool.
+    """
     # Check if username or email already exists using service functions
-    if get_user_by_username(db, username=user.username) or get_user_by_email(db, email=user.email):
+    if user_exists(db, username=user.username, email=user.email):
         raise UserAlreadyExistsException()
 
-    hashed_password = get_password_hash(user.password)
     user_in_db = user.model_dump()
     user_in_db["hashed_password"] = hashed_password
     del user_in_db["password"] # Remove plain password before passing to crud
 
     db_user = crud.create_item(db, User, user_in_db)
+    invalidate_principal(db_user.username)
+    return db_user
+
+def update_password_hash(db: Session, user_id: int, hashed_password: str):
+    """Replaces a user's stored password hash (used for transparent rehash on login)."""
+    db_user = db.query(User).filter(User.id == user_id).first()
+    if not db_user:
+        raise UserNotFoundException()
+    db_user = crud.update_item(db, db_user, {"hashed_password": hashed_password})
+    invalidate_principal(db_user.username)
     return db_user
@@ -0,0 +1,182 @@
+# backend/app/services/balance_service.py
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from app.db.models import GroupMemberBalance, GroupExpense, GroupExpenseShare, Settlement, User
+from app.schemas.group import GroupBalancesResponse, UserBalance
+from app.core.exceptions import GroupNotFoundException
+from app.services import group as group_1
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+def apply_balance_deltas(db: Session, group_id: int, deltas: Dict[int, Decimal]):
+    """
+    Adds per-user deltas to the group's balance rows with one multi-row upsert,
+    without committing. Rows are written in user_id order so concurrent writers
+    to the same group lock them in the same order.
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    stmt = insert(GroupMemberBalance).values([
+        {"group_id": group_id, "user_id": user_id, "net_balance": delta}
+        for user_id, delta in sorted(deltas.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["group_id", "user_id"],
+        set_={
+            "net_balance": GroupMemberBalance.net_balance + stmt.excluded.net_balance,
+            "updated_at": func.now(),
+        }
+    )
+    db.execute(stmt)
+
+def record_group_expense(db: Session, group_id: int, paid_by_user_id: int, amount: Decimal, shares: Iterable[Tuple[int, Decimal]]):
+    """The payer is owed the full amount; every share holder owes their share."""
+    deltas: Dict[int, Decimal] = {paid_by_user_id: amount}
+    for user_id, share_amount in shares:
+        deltas[user_id] = deltas.get(user_id, 0) - share_amount
+    apply_balance_deltas(db, group_id, deltas)
+
+def record_settlements(db: Session, group_id: int, settlements: Iterable[Tuple[int, int, Decimal]]):
+    """
+    Applies (payer_id, receiver_id, amount) settlements: paying moves the payer's
+    balance up towards zero and the receiver's down by the same amount.
+    """
+    deltas: Dict[int, Decimal] = {}
+    for payer_id, receiver_id, amount in settlements:
+        deltas[payer_id] = deltas.get(payer_id, 0) + amount
+        deltas[receiver_id] = deltas.get(receiver_id, 0) - amount
+    apply_balance_deltas(db, group_id, deltas)
+
+def get_net_balances(db: Session, group_id: int) -> Dict[int, Decimal]:
+    """Returns {user_id: net_balance} for every member with a non-zero balance."""
+    rows = db.query(GroupMemberBalance.user_id, GroupMemberBalance.net_balance).filter(
+        GroupMemberBalance.group_id == group_id,
+        GroupMemberBalance.net_balance != 0
+    ).all()
+    return {row.user_id: row.net_balance for row in rows}
+
+def lock_balances(db: Session, group_id: int):
+    """
+    Row-locks the group's balance rows (SELECT ... FOR UPDATE) until the caller's
+    transaction ends, in user_id order like apply_balance_deltas.
+    """
+    db.execute(
+        select(GroupMemberBalance.user_id).where(GroupMemberBalance.group_id == group_id)
+        .order_by(GroupMemberBalance.user_id).with_for_update()
+    )
+
+def get_group_balances(db: Session, group_id: int, current_user_id: int) -> GroupBalancesResponse:
+    """
+    Reads the net balances of a group from the ledger: one indexed lookup per member
+    with a non-zero balance, independent of how much history the group has.
+    """
+    if not group_1.is_group_member(db, group_id, current_user_id):
+        raise GroupNotFoundException()
+
+    rows = db.query(
+        GroupMemberBalance.user_id,
+        User.username,
+        GroupMemberBalance.net_balance
+    ).join(
+        User, User.id == GroupMemberBalance.user_id
+    ).filter(
+        GroupMemberBalance.group_id == group_id,
+        GroupMemberBalance.net_balance != 0
+    ).order_by(GroupMemberBalance.user_id).all()
+
+    total_owed_by_you = Decimal(0)
+    total_owed_to_you = Decimal(0)
+    individual_balances: List[UserBalance] = []
+    for row in rows:
+        net_balance = row.net_balance
+        individual_balances.append(UserBalance(user_id=row.user_id, username=row.username, net_balance=net_balance))
+        if row.user_id == current_user_id:
+            if net_balance < 0: # Current user has a negative balance, meaning they owe others
+                total_owed_by_you = -net_balance
+            else: # Positive balance, meaning others owe them
+                total_owed_to_you = net_balance
+
+    return GroupBalancesResponse(
+        group_id=group_id,
+        total_owed_by_you=total_owed_by_you,
+        total_owed_to_you=total_owed_to_you,
+        individual_balances=individual_balances
+    )
+
+def _recomputed_balances_query(group_id: Optional[int] = None):
+    """Replays expenses, shares and settlements into (group_id, user_id, net_balance) rows."""
+    paid = select(
+        GroupExpense.group_id.label("group_id"),
+        GroupExpense.paid_by_user_id.label("user_id"),
+        GroupExpense.amount.label("delta")
+    ).where(GroupExpense.group_id.isnot(None))
+    owed = select(
+        GroupExpense.group_id,
+        GroupExpenseShare.user_id,
+        -GroupExpenseShare.share_amount
+    ).join(GroupExpense, GroupExpense.id == GroupExpenseShare.expense_id).where(GroupExpense.group_id.isnot(None))
+    settled_out = select(Settlement.group_id, Settlement.payer_id, Settlement.amount)
+    settled_in = select(Settlement.group_id, Settlement.receiver_id, -Settlement.amount)
+
+    if group_id is not None:
+        paid = paid.where(GroupExpense.group_id == group_id)
+        owed = owed.where(GroupExpense.group_id == group_id)
+        settled_out = settled_out.where(Settlement.group_id == group_id)
+        settled_in = settled_in.where(Settlement.group_id == group_id)
+
+    movements = union_all(paid, owed, settled_out, settled_in).subquery()
+    return select(
+        movements.c.group_id,
+        movements.c.user_id,
+        func.sum(movements.c.delta).label("net_balance")
+    ).group_by(movements.c.group_id, movements.c.user_id)
+
+def find_drift(db: Session, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Compares the ledger against balances recomputed from the full group history.
+    Returns one entry per (group, user) whose stored balance differs.
+    """
+    expected = {
+        (r.group_id, r.user_id): r.net_balance
+        for r in db.execute(_recomputed_balances_query(group_id)).all()
+    }
+    stored_query = db.query(GroupMemberBalance)
+    if group_id is not None:
+        stored_query = stored_query.filter(GroupMemberBalance.group_id == group_id)
+    stored = {(r.group_id, r.user_id): r.net_balance for r in stored_query.all()}
+
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        exp_balance = expected.get(key, Decimal(0))
+        got_balance = stored.get(key, Decimal(0))
+        if exp_balance != got_balance:
+            drift.append({
+                "group_id": key[0],
+                "user_id": key[1],
+                "expected_balance": exp_balance,
+                "stored_balance": got_balance,
+            })
+    return drift
+
+def rebuild(db: Session, group_id: Optional[int] = None, commit: bool = True) -> int:
+    """
+    Recomputes the ledger from group history, for one group or for all of them.
+    Returns the number of balance rows written.
+    """
+    delete_query = db.query(GroupMemberBalance)
+    if group_id is not None:
+        delete_query = delete_query.filter(GroupMemberBalance.group_id == group_id)
+    delete_query.delete(synchronize_session=False)
+
+    recomputed = _recomputed_balances_query(group_id).subquery()
+    result = db.execute(
+        insert(GroupMemberBalance).from_select(
+            ["group_id", "user_id", "net_balance"],
+            select(recomputed.c.group_id, recomputed.c.user_id, recomputed.c.net_balance)
+        )
+    )
+    if commit:
+        db.commit()
+    return result.rowcount
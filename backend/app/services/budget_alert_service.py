@@ -0,0 +1,103 @@
+# backend/app/services/budget_alert_service.py
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Budget, ExpenseMonthlyRollup, UserMonthlySpending
+
+# Alerts raised in a session's transaction, for the route to push once it committed
+PENDING_KEY = "budget_alerts"
+
+
+def _queue_alerts(
+    db: Session, owner_id: int, year: int, month: int, total: Decimal, alerted: int, budget: Optional[Decimal]
+):
+    """Marks the highest newly crossed threshold as sent and queues one alert for it."""
+    if not budget:
+        return
+    crossed = [t for t in settings.BUDGET_ALERT_THRESHOLDS if t > alerted and total * 100 >= budget * t]
+    if not crossed:
+        return
+    threshold = max(crossed)
+    db.execute(update(UserMonthlySpending).where(
+        UserMonthlySpending.owner_id == owner_id,
+        UserMonthlySpending.year == year,
+        UserMonthlySpending.month == month
+    ).values(alerted_percent=threshold))
+    db.info.setdefault(PENDING_KEY, []).append({
+        "event": "BUDGET_THRESHOLD",
+        "year": year,
+        "month": month,
+        "threshold": threshold,
+        "total_budget": float(budget),
+        "total_spent": float(total),
+        "remaining_amount": float(budget - total),
+    })
+
+def apply_spending_delta(db: Session, owner_id: int, year: int, month: int, amount: Decimal):
+    """
+    Adds `amount` (negative to remove) to the user's running total for the month
+    without committing, and on an increase checks it against the month's budget.
+    The upsert locks the row until commit, so concurrent writes for the same user
+    and month can't both send the same threshold.
+    """
+    stmt = insert(UserMonthlySpending).values(owner_id=owner_id, year=year, month=month, total_spent=amount)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["owner_id", "year", "month"],
+        set_={"total_spent": UserMonthlySpending.total_spent + stmt.excluded.total_spent}
+    ).returning(UserMonthlySpending.total_spent, UserMonthlySpending.alerted_percent)
+    total, alerted = db.execute(stmt).one()
+    if amount > 0:
+        budget = db.execute(select(Budget.amount).where(
+            Budget.owner_id == owner_id, Budget.year == year, Budget.month == month
+        )).scalar()
+        _queue_alerts(db, owner_id, year, month, total, alerted, budget)
+
+def check_budget(db: Session, owner_id: int, year: int, month: int, budget: Decimal):
+    """Checks the month's running total against a budget being set, e.g. lowered below the spend so far."""
+    row = db.execute(select(UserMonthlySpending.total_spent, UserMonthlySpending.alerted_percent).where(
+        UserMonthlySpending.owner_id == owner_id,
+        UserMonthlySpending.year == year,
+        UserMonthlySpending.month == month
+    ).with_for_update()).first()
+    if row:
+        _queue_alerts(db, owner_id, year, month, row.total_spent, row.alerted_percent, budget)
+
+def get_month_total(db: Session, owner_id: int, year: int, month: int) -> Decimal:
+    """The running total for one month: a primary-key lookup instead of a SUM over expenses."""
+    total = db.execute(select(UserMonthlySpending.total_spent).where(
+        UserMonthlySpending.owner_id == owner_id,
+        UserMonthlySpending.year == year,
+        UserMonthlySpending.month == month
+    )).scalar()
+    return total if total is not None else Decimal("0.00")
+
+def pop_pending(db: Any) -> List[Dict[str, Any]]:
+    """Alerts raised by the session's committed writes; call after the service returns."""
+    return db.info.pop(PENDING_KEY, [])
+
+def rebuild_totals(db: Session, owner_id: Optional[int] = None):
+    """
+    Recomputes running totals from the rollup without committing, keeping the
+    thresholds already sent. Call after the rollup itself was rebuilt.
+    """
+    reset = update(UserMonthlySpending).values(total_spent=0)
+    monthly = select(
+        ExpenseMonthlyRollup.owner_id,
+        ExpenseMonthlyRollup.year,
+        ExpenseMonthlyRollup.month,
+        func.sum(ExpenseMonthlyRollup.total_spent)
+    ).group_by(ExpenseMonthlyRollup.owner_id, ExpenseMonthlyRollup.year, ExpenseMonthlyRollup.month)
+    if owner_id is not None:
+        reset = reset.where(UserMonthlySpending.owner_id == owner_id)
+        monthly = monthly.where(ExpenseMonthlyRollup.owner_id == owner_id)
+    db.execute(reset)
+    stmt = insert(UserMonthlySpending).from_select(["owner_id", "year", "month", "total_spent"], monthly)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["owner_id", "year", "month"],
+        set_={"total_spent": stmt.excluded.total_spent}
+    ))
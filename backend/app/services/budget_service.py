@@ -1,11 +1,15 @@
 # backend/app/services/budget_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.db.models import Budget, Expense
+from sqlalchemy import Integer, and_, column, func, select
+from app.db.models import Budget, UserMonthlySpending
 from app.schemas.budget import BudgetCreate, BudgetUpdate
 from datetime import datetime
+from decimal import Decimal
 from app.db import crud # Import crud
-from app.core.exceptions import BudgetNotFoundException
+from app.core.exceptions import BudgetNotFoundException, InvalidMonthRangeException
+from app.services import budget_alert_service, response_cache
+
+MAX_RANGE_MONTHS = 120
 
 def create_or_update_budget(db: Session, budget: BudgetCreate, user_id: int):
     """Creates a new budget or updates an existing one for a given month/year and user."""
@@ -15,6 +19,9 @@ def create_or_update_budget(db: Session, budget: BudgetCreate, user_id: int):
         Budget.year == budget.year
     ).first()
 
+    # Land in the same commit as the write below
+    response_cache.bump_data_version(db, user_id)
+    budget_alert_service.check_budget(db, user_id, budget.year, budget.month, budget.amount)
     if db_budget:
         # Update existing budget
         updated_data = budget.model_dump(exclude_unset=True)
@@ -38,20 +45,15 @@ def get_user_budget(db: Session, user_id: int, month: int, year: int):
     return budget
 
 def get_current_month_spending(db: Session, user_id: int, month: int, year: int):
-    """Calculates total spending for the current month and year for a user."""
-    total_spending = db.query(func.sum(Expense.amount)).filter(
-        Expense.owner_id == user_id,
-        func.extract('month', Expense.date) == month,
-        func.extract('year', Expense.date) == year
-    ).scalar()
-    return total_spending if total_spending is not None else 0.0
+    """Total spending for a month for a user, read from the running monthly total."""
+    return budget_alert_service.get_month_total(db, user_id, year, month)
 
 def get_remaining_budget(db: Session, user_id: int, month: int, year: int):
     """Calculates the remaining budget for a specific month/year for a user."""
     try:
         budget_obj = get_user_budget(db, user_id, month, year) # This will raise BudgetNotFoundException
     except BudgetNotFoundException:
-        return {"budget_set": False, "remaining_amount": 0.0, "total_budget": 0.0, "total_spent": 0.0}
+        return {"budget_set": False, "remaining_amount": Decimal("0.00"), "total_budget": Decimal("0.00"), "total_spent": Decimal("0.00")}
 
     total_spent = get_current_month_spending(db, user_id, month, year)
     remaining = budget_obj.amount - total_spent
@@ -61,3 +63,47 @@ def get_remaining_budget(db: Session, user_id: int, month: int, year: int):
         "total_budget": budget_obj.amount,
         "total_spent": total_spent
     }
+
+def get_budget_range(db: Session, user_id: int, start_year: int, start_month: int, end_year: int, end_month: int):
+    """
+    Budget, spending and remaining amount for every month from start to end inclusive,
+    in one query: a generated month series LEFT JOINed to the user's budgets and
+    running monthly totals, two primary-key lookups per month.
+    """
+    first = start_year * 12 + start_month - 1
+    last = end_year * 12 + end_month - 1
+    if last < first:
+        raise InvalidMonthRangeException("'to' must not be before 'from'")
+    if last - first + 1 > MAX_RANGE_MONTHS:
+        raise InvalidMonthRangeException(f"A range covers at most {MAX_RANGE_MONTHS} months")
+
+    series = func.generate_series(first, last).table_valued(column("idx", Integer)).render_derived()
+    months = select((series.c.idx // 12).label("year"), (series.c.idx % 12 + 1).label("month")).subquery()
+    rows = db.execute(
+        select(months.c.year, months.c.month, Budget.amount, UserMonthlySpending.total_spent)
+        .select_from(months)
+        .outerjoin(Budget, and_(
+            Budget.owner_id == user_id, Budget.year == months.c.year, Budget.month == months.c.month
+        ))
+        .outerjoin(UserMonthlySpending, and_(
+            UserMonthlySpending.owner_id == user_id,
+            UserMonthlySpending.year == months.c.year,
+            UserMonthlySpending.month == months.c.month
+        ))
+        .order_by(months.c.year, months.c.month)
+    ).all()
+
+    summaries = []
+    for row in rows:
+        total_budget = row.amount if row.amount is not None else Decimal("0.00")
+        total_spent = row.total_spent if row.total_spent is not None else Decimal("0.00")
+        summaries.append({
+            "year": row.year,
+            "month": row.month,
+            "budget_set": row.amount is not None,
+            # Matches /remaining: nothing remains of a budget that was never set
+            "remaining_amount": total_budget - total_spent if row.amount is not None else Decimal("0.00"),
+            "total_budget": total_budget,
+            "total_spent": total_spent
+        })
+    return summaries
@@ -1,34 +1,138 @@
 # backend/app/services/expense_service.py
+import csv
+import io
+import json
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract
-from app.db.models import Expense, User, ExpenseCategory, Group # Import Group model
-from app.schemas.expense import ExpenseBase, ExpenseUpdate
+from sqlalchemy import func, extract, tuple_, insert, select
+from pydantic import ValidationError
+from app.db.models import Expense, User, ExpenseCategory, Group, ExpenseMonthlyRollup # Import Group model
+from app.schemas.expense import ExpenseBase, ExpenseUpdate, ExpenseFileFormat
+from app.core.config import settings
+from app.db.database import SessionLocal
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, BinaryIO, Iterator, Tuple
 from app.db import crud # Import crud
 from app.core.exceptions import ExpenseNotFoundException
+from app.core.pagination import encode_cursor, decode_cursor
+from app.services import rollup_service, response_cache
 
 def create_user_expense(db: Session, expense: ExpenseBase, user_id: int):
     """Creates a new expense for a given user."""
     expense_in_db = expense.model_dump()
     expense_in_db["owner_id"] = user_id
 
-    db_expense = crud.create_item(db, Expense, expense_in_db)
+    # Insert the expense and bump its rollup bucket in one transaction
+    db_expense = Expense(**expense_in_db)
+    db.add(db_expense)
+    rollup_service.add_expense(db, db_expense)
+    response_cache.bump_data_version(db, user_id)
+    db.commit()
+    db.refresh(db_expense)
     return db_expense
 
-def get_user_expenses(
-    db: Session,
+def _iter_import_rows(file: BinaryIO, file_format: ExpenseFileFormat) -> Iterator[Tuple[int, Dict[str, Any] | None, str | None]]:
+    """
+    Lazily parses an uploaded CSV/NDJSON file, one line at a time, so memory use
+    does not depend on file size. Yields (row_number, raw_row, parse_error).
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if file_format == ExpenseFileFormat.CSV:
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            # Empty cells mean "use the default" (e.g. date/category)
+            yield row_number, {k: v for k, v in row.items() if k and v not in (None, "")}, None
+    else:
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield row_number, None, "Expected a JSON object"
+                continue
+            yield row_number, row, None
+
+def _format_validation_error(e: ValidationError) -> str:
+    """Condenses a pydantic ValidationError into a single readable line."""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+    )
+
+def _insert_import_chunk(db: Session, user_id: int, rows: List[Dict[str, Any]]):
+    """
+    Inserts one chunk of validated rows with a single multi-row INSERT, updates the
+    spending rollup with one upsert per touched bucket, and commits them together.
+    """
+    deltas: Dict[Tuple[int, int, ExpenseCategory], List] = {}
+    for row in rows:
+        year, month = rollup_service.expense_bucket(row["date"])
+        bucket = deltas.setdefault((year, month, row["category"]), [0, 0])
+        bucket[0] += row["amount"]
+        bucket[1] += 1
+
+    db.execute(insert(Expense), rows)
+    rollup_service.apply_bucket_deltas(db, user_id, deltas)
+    response_cache.bump_data_version(db, user_id)
+    db.commit()
+
+def import_user_expenses(db: Session, user_id: int, file: BinaryIO, file_format: ExpenseFileFormat) -> Dict[str, Any]:
+    """
+    Bulk-imports expenses from a CSV (with a header row) or NDJSON file.
+    Rows are validated against ExpenseBase and inserted in chunks of
+    settings.IMPORT_CHUNK_SIZE, one transaction per chunk. Invalid rows are skipped
+    and reported; valid rows are still imported.
+    """
+    inserted = 0
+    failed = 0
+    errors: List[Dict[str, Any]] = []
+    chunk: List[Dict[str, Any]] = []
+
+    def record_error(row_number: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"row": row_number, "error": message})
+
+    for row_number, raw, parse_error in _iter_import_rows(file, file_format):
+        if parse_error:
+            record_error(row_number, parse_error)
+            continue
+        try:
+            expense = ExpenseBase.model_validate(raw)
+        except ValidationError as e:
+            record_error(row_number, _format_validation_error(e))
+            continue
+
+        row = expense.model_dump()
+        row["owner_id"] = user_id
+        chunk.append(row)
+        if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+            _insert_import_chunk(db, user_id, chunk)
+            inserted += len(chunk)
+            chunk = []
+
+    if chunk:
+        _insert_import_chunk(db, user_id, chunk)
+        inserted += len(chunk)
+
+    return {
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
+
+def _filter_user_expenses(
+    query,
     user_id: int,
-    skip: int = 0,
-    limit: int = 100,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
     category: ExpenseCategory | None = None
-) -> List[Expense]:
-    """Retrieves expenses for a user with optional filters."""
-    # Start with a base query for Expense
-    query = db.query(Expense)
-
+):
+    """Applies the owner and optional date/category filters shared by listing and export."""
     query = query.filter(Expense.owner_id == user_id)
 
     if start_date:
@@ -37,8 +141,93 @@ def get_user_expenses(
         query = query.filter(Expense.date <= end_date)
     if category:
         query = query.filter(Expense.category == category)
+    return query
+
+def get_user_expenses(
+    db: Session,
+    user_id: int,
+    cursor: str | None = None,
+    limit: int = 100,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    category: ExpenseCategory | None = None
+) -> Dict[str, Any]:
+    """
+    Retrieves one page of a user's expenses, newest first, with optional filters.
+    Pages are addressed by an opaque cursor over (date, id), so every page is a seek
+    on the (owner_id, date, id) index instead of an OFFSET scan.
+    Returns {"items": [...], "next_cursor": str | None}.
+    """
+    query = _filter_user_expenses(db.query(Expense), user_id, start_date, end_date, category)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Expense.date, Expense.id) < tuple_(last_date, last_id))
+
+    # Fetch one extra row to learn whether another page exists
+    expenses = query.order_by(Expense.date.desc(), Expense.id.desc()).limit(limit + 1).all()
 
-    return query.offset(skip).limit(limit).all()
+    next_cursor = None
+    if len(expenses) > limit:
+        expenses = expenses[:limit]
+        next_cursor = encode_cursor(expenses[-1].date, expenses[-1].id)
+    return {"items": expenses, "next_cursor": next_cursor}
+
+EXPORT_COLUMNS = ["id", "description", "amount", "date", "category", "created_at", "updated_at"]
+
+def _export_value(value: Any) -> Any:
+    """Converts a raw column value into something csv/json can write directly."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ExpenseCategory):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def stream_user_expenses(
+    user_id: int,
+    file_format: ExpenseFileFormat,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    category: ExpenseCategory | None = None
+) -> Iterator[str]:
+    """
+    Yields a user's full expense history as CSV or NDJSON text chunks, oldest first.
+    Rows are pulled through a server-side cursor in batches of settings.EXPORT_BATCH_SIZE
+    as plain column tuples (no ORM objects or Pydantic models), so memory stays flat
+    no matter how many rows are exported.
+    The generator owns its session: it outlives the request's get_db dependency.
+    """
+    db = SessionLocal()
+    try:
+        stmt = _filter_user_expenses(
+            select(*(getattr(Expense, column) for column in EXPORT_COLUMNS)),
+            user_id, start_date, end_date, category
+        ).order_by(Expense.date, Expense.id).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        result = db.execute(stmt)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if file_format == ExpenseFileFormat.CSV else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+
+        for batch in result.partitions():
+            for row in batch:
+                values = [_export_value(v) for v in row]
+                if writer:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header-only CSV (or nothing at all) when there are no rows
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
 
 def get_user_expense(db: Session, expense_id: int, user_id: int) -> Optional[Expense]:
     """Retrieves a single expense by ID for a specific user."""
@@ -52,32 +241,46 @@ def update_user_expense(db: Session, expense_id: int, user_id: int, expense_upda
     db_expense = get_user_expense(db, expense_id, user_id)
     
     updated_data = expense_update.model_dump(exclude_unset=True)
-    db_expense = crud.update_item(db, db_expense, updated_data)
+
+    # Move the old values out of their rollup bucket and the new values into theirs,
+    # which also covers an expense changing month or category.
+    rollup_service.remove_expense(db, db_expense)
+    for field, value in updated_data.items():
+        if hasattr(db_expense, field):
+            setattr(db_expense, field, value)
+    rollup_service.add_expense(db, db_expense)
+    response_cache.bump_data_version(db, user_id)
+
+    db.commit()
+    db.refresh(db_expense)
     return db_expense
 
 def delete_user_expense(db: Session, expense_id: int, user_id: int):
     """Deletes an expense for a user."""
     db_expense = get_user_expense(db, expense_id, user_id)
+    rollup_service.remove_expense(db, db_expense)
+    response_cache.bump_data_version(db, user_id)
     crud.delete_item(db, db_expense)
     return True # Indicate successful deletion
 
 def get_monthly_spending_summary(db: Session, user_id: int) -> List[Dict[str, Any]]:
     """
     Calculates total spending per month for a user across all years.
+    Reads the monthly rollup, so cost scales with months x categories rather than expenses.
     Returns a list of dictionaries like: [{"year": 2023, "month": 1, "total_spent": 1500.0}, ...]
     """
     results = db.query(
-        extract('year', Expense.date).label('year'),
-        extract('month', Expense.date).label('month'),
-        func.sum(Expense.amount).label('total_spent')
+        ExpenseMonthlyRollup.year,
+        ExpenseMonthlyRollup.month,
+        func.sum(ExpenseMonthlyRollup.total_spent).label('total_spent')
     ).filter(
-        Expense.owner_id == user_id
+        ExpenseMonthlyRollup.owner_id == user_id
     ).group_by(
-        extract('year', Expense.date),
-        extract('month', Expense.date)
+        ExpenseMonthlyRollup.year,
+        ExpenseMonthlyRollup.month
     ).order_by(
-        extract('year', Expense.date),
-        extract('month', Expense.date)
+        ExpenseMonthlyRollup.year,
+        ExpenseMonthlyRollup.month
     ).all()
 
     return [{"year": int(r.year), "month": int(r.month), "total_spent": float(r.total_spent)} for r in results]
@@ -85,24 +288,25 @@ def get_monthly_spending_summary(db: Session, user_id: int) -> List[Dict[str, An
 def get_spending_by_category(db: Session, user_id: int, month: int | None = None, year: int | None = None) -> List[Dict[str, Any]]:
     """
     Calculates total spending per category for a user, optionally filtered by month and year.
+    Reads the monthly rollup instead of scanning expenses.
     Returns a list of dictionaries like: [{"category": "Food", "total_spent": 500.0}, ...]
     """
     query = db.query(
-        Expense.category,
-        func.sum(Expense.amount).label('total_spent')
+        ExpenseMonthlyRollup.category,
+        func.sum(ExpenseMonthlyRollup.total_spent).label('total_spent')
     ).filter(
-        Expense.owner_id == user_id
+        ExpenseMonthlyRollup.owner_id == user_id
     )
 
     if month:
-        query = query.filter(extract('month', Expense.date) == month)
+        query = query.filter(ExpenseMonthlyRollup.month == month)
     if year:
-        query = query.filter(extract('year', Expense.date) == year)
+        query = query.filter(ExpenseMonthlyRollup.year == year)
 
     results = query.group_by(
-        Expense.category
+        ExpenseMonthlyRollup.category
     ).order_by(
-        Expense.category
+        ExpenseMonthlyRollup.category
     ).all()
 
     return [{"category": r.category.value, "total_spent": float(r.total_spent)} for r in results]
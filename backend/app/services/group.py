@@ -1,11 +1,60 @@
 # backend/app/crud/group.py
 
 from sqlalchemy.orm import Session
-from app.db.models import Group as GroupModel
-from typing import Optional
+from sqlalchemy import exists
+from sqlalchemy.dialects.postgresql import insert
+from app.db.models import Group as GroupModel, group_members_association_table
+from typing import Optional, Iterable, Set
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Only positive answers are cached, so a newly added member is never refused;
+# leaving a group invalidates the entry.
+membership_cache = TTLCache(maxsize=settings.MEMBERSHIP_CACHE_SIZE, ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS)
+
+def invalidate_membership(group_id: int, user_id: int):
+    """Drops a cached membership, e.g. after the user leaves the group."""
+    membership_cache.pop((group_id, user_id))
 
 def get_group_by_id(db: Session, group_id: int) -> Optional[GroupModel]:
     """
     Retrieves a single group by its ID.
     """
-    return db.query(GroupModel).filter(GroupModel.id == group_id).first()
\ No newline at end of file
+    return db.query(GroupModel).filter(GroupModel.id == group_id).first()
+
+def is_group_member(db: Session, group_id: int, user_id: int) -> bool:
+    """
+    Checks membership with an EXISTS on the group_members primary key,
+    without loading the group or its member list.
+    """
+    return db.query(
+        exists().where(
+            group_members_association_table.c.group_id == group_id,
+            group_members_association_table.c.user_id == user_id
+        )
+    ).scalar()
+
+def is_group_member_cached(db: Session, group_id: int, user_id: int) -> bool:
+    """is_group_member, answered from membership_cache when the user is a known member."""
+    if membership_cache.get((group_id, user_id)):
+        return True
+    is_member = is_group_member(db, group_id, user_id)
+    if is_member:
+        membership_cache.set((group_id, user_id), True)
+    return is_member
+
+def add_members(db: Session, group_id: int, user_ids: Iterable[int]) -> Set[int]:
+    """
+    Inserts membership rows with one multi-row INSERT ... ON CONFLICT DO NOTHING,
+    without committing. Returns the ids that were not already members.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return set()
+    stmt = (
+        insert(group_members_association_table)
+        .values([{"group_id": group_id, "user_id": uid} for uid in user_ids])
+        .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+        .returning(group_members_association_table.c.user_id)
+    )
+    return set(db.execute(stmt).scalars().all())
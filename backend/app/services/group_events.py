@@ -0,0 +1,106 @@
+# backend/app/services/group_events.py
+import json
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import GroupEvent, GroupEventCounter
+
+
+def event_seq(text: str) -> Optional[int]:
+    """Reads the sequence number back out of a serialized event."""
+    return json.loads(text).get("seq")
+
+
+class GroupEventBuffer:
+    """
+    Per-group ring buffer of the most recent (seq, text) events, kept contiguous:
+    an event that skips ahead starts a fresh run, so any range the buffer answers
+    has no holes. Also numbers events when the log isn't table-backed.
+    """
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._events: Dict[int, Deque[Tuple[int, str]]] = {}
+        self._counters: Dict[int, int] = {}
+
+    def next_seq(self, group_id: int) -> int:
+        seq = self._counters.get(group_id, 0) + 1
+        self._counters[group_id] = seq
+        return seq
+
+    def append(self, group_id: int, seq: int, text: str):
+        events = self._events.setdefault(group_id, deque(maxlen=self.maxlen))
+        if events and seq <= events[-1][0]:
+            return # Already buffered (the publishing worker also receives its own event)
+        if events and seq != events[-1][0] + 1:
+            events.clear()
+        events.append((seq, text))
+
+    def latest(self, group_id: int) -> Optional[int]:
+        events = self._events.get(group_id)
+        return events[-1][0] if events else self._counters.get(group_id)
+
+    def since(self, group_id: int, since: int) -> Optional[List[str]]:
+        """Events after `since`, or None if the buffer doesn't reach back that far."""
+        events = self._events.get(group_id)
+        if not events or events[0][0] > since + 1 or since > events[-1][0]:
+            return None
+        return [text for seq, text in events if seq > since]
+
+    def forget(self, group_id: int):
+        self._events.pop(group_id, None)
+
+# Per-process buffer shared by the WebSocket manager
+event_buffer = GroupEventBuffer(settings.GROUP_EVENT_BUFFER_SIZE)
+
+
+def record_event(db: Session, group_id: int, message: Dict[str, Any]) -> Tuple[int, str]:
+    """
+    Numbers and stores one group event: the counter upsert hands out the next
+    sequence number under a row lock, so numbers are unique across workers.
+    Events beyond GROUP_EVENT_TABLE_RETENTION are pruned. Returns (seq, text).
+    """
+    stmt = insert(GroupEventCounter).values(group_id=group_id, last_seq=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["group_id"],
+        set_={"last_seq": GroupEventCounter.last_seq + 1}
+    ).returning(GroupEventCounter.last_seq)
+    seq = db.execute(stmt).scalar_one()
+
+    text = json.dumps({**message, "seq": seq})
+    db.execute(insert(GroupEvent).values(group_id=group_id, seq=seq, payload=text))
+    db.execute(delete(GroupEvent).where(
+        GroupEvent.group_id == group_id,
+        GroupEvent.seq <= seq - settings.GROUP_EVENT_TABLE_RETENTION
+    ))
+    db.commit()
+    return seq, text
+
+def get_latest_seq(db: Session, group_id: int) -> int:
+    """The group's last sequence number, 0 before its first event."""
+    return db.execute(
+        select(GroupEventCounter.last_seq).where(GroupEventCounter.group_id == group_id)
+    ).scalar() or 0
+
+def get_events_since(db: Session, group_id: int, since: int) -> Optional[List[str]]:
+    """
+    Stored events after `since`, in order, or None when some of them have been
+    pruned (or `since` is ahead of the log) and the client must resync.
+    """
+    latest = get_latest_seq(db, group_id)
+    if since > latest:
+        return None
+    if since == latest:
+        return []
+    rows = db.execute(
+        select(GroupEvent.seq, GroupEvent.payload)
+        .where(GroupEvent.group_id == group_id, GroupEvent.seq > since)
+        .order_by(GroupEvent.seq)
+    ).all()
+    if not rows or rows[0].seq != since + 1:
+        return None
+    return [row.payload for row in rows]
@@ -2,51 +2,70 @@
 from fastapi import status, HTTPException
 # from http.client import HTTPException
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from app.db.models import Group, User, Expense, Settlement, group_members_association_table,GroupExpense, GroupExpenseShare
-from app.schemas.group import GroupCreate,AddGroupMember,GroupDetailResponse,LeaveGroupResponse, GroupExpenseCreate, GroupExpenseResponse, ShareResponse, GroupExpenseListResponse
+from sqlalchemy import func, or_, select, tuple_
+from app.db.models import Group, User, Expense, Settlement, group_members_association_table,GroupExpense, GroupExpenseShare, GroupMemberBalance
+from app.schemas.group import GroupCreate,AddGroupMember,GroupDetailResponse,LeaveGroupResponse, GroupExpenseCreate, GroupExpenseResponse, Share, ShareResponse, GroupExpenseListResponse
 from typing import List, Optional, Dict, Any
-from app.core.exceptions import GroupNotFoundException
+from app.core.exceptions import GroupNotFoundException, InvalidSplitException
+from app.core.money import reconcile_shares
+from app.core.pagination import encode_cursor, decode_cursor
 from app.services import user
 from app.services import group as group_1
-from app.db import crud # Import crud functions
+from app.services import balance_service
 
 
 def create_group(db: Session, group_in: GroupCreate, user_id: int) -> Group:
     """
     Creates a new group and adds the creating user as a member.
+    Member emails are resolved with one IN query and all membership rows are
+    written with one multi-row insert; unknown emails are skipped.
     """
- # 1. Prepare the data for the new group
+    # 1. Prepare the data for the new group
     group_data = group_in.model_dump(exclude={"members"})
     group_data["created_by_user_id"] = user_id
-    
-    # 2. Create the group record in the database
-    db_group = crud.create_item(db, Group, group_data)
-
-    # 3. Add the creator as the first member of the group
-    creator_user = db.query(User).filter(User.id == user_id).first()
-    if creator_user:
-        db_group.members.append(creator_user)
-
-    # 4. Iterate through the list of members from the request and add them
-    #    to the group. This is the new, corrected logic.
-    for member_email in group_in.members:
-        # Check if the member email is the same as the creator to avoid duplicates
-        if member_email != creator_user.email:
-            member_user = db.query(User).filter(User.email == member_email).first()
-            if member_user:
-                # Add the found user to the group's members list
-                db_group.members.append(member_user)
-            # You might also want to log or handle cases where a user email doesn't exist
-
-    # 5. Commit all changes to the database and refresh the object
+
+    # 2. Create the group record (flushed for its id, committed with the members)
+    db_group = Group(**group_data)
+    db.add(db_group)
+    db.flush()
+
+    # 3. Add the creator and every known member in one statement
+    member_ids = user.get_user_ids_by_emails(db, group_in.members)
+    group_1.add_members(db, db_group.id, [user_id, *member_ids.values()])
+
+    # 4. Commit all changes to the database and refresh the object
     db.commit()
     db.refresh(db_group)
-    
+
     return db_group
 
 
 def create_group_expense(db: Session, group_id: int, expense_in: GroupExpenseCreate, user_id: int) -> GroupExpenseResponse:
+    # Step 0: the payer and every share holder must belong to the group (one query),
+    # or the ledger would gain balances for outsiders
+    involved = {user_id, *(share.user_id for share in expense_in.shares)}
+    members = set(db.execute(
+        select(group_members_association_table.c.user_id).where(
+            group_members_association_table.c.group_id == group_id,
+            group_members_association_table.c.user_id.in_(involved)
+        )
+    ).scalars())
+    if user_id not in members:
+        raise GroupNotFoundException()
+    non_members = sorted(involved - members)
+    if non_members:
+        raise InvalidSplitException(f"Users {non_members} are not members of this group")
+
+    # Make the shares add up to the amount to the cent, so the ledger nets to zero
+    try:
+        share_amounts = reconcile_shares(expense_in.amount, [share.share_amount for share in expense_in.shares])
+    except ValueError as e:
+        raise InvalidSplitException(str(e))
+    shares = [
+        Share(user_id=share.user_id, share_amount=share_amount)
+        for share, share_amount in zip(expense_in.shares, share_amounts)
+    ]
+
     # Step 1: insert group_expenses row
     new_expense = GroupExpense(
         description=expense_in.description,
@@ -58,17 +77,23 @@ def create_group_expense(db: Session, group_id: int, expense_in: GroupExpenseCre
     db.flush()  # to get new_expense.id before inserting shares
 
     # Step 2: insert expense shares
-    for share in expense_in.shares:
+    for share in shares:
         db.add(GroupExpenseShare(
             expense_id=new_expense.id,
             user_id=share.user_id,
             share_amount=share.share_amount
         ))
 
+    # Step 3: adjust the members' running balances in the same transaction
+    balance_service.record_group_expense(
+        db, group_id, user_id, expense_in.amount,
+        [(share.user_id, share.share_amount) for share in shares]
+    )
+
     db.commit()
     db.refresh(new_expense)
 
-    # Step 3: return response
+    # Step 4: return response
     return GroupExpenseResponse(
         id=new_expense.id,
         description=new_expense.description,
@@ -76,18 +101,70 @@ def create_group_expense(db: Session, group_id: int, expense_in: GroupExpenseCre
         group_id=new_expense.group_id,
         paid_by_user_id=new_expense.paid_by_user_id,
         created_at=new_expense.created_at,
-        shares=expense_in.shares
+        shares=shares
     )
 
-def get_list_group_expenses(group_id:int , db:Session, user_id:int)-> List[GroupExpenseListResponse]:
-    expenses = (
-        db.query(GroupExpense)
-        .options(joinedload(GroupExpense.expense_shares))  # fetch related
-        .filter(GroupExpense.group_id == group_id)
-        .order_by(GroupExpense.created_at.asc())
-        .all()
-    )
-    return expenses
+def get_list_group_expenses(
+    db: Session,
+    group_id: int,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    include_shares: bool = True
+) -> Dict[str, Any]:
+    """
+    Returns one page of a group's expense feed, newest first, as a seek on the
+    (group_id, created_at, id) index. Only the columns the response needs are
+    selected; shares for the whole page come from a single IN query instead of a
+    joined load, and are skipped entirely when include_shares is False.
+    Returns {"items": [...], "next_cursor": str | None}.
+    """
+    if not group_1.is_group_member(db, group_id, user_id):
+        raise GroupNotFoundException()
+
+    query = select(
+        GroupExpense.id,
+        GroupExpense.description,
+        GroupExpense.amount,
+        GroupExpense.group_id,
+        GroupExpense.paid_by_user_id,
+        GroupExpense.created_at
+    ).where(GroupExpense.group_id == group_id)
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        query = query.where(tuple_(GroupExpense.created_at, GroupExpense.id) < tuple_(last_created_at, last_id))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = db.execute(
+        query.order_by(GroupExpense.created_at.desc(), GroupExpense.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    items = [{**row._asdict(), "expense_shares": []} for row in rows]
+    if include_shares and items:
+        by_id = {item["id"]: item for item in items}
+        shares = db.execute(
+            select(
+                GroupExpenseShare.expense_id,
+                GroupExpenseShare.user_id,
+                GroupExpenseShare.share_amount,
+                GroupExpenseShare.is_paid
+            )
+            .where(GroupExpenseShare.expense_id.in_(list(by_id)))
+            .order_by(GroupExpenseShare.expense_id, GroupExpenseShare.id)
+        ).all()
+        for share in shares:
+            by_id[share.expense_id]["expense_shares"].append({
+                "user_id": share.user_id,
+                "share_amount": share.share_amount,
+                "is_paid": share.is_paid,
+            })
+
+    return {"items": items, "next_cursor": next_cursor}
 
 
 def get_user_groups(db: Session, user_id: int) -> List[Group]:
@@ -104,47 +181,119 @@ def get_user_groups(db: Session, user_id: int) -> List[Group]:
     
     return all_groups
 
-def add_group_member(db:Session, addMember:AddGroupMember,user_id: int ) -> Group:
+def get_user_group_summaries(db: Session, user_id: int) -> List[Dict[str, Any]]:
     """
-    Add member to group
+    Lists the user's groups with a member count, the user's net balance and the
+    last-activity time, from one grouped query driven by group_members(user_id)
+    instead of loading every member row of every group. Most recently active first.
+    """
+    own_membership = group_members_association_table.alias("own_membership")
+    all_members = group_members_association_table.alias("all_members")
+
+    # Each max() is a backward scan of the (group_id, created_at|settled_at, id) index
+    last_expense_at = (
+        select(func.max(GroupExpense.created_at))
+        .where(GroupExpense.group_id == Group.id)
+        .scalar_subquery()
+    )
+    last_settlement_at = (
+        select(func.max(Settlement.settled_at))
+        .where(Settlement.group_id == Group.id)
+        .scalar_subquery()
+    )
+    # greatest() ignores NULLs, so groups without activity fall back to created_at
+    last_activity_at = func.greatest(Group.created_at, last_expense_at, last_settlement_at)
+
+    rows = db.execute(
+        select(
+            Group.id,
+            Group.name,
+            Group.description,
+            Group.created_by_user_id,
+            Group.created_at,
+            Group.updated_at,
+            func.count(all_members.c.user_id).label("member_count"),
+            func.coalesce(GroupMemberBalance.net_balance, 0).label("net_balance"),
+            last_activity_at.label("last_activity_at")
+        )
+        .select_from(own_membership)
+        .join(Group, Group.id == own_membership.c.group_id)
+        .join(all_members, all_members.c.group_id == Group.id)
+        .outerjoin(
+            GroupMemberBalance,
+            (GroupMemberBalance.group_id == Group.id) & (GroupMemberBalance.user_id == own_membership.c.user_id)
+        )
+        .where(own_membership.c.user_id == user_id)
+        .group_by(Group.id, GroupMemberBalance.net_balance)
+        .order_by(last_activity_at.desc(), Group.id.desc())
+    ).all()
+    return [row._asdict() for row in rows]
+
+def _require_member_manager(db: Session, group_id: int, user_id: int) -> Group:
     """
-    # 1. Find the group by ID
-    group = group_1.get_group_by_id(db, addMember.id)
+    Loads the group and checks that the current user may add members to it.
+    Any member may add members; membership is an EXISTS, not a member-list load.
+    """
+    group = group_1.get_group_by_id(db, group_id)
     if not group:
-        # A custom exception is better than raising HTTPException directly in a service
         raise GroupNotFoundException()
-
-    # 2. Check if the current user has permission to add members
-    # You can decide on the policy (e.g., only creator, or any member)
-    # The current logic allows any member to add
-    current_user = user.get_user_by_id(db, user_id)
-    if current_user not in group.members:
+    if not group_1.is_group_member(db, group_id, user_id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to add members to this group."
         )
+    return group
 
-    # 3. Find the user to be added by email
-    user_to_add = user.get_user_by_email(db, addMember.email)
-    if not user_to_add:
+def add_group_member(db:Session, addMember:AddGroupMember,user_id: int ) -> Group:
+    """
+    Add member to group
+    """
+    # 1. Find the group and check the current user's permission
+    group = _require_member_manager(db, addMember.id, user_id)
+
+    # 2. Find the user to be added by email
+    user_to_add = user.get_user_ids_by_emails(db, [addMember.email]).get(addMember.email)
+    if user_to_add is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User with this email not found."
         )
 
-    # 4. Check if the user is already a member of the group
-    if user_to_add in group.members:
+    # 3. Insert the membership; a conflict means the user is already a member
+    if not group_1.add_members(db, group.id, [user_to_add]):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This user is already a member of the group."
         )
 
-    # 5. Add the user to the group's members list and save
-    group.members.append(user_to_add)
     db.commit()
     db.refresh(group)
     return group
 
+def add_group_members(db: Session, group_id: int, emails: List[str], user_id: int) -> Dict[str, Any]:
+    """
+    Adds many members by email: one IN query to resolve the emails and one
+    multi-row insert for the memberships. Returns a per-email outcome of
+    "added", "already_member" or "not_found", in request order.
+    """
+    _require_member_manager(db, group_id, user_id)
+
+    email_to_id = user.get_user_ids_by_emails(db, emails)
+    added = group_1.add_members(db, group_id, email_to_id.values())
+    db.commit()
+
+    results = []
+    for email in dict.fromkeys(emails): # de-duplicated, order kept
+        member_id = email_to_id.get(email)
+        if member_id is None:
+            outcome = "not_found"
+        elif member_id in added:
+            outcome = "added"
+        else:
+            outcome = "already_member"
+        results.append({"email": email, "user_id": member_id, "status": outcome})
+    return {"group_id": group_id, "results": results}
+
 def get_group_detail(db:Session,id: int,user_id: int) -> GroupDetailResponse:
     """
     Gets the specific group and usernames of group members
@@ -182,6 +331,7 @@ def leave_group(db: Session, group_id: int, user_id: int) -> LeaveGroupResponse:
     if len(group.members) == 1:
         db.delete(group)
         db.commit()
+        group_1.invalidate_membership(group_id, user_id)
         return LeaveGroupResponse(
             group_id=group.id,
             message="You left the group. Since you were the only member, the group has been deleted.",
@@ -192,6 +342,7 @@ def leave_group(db: Session, group_id: int, user_id: int) -> LeaveGroupResponse:
     if group.created_by_user_id != user_id:
         group.members.remove(user_to_remove)
         db.commit()
+        group_1.invalidate_membership(group_id, user_id)
         db.refresh(group)
         return LeaveGroupResponse(
             group_id=group.id,
@@ -213,6 +364,7 @@ def leave_group(db: Session, group_id: int, user_id: int) -> LeaveGroupResponse:
     # Remove user from group
     group.members.remove(user_to_remove)
     db.commit()
+    group_1.invalidate_membership(group_id, user_id)
     db.refresh(group)
 
     return LeaveGroupResponse(
@@ -238,90 +390,3 @@ def leave_group(db: Session, group_id: int, user_id: int) -> LeaveGroupResponse:
 #     if not group:
 #         raise GroupNotFoundException()
 #     return group
-
-# def get_group_balances(db: Session, group_id: int, current_user_id: int) -> GroupBalancesResponse:
-#     """
-#     Calculates the net balances for all members within a specific group.
-#     """
-#     group = get_user_group_by_id(db, group_id, current_user_id) # Ensure user has access to the group
-#     if not group:
-#         raise GroupNotFoundException()
-
-#     # Initialize balances for all group members
-#     balances: Dict[int, float] = {member.id: 0.0 for member in group.members}
-#     member_usernames: Dict[int, str] = {member.id: member.username for member in group.members}
-
-#     # 1. Process Expenses
-#     expenses = db.query(Expense).options(joinedload(Expense.expense_shares)).filter(
-#         Expense.group_id == group_id
-#     ).all()
-
-#     for expense in expenses:
-#         payer_id = expense.paid_by_user_id
-#         amount = expense.amount
-
-#         # The payer initially "paid" the full amount, so their balance increases
-#         if payer_id in balances:
-#             balances[payer_id] += amount
-#         # else: Handle cases where payer might not be a direct group member (unlikely with current setup but good for robustness)
-
-#         # Distribute the expense amount among members
-#         if expense.expense_shares:
-#             # If explicit shares exist, use them
-#             for share in expense.expense_shares:
-#                 if share.user_id in balances:
-#                     balances[share.user_id] -= share.share_amount
-#         else:
-#             # If no explicit shares, assume equal split among all group members
-#             # For simplicity here, we assume all current 'group.members' are involved in an equal split
-#             num_members_for_split = len(group.members)
-#             if num_members_for_split > 0:
-#                 share_per_member = amount / num_members_for_split
-#                 for member_id in balances: # Iterate through all members of the group
-#                     balances[member_id] -= share_per_member
-
-#     # 2. Process Settlements
-#     settlements = db.query(Settlement).filter(Settlement.group_id == group_id).all()
-
-#     for settlement in settlements:
-#         from_user_id = settlement.from_user_id
-#         to_user_id = settlement.to_user_id
-#         amount = settlement.amount
-
-#         if from_user_id in balances:
-#             balances[from_user_id] -= amount # User who paid (from_user) reduces their balance
-#         if to_user_id in balances:
-#             balances[to_user_id] += amount   # User who received (to_user) increases their balance
-
-#     # Format balances into a list of UserBalance objects
-#     individual_balances_list: List[UserBalance] = []
-    
-#     # Calculate summary totals for the current user
-#     total_owed_by_you = 0.0
-#     total_owed_to_you = 0.0
-
-#     for user_id, net_balance in balances.items():
-#         # Create UserBalance objects for all members with non-zero balances
-#         if net_balance != 0:
-#             individual_balances_list.append(
-#                 UserBalance(
-#                     user_id=user_id,
-#                     username=member_usernames.get(user_id, f"User {user_id}"),
-#                     net_balance=net_balance
-#                 )
-#             )
-        
-#         # Calculate summary for the current user
-#         if user_id == current_user_id:
-#             if net_balance < 0: # Current user has a negative balance, meaning they owe others
-#                 total_owed_by_you = abs(net_balance)
-#             elif net_balance > 0: # Current user has a positive balance, meaning others owe them
-#                 total_owed_to_you = net_balance
-
-#     # Return the structured response
-#     return GroupBalancesResponse(
-#         group_id=group_id,
-#         total_owed_by_you=total_owed_by_you,
-#         total_owed_to_you=total_owed_to_you,
-#         individual_balances=individual_balances_list
-#     )
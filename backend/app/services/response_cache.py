@@ -0,0 +1,34 @@
+# backend/app/services/response_cache.py
+from typing import Optional
+
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.models import User, UserDataVersion
+
+# Serialized read responses, keyed by (user_id, data version, endpoint, params...).
+# A write bumps the version, so later lookups use new keys and old entries just age out.
+response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+def bump_data_version(db: Session, user_id: Optional[int] = None):
+    """
+    Bumps one user's data version, or everyone's when user_id is None. Call it
+    before the write's commit so the bump lands in the same transaction.
+    """
+    if user_id is not None:
+        stmt = insert(UserDataVersion).values(user_id=user_id, version=1)
+    else:
+        stmt = insert(UserDataVersion).from_select(["user_id", "version"], select(User.id, literal(1)))
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"version": UserDataVersion.version + 1}
+    ))
+
+def get_data_version(db: Session, user_id: int) -> int:
+    """The user's current data version, 0 before their first write."""
+    return db.execute(
+        select(UserDataVersion.version).where(UserDataVersion.user_id == user_id)
+    ).scalar() or 0
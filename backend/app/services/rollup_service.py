@@ -0,0 +1,187 @@
+# backend/app/services/rollup_service.py
+from sqlalchemy.orm import Session
+from sqlalchemy import func, extract, select
+from sqlalchemy.dialects.postgresql import insert
+from app.db.models import Expense, ExpenseMonthlyRollup, ExpenseCategory
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Tuple
+from app.services import budget_alert_service, response_cache
+
+def expense_bucket(date: datetime) -> Tuple[int, int]:
+    """
+    Returns the (year, month) bucket an expense date falls into.
+    Aware datetimes are bucketed in UTC, matching extract() on TIMESTAMPTZ with
+    the database session time zone left at its UTC default.
+    """
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc)
+    return date.year, date.month
+
+def apply_expense_delta(
+    db: Session,
+    owner_id: int,
+    date: datetime,
+    category: ExpenseCategory,
+    amount: Decimal,
+    count: int
+):
+    """
+    Adds amount/count to the rollup row for the expense's bucket, and amount to the
+    user's running monthly total, without committing.
+    Pass negative values to remove an expense from its bucket.
+    """
+    year, month = expense_bucket(date)
+    stmt = insert(ExpenseMonthlyRollup).values(
+        owner_id=owner_id,
+        year=year,
+        month=month,
+        category=category,
+        total_spent=amount,
+        expense_count=count
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["owner_id", "year", "month", "category"],
+        set_={
+            "total_spent": ExpenseMonthlyRollup.total_spent + stmt.excluded.total_spent,
+            "expense_count": ExpenseMonthlyRollup.expense_count + stmt.excluded.expense_count,
+        }
+    )
+    db.execute(stmt)
+    budget_alert_service.apply_spending_delta(db, owner_id, year, month, amount)
+
+    if count < 0:
+        # Drop buckets that no longer hold any expense so reads never see empty rows
+        db.query(ExpenseMonthlyRollup).filter(
+            ExpenseMonthlyRollup.owner_id == owner_id,
+            ExpenseMonthlyRollup.year == year,
+            ExpenseMonthlyRollup.month == month,
+            ExpenseMonthlyRollup.category == category,
+            ExpenseMonthlyRollup.expense_count <= 0
+        ).delete(synchronize_session=False)
+
+def apply_bucket_deltas(db: Session, owner_id: int, deltas: Dict[Tuple[int, int, ExpenseCategory], List]):
+    """
+    Applies many positive bucket deltas for one user with a single multi-row upsert.
+    `deltas` maps (year, month, category) -> [amount, count]; used by bulk imports.
+    """
+    if not deltas:
+        return
+    stmt = insert(ExpenseMonthlyRollup).values([
+        {
+            "owner_id": owner_id,
+            "year": year,
+            "month": month,
+            "category": category,
+            "total_spent": amount,
+            "expense_count": count,
+        }
+        for (year, month, category), (amount, count) in deltas.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["owner_id", "year", "month", "category"],
+        set_={
+            "total_spent": ExpenseMonthlyRollup.total_spent + stmt.excluded.total_spent,
+            "expense_count": ExpenseMonthlyRollup.expense_count + stmt.excluded.expense_count,
+        }
+    )
+    db.execute(stmt)
+
+    monthly: Dict[Tuple[int, int], Decimal] = {}
+    for (year, month, _), (amount, _) in deltas.items():
+        monthly[(year, month)] = monthly.get((year, month), 0) + amount
+    for (year, month), amount in sorted(monthly.items()):
+        budget_alert_service.apply_spending_delta(db, owner_id, year, month, amount)
+
+def add_expense(db: Session, expense: Expense):
+    """Records a new expense in the rollup (same transaction as the insert)."""
+    apply_expense_delta(db, expense.owner_id, expense.date, expense.category, expense.amount, 1)
+
+def remove_expense(db: Session, expense: Expense):
+    """Removes an existing expense from the rollup (same transaction as the delete)."""
+    apply_expense_delta(db, expense.owner_id, expense.date, expense.category, -expense.amount, -1)
+
+def _recomputed_rollup_query(db: Session, owner_id: Optional[int] = None):
+    """Aggregates expenses into rollup-shaped rows straight from the expenses table."""
+    query = db.query(
+        Expense.owner_id.label("owner_id"),
+        extract('year', Expense.date).label("year"),
+        extract('month', Expense.date).label("month"),
+        Expense.category.label("category"),
+        func.sum(Expense.amount).label("total_spent"),
+        func.count(Expense.id).label("expense_count")
+    )
+    if owner_id is not None:
+        query = query.filter(Expense.owner_id == owner_id)
+    return query.group_by(
+        Expense.owner_id,
+        extract('year', Expense.date),
+        extract('month', Expense.date),
+        Expense.category
+    )
+
+def find_drift(db: Session, owner_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Compares the rollup table against a fresh aggregation of expenses.
+    Returns one entry per bucket whose stored totals differ from the recomputed ones.
+    """
+    expected = {
+        (r.owner_id, int(r.year), int(r.month), r.category): (r.total_spent, int(r.expense_count))
+        for r in _recomputed_rollup_query(db, owner_id).all()
+    }
+
+    stored_query = db.query(ExpenseMonthlyRollup)
+    if owner_id is not None:
+        stored_query = stored_query.filter(ExpenseMonthlyRollup.owner_id == owner_id)
+    stored = {
+        (r.owner_id, r.year, r.month, r.category): (r.total_spent, r.expense_count)
+        for r in stored_query.all()
+    }
+
+    drift = []
+    for key in sorted(set(expected) | set(stored), key=lambda k: (k[0], k[1], k[2], k[3].value)):
+        exp_total, exp_count = expected.get(key, (Decimal(0), 0))
+        got_total, got_count = stored.get(key, (Decimal(0), 0))
+        if exp_count != got_count or exp_total != got_total:
+            drift.append({
+                "owner_id": key[0],
+                "year": key[1],
+                "month": key[2],
+                "category": key[3].value,
+                "expected_total": exp_total,
+                "stored_total": got_total,
+                "expected_count": exp_count,
+                "stored_count": got_count,
+            })
+    return drift
+
+def rebuild(db: Session, owner_id: Optional[int] = None, commit: bool = True) -> int:
+    """
+    Recomputes the rollup from expenses, for one user or for everyone.
+    Returns the number of rollup rows written.
+    """
+    delete_query = db.query(ExpenseMonthlyRollup)
+    if owner_id is not None:
+        delete_query = delete_query.filter(ExpenseMonthlyRollup.owner_id == owner_id)
+    delete_query.delete(synchronize_session=False)
+
+    recomputed = _recomputed_rollup_query(db, owner_id).subquery()
+    result = db.execute(
+        insert(ExpenseMonthlyRollup).from_select(
+            ["owner_id", "year", "month", "category", "total_spent", "expense_count"],
+            select(
+                recomputed.c.owner_id,
+                recomputed.c.year,
+                recomputed.c.month,
+                recomputed.c.category,
+                recomputed.c.total_spent,
+                recomputed.c.expense_count
+            )
+        )
+    )
+    budget_alert_service.rebuild_totals(db, owner_id)
+    # Rebuilt totals may differ from what cached responses were computed from
+    response_cache.bump_data_version(db, owner_id)
+    if commit:
+        db.commit()
+    return result.rowcount
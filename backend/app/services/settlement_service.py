@@ -0,0 +1,164 @@
+# backend/app/services/settlement_service.py
+import heapq
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, tuple_
+from app.db.models import Settlement, group_members_association_table
+from app.schemas.settlement import SettlementTransfer, SettlePlanResponse, SettlementResponse
+from app.core.exceptions import GroupNotFoundException, InvalidSettlementException, LedgerImbalanceException
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.money import to_minor_units, from_minor_units
+from app.services import balance_service
+from app.services import group as group_1
+from typing import Dict, List, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+def plan_transfers(balances_cents: Dict[int, int]) -> List[Tuple[int, int, int]]:
+    """
+    Turns net balances (in cents; > 0 is owed money, < 0 owes money) into a short
+    list of (payer_id, receiver_id, cents) transfers that zeroes every balance.
+
+    Greedy matching of the largest debtor with the largest creditor through two
+    max-heaps: each step settles at least one side completely, so the plan has at
+    most n - 1 transfers and runs in O(n log n).
+
+    Raises ValueError if the balances don't sum to zero: that means a corrupted
+    ledger, and no plan can settle it exactly.
+    """
+    balances = {user_id: cents for user_id, cents in balances_cents.items() if cents}
+    residual = sum(balances.values())
+    if residual:
+        raise ValueError(f"Balances are off by {residual} cents")
+
+    # heapq is a min-heap, so magnitudes are negated; user_id breaks ties deterministically
+    creditors = [(-cents, user_id) for user_id, cents in balances.items() if cents > 0]
+    debtors = [(cents, user_id) for user_id, cents in balances.items() if cents < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers: List[Tuple[int, int, int]] = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
+
+def get_settle_plan(db: Session, group_id: int, current_user_id: int) -> SettlePlanResponse:
+    """Computes who should pay whom to settle a group, from the balance ledger."""
+    if not group_1.is_group_member(db, group_id, current_user_id):
+        raise GroupNotFoundException()
+
+    balances = balance_service.get_net_balances(db, group_id)
+    try:
+        transfers = plan_transfers({user_id: to_minor_units(balance) for user_id, balance in balances.items()})
+    except ValueError as e:
+        # `python -m app.scripts.group_balances verify` shows the drift; `rebuild` repairs it
+        logger.error("Group %s ledger does not net to zero: %s", group_id, e)
+        raise LedgerImbalanceException()
+    return SettlePlanResponse(
+        group_id=group_id,
+        transfers=[
+            SettlementTransfer(from_user_id=payer_id, to_user_id=receiver_id, amount=from_minor_units(cents))
+            for payer_id, receiver_id, cents in transfers
+        ]
+    )
+
+def _to_response(row: Any, group_id: int) -> SettlementResponse:
+    return SettlementResponse(
+        id=row.id,
+        from_user_id=row.payer_id,
+        to_user_id=row.receiver_id,
+        group_id=group_id,
+        amount=row.amount,
+        settled_at=row.settled_at
+    )
+
+def record_settlements(db: Session, group_id: int, transfers: List[SettlementTransfer], current_user_id: int) -> List[SettlementResponse]:
+    """
+    Records one or many settlements within a group atomically: one membership query
+    for every user involved, one multi-row INSERT and one balance-ledger upsert,
+    all committed together.
+    """
+    involved = {current_user_id}
+    for transfer in transfers:
+        if transfer.from_user_id == transfer.to_user_id:
+            raise InvalidSettlementException("A settlement needs two different users")
+        involved.update((transfer.from_user_id, transfer.to_user_id))
+
+    members = set(db.execute(
+        select(group_members_association_table.c.user_id).where(
+            group_members_association_table.c.group_id == group_id,
+            group_members_association_table.c.user_id.in_(involved)
+        )
+    ).scalars())
+    if current_user_id not in members:
+        raise GroupNotFoundException()
+    non_members = sorted(involved - members)
+    if non_members:
+        raise InvalidSettlementException(f"Users {non_members} are not members of this group")
+
+    rows = db.execute(
+        insert(Settlement).returning(
+            Settlement.id, Settlement.payer_id, Settlement.receiver_id, Settlement.amount, Settlement.settled_at,
+            sort_by_parameter_order=True
+        ),
+        [
+            {"group_id": group_id, "payer_id": t.from_user_id, "receiver_id": t.to_user_id, "amount": t.amount}
+            for t in transfers
+        ]
+    ).all()
+    balance_service.record_settlements(
+        db, group_id, [(t.from_user_id, t.to_user_id, t.amount) for t in transfers]
+    )
+    db.commit()
+    return [_to_response(row, group_id) for row in rows]
+
+def apply_settle_plan(db: Session, group_id: int, current_user_id: int) -> List[SettlementResponse]:
+    """Computes the group's current settle-up plan and records all of it in one transaction."""
+    if not group_1.is_group_member(db, group_id, current_user_id):
+        raise GroupNotFoundException()
+    # Plan from locked balances: a concurrent settle-up waits here for this one to
+    # commit, then plans from the zeroed ledger instead of recording the same plan twice
+    balance_service.lock_balances(db, group_id)
+    plan = get_settle_plan(db, group_id, current_user_id)
+    if not plan.transfers:
+        return []
+    return record_settlements(db, group_id, plan.transfers, current_user_id)
+
+def get_group_settlements(
+    db: Session,
+    group_id: int,
+    current_user_id: int,
+    cursor: str | None = None,
+    limit: int = 50
+) -> Dict[str, Any]:
+    """
+    Returns one page of a group's settlement history, newest first, as a seek on the
+    (group_id, settled_at, id) index. Returns {"items": [...], "next_cursor": str | None}.
+    """
+    if not group_1.is_group_member(db, group_id, current_user_id):
+        raise GroupNotFoundException()
+
+    query = select(
+        Settlement.id, Settlement.payer_id, Settlement.receiver_id, Settlement.amount, Settlement.settled_at
+    ).where(Settlement.group_id == group_id)
+    if cursor:
+        last_settled_at, last_id = decode_cursor(cursor)
+        query = query.where(tuple_(Settlement.settled_at, Settlement.id) < tuple_(last_settled_at, last_id))
+
+    # Fetch one extra row to learn whether another page exists
+    rows = db.execute(
+        query.order_by(Settlement.settled_at.desc(), Settlement.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].settled_at, rows[-1].id)
+    return {"items": [_to_response(row, group_id) for row in rows], "next_cursor": next_cursor}
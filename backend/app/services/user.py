@@ -2,7 +2,7 @@
 
 from sqlalchemy.orm import Session
 from app.db.models import User as UserModel
-from typing import Optional
+from typing import Optional, Dict, Iterable
 
 def get_user_by_id(db: Session, user_id: int) -> Optional[UserModel]:
     """
@@ -14,4 +14,15 @@ def get_user_by_email(db: Session, email: str) -> Optional[UserModel]:
     """
     Retrieves a user by their email.
     """
-    return db.query(UserModel).filter(UserModel.email == email).first()
\ No newline at end of file
+    return db.query(UserModel).filter(UserModel.email == email).first()
+
+def get_user_ids_by_emails(db: Session, emails: Iterable[str]) -> Dict[str, int]:
+    """
+    Resolves many emails with a single IN query.
+    Returns {email: user_id} for the emails that belong to a user.
+    """
+    emails = set(emails)
+    if not emails:
+        return {}
+    rows = db.query(UserModel.email, UserModel.id).filter(UserModel.email.in_(emails)).all()
+    return {email: user_id for email, user_id in rows}
@@ -45,7 +45,7 @@ CREATE TABLE IF NOT EXISTS groups (
 CREATE TABLE IF NOT EXISTS expenses (
     id SERIAL PRIMARY KEY,
     description VARCHAR(255),
-    amount NUMERIC(10, 2) NOT NULL,
+    amount BIGINT NOT NULL, -- minor units (cents)
     date TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL,
     category expensecategory DEFAULT 'Other' NOT NULL,
     owner_id INTEGER NOT NULL,
@@ -54,12 +54,29 @@ CREATE TABLE IF NOT EXISTS expenses (
     FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
+-- Every expense read is scoped to one owner and usually a date range; the
+-- INCLUDE (amount) lets monthly sums run as index-only scans.
+CREATE INDEX IF NOT EXISTS ix_expenses_owner_date_id ON expenses (owner_id, date, id) INCLUDE (amount);
+CREATE INDEX IF NOT EXISTS ix_expenses_owner_category_date ON expenses (owner_id, category, date, id) INCLUDE (amount);
+
+-- Per-user monthly/category spending rollup, kept in sync with expenses by the API
+CREATE TABLE IF NOT EXISTS expense_monthly_rollups (
+    owner_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    category expensecategory NOT NULL,
+    total_spent BIGINT DEFAULT 0 NOT NULL, -- minor units (cents)
+    expense_count INTEGER DEFAULT 0 NOT NULL,
+    PRIMARY KEY (owner_id, year, month, category), -- Composite primary key
+    FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
 -- Create budgets table
 CREATE TABLE IF NOT EXISTS budgets (
     id SERIAL PRIMARY KEY,
     month INTEGER NOT NULL,
     year INTEGER NOT NULL,
-    amount NUMERIC(10, 2) NOT NULL,
+    amount BIGINT NOT NULL, -- minor units (cents)
     owner_id INTEGER NOT NULL,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
@@ -70,7 +87,7 @@ CREATE TABLE IF NOT EXISTS budgets (
 CREATE TABLE IF NOT EXISTS group_expenses (
     id SERIAL PRIMARY KEY,
     description VARCHAR(255),
-    amount NUMERIC(10, 2) NOT NULL,
+    amount BIGINT NOT NULL, -- minor units (cents)
     date TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL,
     group_id INTEGER, -- NEW: Links to a group if it's a shared expense (NULL if personal)
     paid_by_user_id INTEGER NOT NULL, -- NEW: The user who actually paid the full amount
@@ -80,6 +97,9 @@ CREATE TABLE IF NOT EXISTS group_expenses (
     FOREIGN KEY (paid_by_user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
+-- The group expense feed is paged by (created_at, id) within a group
+CREATE INDEX IF NOT EXISTS ix_group_expenses_group_created_at ON group_expenses (group_id, created_at, id);
+
 
 -- New table: group_members (for many-to-many relationship between users and groups)
 CREATE TABLE IF NOT EXISTS group_members (
@@ -91,12 +111,15 @@ CREATE TABLE IF NOT EXISTS group_members (
     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
 );
 
+-- The primary key serves lookups by group; this serves "which groups is this user in"
+CREATE INDEX IF NOT EXISTS ix_group_members_user_group ON group_members (user_id, group_id);
+
 -- New table: expense_shares (for splitting group expenses)
 CREATE TABLE IF NOT EXISTS group_expense_shares (
     id SERIAL PRIMARY KEY,
     expense_id INTEGER NOT NULL,
     user_id INTEGER NOT NULL, -- The user who owes/is responsible for this share
-    share_amount NUMERIC(10, 2) NOT NULL,
+    share_amount BIGINT NOT NULL, -- minor units (cents)
     is_paid BOOLEAN DEFAULT FALSE NOT NULL,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
@@ -111,9 +134,61 @@ CREATE TABLE IF NOT EXISTS settlements (
     payer_id INTEGER NOT NULL, -- The user who made the payment
     receiver_id INTEGER NOT NULL,   -- The user who received the payment
     group_id INTEGER NOT NULL,     -- The group within which the settlement occurred
-    amount NUMERIC(10, 2) NOT NULL,
+    amount BIGINT NOT NULL, -- minor units (cents)
     settled_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (payer_id) REFERENCES users (id) ON DELETE CASCADE,
     FOREIGN KEY (receiver_id) REFERENCES users (id) ON DELETE CASCADE,
     FOREIGN KEY (group_id) REFERENCES groups (id) ON DELETE CASCADE
 );
+
+-- Per-group settlement history is paged by (settled_at, id)
+CREATE INDEX IF NOT EXISTS ix_settlements_group_settled_at ON settlements (group_id, settled_at, id);
+
+-- Running net balance per (group, member), maintained by the API on every group
+-- expense and settlement so balances never need a replay of group history
+CREATE TABLE IF NOT EXISTS group_member_balances (
+    group_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    net_balance BIGINT DEFAULT 0 NOT NULL, -- cents; > 0: is owed money, < 0: owes money
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (group_id, user_id),
+    FOREIGN KEY (group_id) REFERENCES groups (id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Group WebSocket event log (used when GROUP_EVENT_LOG_BACKEND=table): a sequence
+-- counter per group and the most recent serialized events for replay on reconnect
+CREATE TABLE IF NOT EXISTS group_event_counters (
+    group_id INTEGER PRIMARY KEY,
+    last_seq BIGINT DEFAULT 0 NOT NULL,
+    FOREIGN KEY (group_id) REFERENCES groups (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS group_events (
+    group_id INTEGER NOT NULL,
+    seq BIGINT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (group_id, seq),
+    FOREIGN KEY (group_id) REFERENCES groups (id) ON DELETE CASCADE
+);
+
+-- Per-user data version, bumped with every expense/budget write; cached
+-- analytics and budget responses are keyed by it
+CREATE TABLE IF NOT EXISTS user_data_versions (
+    user_id INTEGER PRIMARY KEY,
+    version BIGINT DEFAULT 0 NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- Running monthly spend per user, kept in step with expense writes, and the
+-- highest budget alert threshold (percent) already sent for that month
+CREATE TABLE IF NOT EXISTS user_monthly_spending (
+    owner_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    total_spent BIGINT DEFAULT 0 NOT NULL, -- minor units (cents)
+    alerted_percent INTEGER DEFAULT 0 NOT NULL,
+    PRIMARY KEY (owner_id, year, month),
+    FOREIGN KEY (owner_id) REFERENCES users (id) ON DELETE CASCADE
+);
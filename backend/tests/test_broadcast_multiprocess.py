@@ -0,0 +1,11 @@
+# backend/tests/test_broadcast_multiprocess.py
+import pytest
+
+from app.scripts.broadcast_check import run_check
+
+
+@pytest.mark.parametrize("workers", [2, 4])
+def test_every_process_receives_every_event(database_url, workers):
+    # Each spawned process runs its own PostgresBroadcaster against DATABASE_URL
+    received = run_check(workers, timeout=10.0)
+    assert received == {index: list(range(workers)) for index in range(workers)}
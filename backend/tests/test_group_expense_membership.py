@@ -0,0 +1,57 @@
+# backend/tests/test_group_expense_membership.py
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.core.exceptions import GroupNotFoundException, InvalidSplitException
+from app.db.models import Group, GroupMemberBalance, User
+from app.schemas.group import GroupExpenseCreate, Share
+from app.services import group as group_1
+from app.services import group_service
+
+
+def _user(db, name: str) -> int:
+    user = User(username=f"membership_test_{name}", email=f"membership_test_{name}@example.invalid", hashed_password="x")
+    db.add(user)
+    db.flush()
+    return user.id
+
+def _expense(*shares) -> GroupExpenseCreate:
+    total = sum((amount for _, amount in shares), Decimal("0"))
+    return GroupExpenseCreate(
+        description="dinner", amount=total, selectedMembers=[uid for uid, _ in shares], splitMethod="exact",
+        shares=[Share(user_id=uid, share_amount=amount) for uid, amount in shares]
+    )
+
+@pytest.fixture
+def group(db):
+    alice, bob, outsider = _user(db, "alice"), _user(db, "bob"), _user(db, "outsider")
+    group = Group(name="membership test", created_by_user_id=alice)
+    db.add(group)
+    db.flush()
+    group_1.add_members(db, group.id, [alice, bob])
+    return group.id, alice, bob, outsider
+
+def _ledger(db, group_id):
+    return db.execute(
+        select(GroupMemberBalance.user_id, GroupMemberBalance.net_balance).where(GroupMemberBalance.group_id == group_id)
+    ).all()
+
+
+def test_members_can_split_an_expense(db, group):
+    group_id, alice, bob, _ = group
+    group_service.create_group_expense(db, group_id, _expense((alice, Decimal("5")), (bob, Decimal("5"))), alice)
+    assert dict(_ledger(db, group_id)) == {alice: Decimal("5.00"), bob: Decimal("-5.00")}
+
+def test_non_member_payer_is_rejected(db, group):
+    group_id, alice, bob, outsider = group
+    with pytest.raises(GroupNotFoundException):
+        group_service.create_group_expense(db, group_id, _expense((alice, Decimal("5")), (bob, Decimal("5"))), outsider)
+    assert _ledger(db, group_id) == []
+
+def test_non_member_share_holder_is_rejected(db, group):
+    group_id, alice, _, outsider = group
+    with pytest.raises(InvalidSplitException):
+        group_service.create_group_expense(db, group_id, _expense((alice, Decimal("5")), (outsider, Decimal("5"))), alice)
+    assert _ledger(db, group_id) == []
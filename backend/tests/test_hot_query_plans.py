@@ -0,0 +1,44 @@
+# backend/tests/test_hot_query_plans.py
+import pytest
+from sqlalchemy import create_engine
+
+from app.scripts.explain_hot_queries import explain_hot_queries
+
+# Calls whose statements must read expenses through an index
+EXPENSE_CALLS = [
+    "get_user_expenses", "get_user_expenses[date range]", "get_user_expenses[category]", "get_user_expense",
+]
+
+
+@pytest.fixture(scope="module")
+def plans(database_url):
+    """Plans of every hot query over 200k seeded expenses, seeded once and rolled back."""
+    engine = create_engine(database_url)
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        yield explain_hot_queries(connection, rows=200_000, users=1000)
+    finally:
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def test_no_hot_query_seq_scans_a_large_table(plans):
+    seq_scans = {
+        name: statement["statement"]
+        for name, statements in plans.items() for statement in statements if statement["seq_scans"]
+    }
+    assert seq_scans == {}
+
+@pytest.mark.parametrize("name", EXPENSE_CALLS)
+def test_expense_queries_use_an_index(plans, name):
+    assert plans[name]
+    for statement in plans[name]:
+        assert "expenses" in statement["index_scans"], statement["statement"]
+
+def test_every_hot_query_reads_through_an_index(plans):
+    for name, statements in plans.items():
+        assert statements, f"{name} issued no SELECT"
+        for statement in statements:
+            assert statement["index_scans"], f"{name}: {statement['statement']}"
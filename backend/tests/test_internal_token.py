@@ -0,0 +1,22 @@
+# backend/tests/test_internal_token.py
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.internal import require_internal_token
+from app.core.config import settings
+
+
+def test_internal_endpoints_are_disabled_without_a_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", None)
+    for header in (None, "", "anything"):
+        with pytest.raises(HTTPException) as exc:
+            require_internal_token(header)
+        assert exc.value.status_code == 404
+
+def test_internal_endpoints_require_the_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", "s3cret")
+    for header in (None, "", "wrong"):
+        with pytest.raises(HTTPException) as exc:
+            require_internal_token(header)
+        assert exc.value.status_code == 403
+    require_internal_token("s3cret")
@@ -0,0 +1,23 @@
+# backend/tests/test_money.py
+from decimal import Decimal
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.budget import BudgetCreate
+from app.schemas.expense import ExpenseBase
+from app.schemas.settlement import SettlementTransfer
+
+
+@pytest.mark.parametrize("amount", ["0.001", "0.004", "0", "-0.004", "-5"])
+def test_amounts_under_a_cent_after_rounding_are_rejected(amount):
+    with pytest.raises(ValidationError):
+        ExpenseBase.model_validate({"description": "coffee", "amount": amount})
+    with pytest.raises(ValidationError):
+        SettlementTransfer(from_user_id=1, to_user_id=2, amount=amount)
+    with pytest.raises(ValidationError):
+        BudgetCreate(month=1, year=2026, amount=amount)
+
+@pytest.mark.parametrize("amount, cents", [("0.005", Decimal("0.01")), (0.1, Decimal("0.10")), ("12.345", Decimal("12.35"))])
+def test_positive_amounts_are_rounded_to_cents(amount, cents):
+    assert ExpenseBase.model_validate({"description": "coffee", "amount": amount}).amount == cents
@@ -0,0 +1,74 @@
+# backend/tests/test_no_sql_on_event_loop.py
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.api.deps import get_current_user
+from app.db.database import get_session
+from app.db.models import User
+from app.main import app
+
+
+def _user(db, name: str) -> dict:
+    user = User(username=f"loop_test_{name}", email=f"loop_test_{name}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    return {"id": user.id, "username": user.username, "email": user.email}
+
+@pytest.fixture
+def client(db):
+    """A TestClient whose routes use the rolled-back test session and run as `alice`."""
+    alice = _user(db, "alice")
+    _user(db, "bob")
+
+    def session():
+        yield db
+
+    app.dependency_overrides[get_session] = session
+    app.dependency_overrides[get_current_user] = lambda: alice
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+@pytest.fixture
+def statements_on_loop():
+    """Every SQL statement executed while the calling thread is running an event loop."""
+    seen = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        seen.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def test_routes_returning_orm_objects_keep_sql_off_the_loop(client, statements_on_loop):
+    group = client.post("/api/v1/splits/groups/", json={"name": "loop test"})
+    assert group.status_code == 201, group.text
+    group_id = group.json()["id"]
+
+    member = client.post("/api/v1/splits/groups/addMember", json={"id": group_id, "email": "loop_test_bob@example.com"})
+    assert member.status_code == 200, member.text
+    assert len(member.json()["members"]) == 2
+
+    assert client.get("/api/v1/splits/groups/").status_code == 200
+    assert client.get(f"/api/v1/splits/groups/getGroupDetail/{group_id}").status_code == 200
+
+    expense = client.post("/api/v1/expenses/", json={"description": "lunch", "amount": "12.50"})
+    assert expense.status_code == 201, expense.text
+    expense_id = expense.json()["id"]
+    assert client.get(f"/api/v1/expenses/{expense_id}").status_code == 200
+    assert client.put(f"/api/v1/expenses/{expense_id}", json={"description": "lunch", "amount": "13"}).status_code == 200
+
+    assert statements_on_loop == []
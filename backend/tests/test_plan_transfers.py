@@ -0,0 +1,63 @@
+# backend/tests/test_plan_transfers.py
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from app.services.settlement_service import plan_transfers
+
+
+def _balances(rng: random.Random, members: int, max_cents: int = 500_000) -> dict:
+    """Random net balances in cents over `members` users that sum to zero, some of them zero."""
+    cents = [rng.choice([0, rng.randint(-max_cents, max_cents)]) for _ in range(members - 1)]
+    cents.append(-sum(cents))
+    return {user_id: amount for user_id, amount in zip(rng.sample(range(1, members * 10), members), cents)}
+
+def _check_plan(balances: dict, transfers: list):
+    owed = {user_id: cents for user_id, cents in balances.items() if cents}
+    assert len(transfers) <= max(len(owed) - 1, 0)
+    settled = Counter(balances)
+    for payer, receiver, cents in transfers:
+        assert isinstance(cents, int) and cents > 0
+        assert payer != receiver
+        assert owed.get(payer, 0) < 0 < owed.get(receiver, 0)
+        settled[payer] += cents
+        settled[receiver] -= cents
+    assert all(cents == 0 for cents in settled.values())
+    # Every cent owed is moved exactly once, nothing is created or lost
+    assert sum(cents for _, _, cents in transfers) == sum(c for c in owed.values() if c > 0)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_random_balances_settle_exactly(seed):
+    rng = random.Random(seed)
+    balances = _balances(rng, rng.randint(1, 60))
+    _check_plan(balances, plan_transfers(balances))
+
+@pytest.mark.parametrize("members", [2, 3, 10, 1000])
+def test_one_cent_imbalances_settle(members):
+    balances = {user_id: 1 for user_id in range(1, members)}
+    balances[members] = -(members - 1)
+    _check_plan(balances, plan_transfers(balances))
+
+def test_all_zero_balances_need_no_transfers():
+    assert plan_transfers({}) == []
+    assert plan_transfers({1: 0, 2: 0}) == []
+
+@pytest.mark.parametrize("balances", [{1: 500, 2: -499}, {1: -1}, {1: 300, 2: 200, 3: -600}])
+def test_balances_that_do_not_net_to_zero_are_rejected(balances):
+    with pytest.raises(ValueError):
+        plan_transfers(balances)
+
+def test_plans_a_thousand_member_group_within_10ms():
+    balances = _balances(random.Random(1000), 1000)
+    _check_plan(balances, plan_transfers(balances))
+    # Best of several runs, so a busy CI machine doesn't fail the budget on one slow run
+    best = min(_timed(plan_transfers, balances) for _ in range(20))
+    assert best < 0.010, f"plan_transfers took {best * 1000:.2f} ms for 1,000 members"
+
+def _timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
@@ -0,0 +1,15 @@
+# backend/tests/test_settings.py
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def test_postgres_broadcast_with_per_process_event_numbering_is_rejected():
+    with pytest.raises(ValidationError, match="GROUP_EVENT_LOG_BACKEND"):
+        Settings(BROADCAST_BACKEND="postgres", GROUP_EVENT_LOG_BACKEND="memory")
+
+@pytest.mark.parametrize("broadcast, event_log", [("memory", "memory"), ("memory", "table"), ("postgres", "table")])
+def test_supported_event_backends_are_accepted(broadcast, event_log):
+    settings = Settings(BROADCAST_BACKEND=broadcast, GROUP_EVENT_LOG_BACKEND=event_log)
+    assert (settings.BROADCAST_BACKEND, settings.GROUP_EVENT_LOG_BACKEND) == (broadcast, event_log)
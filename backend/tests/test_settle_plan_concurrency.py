@@ -0,0 +1,73 @@
+# backend/tests/test_settle_plan_concurrency.py
+import threading
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Group, GroupMemberBalance, User
+from app.schemas.group import GroupExpenseCreate, Share
+from app.services import group as group_1
+from app.services import group_service, settlement_service
+
+
+@pytest.fixture
+def engine(database_url):
+    # Each settle-up needs its own committed transaction, so this test can't use
+    # the rolled-back `db` fixture; it deletes its users (and, by cascade, the rest) itself
+    engine = create_engine(database_url, pool_size=4)
+    try:
+        yield engine
+    finally:
+        with Session(engine) as session:
+            session.execute(delete(User).where(User.username.like("settle_race_%")))
+            session.commit()
+        engine.dispose()
+
+@pytest.fixture
+def group(engine):
+    """A group of five whose payer is owed 40.00 by the other four."""
+    with Session(engine) as session:
+        users = [User(username=f"settle_race_{i}", email=f"settle_race_{i}@example.com", hashed_password="x") for i in range(5)]
+        session.add_all(users)
+        session.flush()
+        payer = users[0].id
+        group = Group(name="settle race", created_by_user_id=payer)
+        session.add(group)
+        session.flush()
+        group_1.add_members(session, group.id, [user.id for user in users])
+        session.commit()
+        group_service.create_group_expense(session, group.id, GroupExpenseCreate(
+            description="trip", amount=Decimal("50"), selectedMembers=[user.id for user in users], splitMethod="exact",
+            shares=[Share(user_id=user.id, share_amount=Decimal("10")) for user in users]
+        ), payer)
+        return group.id, payer
+
+
+def test_concurrent_settle_ups_record_the_plan_once(engine, group):
+    group_id, payer = group
+    barrier = threading.Barrier(2)
+    recorded, errors = [], []
+
+    def settle():
+        try:
+            with Session(engine) as session:
+                barrier.wait()
+                recorded.append(settlement_service.apply_settle_plan(session, group_id, payer))
+        except Exception as e: # surfaced below; a thread can't fail the test itself
+            errors.append(e)
+
+    threads = [threading.Thread(target=settle) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert errors == []
+    assert sorted(len(transfers) for transfers in recorded) == [0, 4]
+    with Session(engine) as session:
+        balances = session.execute(
+            select(GroupMemberBalance.net_balance).where(GroupMemberBalance.group_id == group_id)
+        ).scalars().all()
+    assert balances and all(balance == 0 for balance in balances)
@@ -10,7 +10,7 @@ function GroupCard({ group, onClick }) {
       <div>
         <h2 className="text-xl font-semibold text-indigo-700">{group.name}</h2>
         <p className="text-sm text-gray-600">
-          {group.members ? group.members.length : 1} Members
+          {group.member_count ?? 1} Members
         </p>
       </div>
     </li>
@@ -0,0 +1,47 @@
+// frontend/src/hooks/useBudgetAlerts.js
+import { useState, useEffect } from "react";
+
+// Listens on the user's notification socket and keeps the latest BUDGET_THRESHOLD alert
+export const useBudgetAlerts = (isAuthenticated) => {
+  const [alert, setAlert] = useState(null);
+
+  useEffect(() => {
+    if (!isAuthenticated) return;
+
+    const WS_BASE_URL = import.meta.env.VITE_WS_BASE_URL;
+    let ws;
+    let reconnectTimer = null;
+    let closedByUs = false;
+
+    const connect = () => {
+      const token = localStorage.getItem("accessToken");
+      ws = new WebSocket(`${WS_BASE_URL}/ws/users/me?token=${encodeURIComponent(token || "")}`);
+
+      ws.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.event === "PING") {
+          ws.send(JSON.stringify({ event: "PONG" }));
+        } else if (data.event === "BUDGET_THRESHOLD") {
+          setAlert(data);
+        }
+      };
+      ws.onclose = (event) => {
+        // 1008: refused (bad token), no point retrying
+        if (!closedByUs && event.code !== 1008) {
+          reconnectTimer = setTimeout(connect, 3000);
+        }
+      };
+      ws.onerror = (error) => console.error("❌ Budget alerts WebSocket error:", error);
+    };
+
+    connect();
+
+    return () => {
+      closedByUs = true;
+      clearTimeout(reconnectTimer);
+      ws.close();
+    };
+  }, [isAuthenticated]);
+
+  return { alert, dismissAlert: () => setAlert(null) };
+};
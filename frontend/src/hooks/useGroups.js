@@ -16,7 +16,7 @@ export const useGroups = (isAuthenticated) => {
     setLoading(true);
     setError(null);
     try {
-      const response = await axiosInstance.get("/splits/groups");
+      const response = await axiosInstance.get("/splits/groups/summary");
       setGroups(response.data);
     } catch (err) {
       console.error("Failed to fetch groups:", err.response?.data || err.message);
@@ -3,6 +3,7 @@ import React, { useState, useEffect } from 'react';
 import Input from '../components/common/Input';
 import Button from '../components/common/Button';
 import { useAuth } from '../hooks/useAuth';
+import { useBudgetAlerts } from '../hooks/useBudgetAlerts';
 import axiosInstance from '../api/axiosInstance';
 import { formatCurrency } from '../utils/helpers';
 
@@ -14,6 +15,7 @@ function BudgetPage() {
   const [currentBudgetSummary, setCurrentBudgetSummary] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const { alert: budgetAlert, dismissAlert } = useBudgetAlerts(isAuthenticated);
 
   const fetchBudgetSummary = async () => {
     if (!isAuthenticated) return;
@@ -42,6 +44,13 @@ function BudgetPage() {
     fetchBudgetSummary();
   }, [isAuthenticated, month, year]); // Re-fetch when month/year changes
 
+  useEffect(() => {
+    // A threshold alert for the month on screen means its numbers just changed
+    if (budgetAlert && budgetAlert.month === month && budgetAlert.year === year) {
+      fetchBudgetSummary();
+    }
+  }, [budgetAlert]);
+
   const handleSetUpdateBudget = async (e) => {
     e.preventDefault();
     setError('');
@@ -77,6 +86,17 @@ function BudgetPage() {
     <div className="p-6 bg-white rounded-lg shadow-xl">
       <h1 className="text-3xl font-bold text-gray-800 mb-6">Monthly Budget</h1>
 
+      {budgetAlert && (
+        <div className="flex items-center justify-between bg-yellow-100 text-yellow-800 p-4 rounded-lg mb-6">
+          <p>
+            You have used {budgetAlert.threshold}% of your budget for{' '}
+            {new Date(budgetAlert.year, budgetAlert.month - 1).toLocaleString('default', { month: 'long' })} {budgetAlert.year}
+            {' '}({formatCurrency(budgetAlert.total_spent)} of {formatCurrency(budgetAlert.total_budget)}).
+          </p>
+          <button onClick={dismissAlert} className="ml-4 text-sm font-semibold">Dismiss</button>
+        </div>
+      )}
+
       {/* Budget Summary Card */}
       <div className="bg-indigo-600 text-white p-6 rounded-lg shadow-md mb-8">
         <h2 className="text-2xl font-semibold mb-2">Budget for {new Date(year, month - 1).toLocaleString('default', { month: 'long' })} {year}</h2>
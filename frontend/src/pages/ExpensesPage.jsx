@@ -17,6 +17,7 @@ const categories = [
 function ExpensesPage() {
   const { isAuthenticated } = useAuth();
   const [expenses, setExpenses] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null); // Cursor for the next page, null when there is none
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [showAddForm, setShowAddForm] = useState(false);
@@ -42,7 +43,8 @@ function ExpensesPage() {
       if (selectedCategory) params.category = selectedCategory;
 
       const response = await axiosInstance.get('/expenses/', { params });
-      setExpenses(response.data);
+      setExpenses(response.data.items);
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
       console.error('Failed to fetch expenses:', err);
       setError('Failed to load expenses. Please try again.');
@@ -51,6 +53,23 @@ function ExpensesPage() {
     }
   };
 
+  const fetchMoreExpenses = async () => {
+    if (!nextCursor) return;
+    try {
+      const params = { cursor: nextCursor };
+      if (startDate) params.start_date = startDate + 'T00:00:00Z';
+      if (endDate) params.end_date = endDate + 'T23:59:59Z';
+      if (selectedCategory) params.category = selectedCategory;
+
+      const response = await axiosInstance.get('/expenses/', { params });
+      setExpenses((prevExpenses) => [...prevExpenses, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      console.error('Failed to fetch more expenses:', err);
+      setError('Failed to load more expenses. Please try again.');
+    }
+  };
+
   useEffect(() => {
     fetchExpenses();
   }, [isAuthenticated, startDate, endDate, selectedCategory]); // Re-fetch on filter change
@@ -183,6 +202,11 @@ function ExpensesPage() {
             ))}
           </ul>
         )}
+        {nextCursor && (
+          <div className="mt-4 text-center">
+            <Button variant="outline" onClick={fetchMoreExpenses}>Load More</Button>
+          </div>
+        )}
       </div>
 
       {/* Delete Confirmation Modal */}
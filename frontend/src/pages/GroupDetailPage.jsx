@@ -15,6 +15,7 @@ function GroupDetailPage() {
   const [isModalOpen, setIsModalOpen] = useState(false);
   const { groupDetails, fetchGroup } = useGroups(isAuthenticated);
   const [expenses, setExpenses] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null); // Cursor for older expenses, null when there are none
 
   // central state for toggle menus
   const [activeMenu, setActiveMenu] = useState(null); // null | "options" | "expenses"
@@ -29,35 +30,81 @@ function GroupDetailPage() {
   const fetchExpenses = async (groupId) => {
     try {
       const res = await axiosInstance.get(`/splits/groups/${groupId}/expenses`);
-      setExpenses(res.data);
+      // Pages arrive newest first; the feed shows them oldest first
+      setExpenses([...res.data.items].reverse());
+      setNextCursor(res.data.next_cursor);
     } catch (err) {
       console.error("❌ Failed to fetch expenses", err);
     }
   };
 
+  const fetchOlderExpenses = async () => {
+    if (!nextCursor) return;
+    try {
+      const res = await axiosInstance.get(`/splits/groups/${groupId}/expenses`, {
+        params: { cursor: nextCursor },
+      });
+      setExpenses((prevExpenses) => [...[...res.data.items].reverse(), ...prevExpenses]);
+      setNextCursor(res.data.next_cursor);
+    } catch (err) {
+      console.error("❌ Failed to fetch older expenses", err);
+    }
+  };
+
   // WebSocket effect
   useEffect(() => {
     if (!groupId) return;
 
     const WS_BASE_URL = import.meta.env.VITE_WS_BASE_URL;
-    const ws = new WebSocket(`${WS_BASE_URL}/ws/groups/${groupId}`);
-
-    ws.onopen = () =>
-      console.log(`✅ WebSocket connection established for group ${groupId}`);
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      if (data.event === "NEW_EXPENSE") {
-        const newExpense = {
-          ...data.expense,
-          expense_shares: data.expense.shares || [],
-        };
-        setExpenses((prevExpenses) => [...prevExpenses, newExpense]);
-      }
+    let ws;
+    let lastSeq = null; // Sequence number of the last event seen, sent back on reconnect
+    let reconnectTimer = null;
+    let closedByUs = false;
+
+    const connect = () => {
+      // Browsers can't set headers on a WebSocket, so the JWT goes in the query string
+      const token = localStorage.getItem("accessToken");
+      const since = lastSeq !== null ? `&since=${lastSeq}` : "";
+      ws = new WebSocket(
+        `${WS_BASE_URL}/ws/groups/${groupId}?token=${encodeURIComponent(token || "")}${since}`
+      );
+
+      ws.onopen = () =>
+        console.log(`✅ WebSocket connection established for group ${groupId}`);
+      ws.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (typeof data.seq === "number") lastSeq = data.seq;
+        if (data.event === "PING") {
+          // Any reply keeps the server from closing the socket as idle
+          ws.send(JSON.stringify({ event: "PONG" }));
+        } else if (data.event === "RESYNC_REQUIRED") {
+          // Missed more events than the server still has: reload the feed
+          fetchExpenses(groupId);
+        } else if (data.event === "NEW_EXPENSE") {
+          const newExpense = {
+            ...data.expense,
+            expense_shares: data.expense.shares || [],
+          };
+          setExpenses((prevExpenses) => [...prevExpenses, newExpense]);
+        }
+      };
+      ws.onclose = (event) => {
+        console.log("🔌 WebSocket connection closed.");
+        // 1008: refused (bad token or not a member), no point retrying
+        if (!closedByUs && event.code !== 1008) {
+          reconnectTimer = setTimeout(connect, 3000);
+        }
+      };
+      ws.onerror = (error) => console.error("❌ WebSocket error:", error);
     };
-    ws.onclose = () => console.log("🔌 WebSocket connection closed.");
-    ws.onerror = (error) => console.error("❌ WebSocket error:", error);
 
-    return () => ws.close();
+    connect();
+
+    return () => {
+      closedByUs = true;
+      clearTimeout(reconnectTimer);
+      ws.close();
+    };
   }, [groupId]);
 
   if (!isAuthenticated) {
@@ -90,6 +137,16 @@ function GroupDetailPage() {
             </p>
           ) : (
             <div className="space-y-4">
+              {nextCursor && (
+                <div className="text-center">
+                  <button
+                    onClick={fetchOlderExpenses}
+                    className="text-sm text-blue-600 hover:underline"
+                  >
+                    Load older expenses
+                  </button>
+                </div>
+              )}
               {expenses.map((exp) => (
                 <div
                   key={exp.id}